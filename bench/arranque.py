@@ -0,0 +1,126 @@
+"""Comprueba el presupuesto de arranque de la app en un proceso nuevo.
+
+Mide, en un proceso hijo recién creado, cuánto tardan en importarse `consultas` y
+las secciones, que no se haya cargado ninguna dependencia pesada al importarlas, y
+cuánto tarda la primera ejecución completa de app.py contra el servidor de
+respuestas grabadas (bench.replay). Después arranca una segunda réplica sobre el
+mismo almacén en disco (`consultas.persistencia`) y comprueba que su primer render
+no consulta ningún endpoint. Termina con código 1 si se supera algún límite, y se
+omite (código 0, con aviso) si no hay fixtures grabadas.
+
+    python -m bench.arranque [--importacion 0.5 --primer-render 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import replay
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+
+# Módulos que no deben cargarse solo por importar la app: se importan al usarlos
+PESADOS = ("pandas", "numpy", "pyarrow", "SPARQLWrapper", "rdflib", "PIL")
+MODULOS_APP = ("consultas", "secciones.campeon", "secciones.quiz", "secciones.clubes", "secciones.historias")
+
+
+def medir_hijo():
+    """Se ejecuta en el proceso hijo: imprime las medidas como JSON"""
+    import importlib
+
+    import streamlit  # noqa: F401  (su coste no depende de la app)
+
+    inicio = time.perf_counter()
+    for modulo in MODULOS_APP:
+        importlib.import_module(modulo)
+    importacion = time.perf_counter() - inicio
+    cargados = [modulo for modulo in PESADOS if modulo in sys.modules]
+
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    inicio = time.perf_counter()
+    at.run()
+    primer_render = time.perf_counter() - inicio
+    print(json.dumps({
+        "importacion_s": round(importacion, 4),
+        "pesados_al_importar": cargados,
+        "primer_render_s": round(primer_render, 4),
+        "excepciones": len(at.exception),
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=replay.DIRECTORIO_FIXTURES)
+    parser.add_argument("--importacion", type=float, default=0.5, help="segundos máximos de importación")
+    parser.add_argument("--primer-render", type=float, default=5.0, help="segundos máximos de la primera ejecución")
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.hijo:
+        medir_hijo()
+        return 0
+
+    if not any(os.path.exists(os.path.join(args.fixtures, f"{nombre}.json")) for nombre in replay.UPSTREAM):
+        # Sin respuestas grabadas el render sería una página de errores 404: no hay nada que medir
+        print(f"OMITIDO: no hay fixtures en {args.fixtures} (grábalas con python -m bench.benchmark --grabar local)")
+        return 0
+
+    servidor = replay.iniciar(fixtures=args.fixtures)
+    # La app del hijo va contra el replay, sin la precarga en segundo plano y con un almacén vacío
+    servidor.configurar_entorno()
+    directorio = tempfile.mkdtemp(prefix="arranque-")
+    entorno = dict(
+        os.environ, FUTBOL_SPARQL_BACKEND="remoto", FUTBOL_PRECARGA="0", FUTBOL_CATALOGO="",
+        FUTBOL_ALMACEN=os.path.join(directorio, "resultados.sqlite3"),
+    )
+
+    def medir():
+        salida = subprocess.run(
+            [sys.executable, "-m", "bench.arranque", "--hijo"],
+            cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True,
+        ).stdout
+        return json.loads(salida.strip().splitlines()[-1])
+
+    try:
+        medidas = medir()
+        sin_fixture = sum(valores["sin_fixture"] for valores in servidor.copiar_estadisticas().values())
+        # Segunda réplica: mismo almacén, proceso nuevo; todo debe salir del disco
+        servidor.reiniciar_estadisticas()
+        restaurado = medir()
+        consultas_restaurado = sum(valores["consultas"] for valores in servidor.copiar_estadisticas().values())
+    finally:
+        servidor.shutdown()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    fallos = []
+    if sin_fixture:
+        fallos.append(f"{sin_fixture} consultas sin fixture en el primer render (vuelve a grabar las fixtures)")
+    if medidas["importacion_s"] > args.importacion:
+        fallos.append(f"importación {medidas['importacion_s']:.3f} s > {args.importacion} s")
+    if medidas["pesados_al_importar"]:
+        fallos.append("dependencias pesadas al importar: " + ", ".join(medidas["pesados_al_importar"]))
+    if medidas["primer_render_s"] > args.primer_render:
+        fallos.append(f"primer render {medidas['primer_render_s']:.3f} s > {args.primer_render} s")
+    if medidas["excepciones"]:
+        fallos.append(f"{medidas['excepciones']} excepciones en el primer render")
+    if consultas_restaurado:
+        fallos.append(f"{consultas_restaurado} consultas a los endpoints con el almacén ya lleno")
+    if restaurado["excepciones"]:
+        fallos.append(f"{restaurado['excepciones']} excepciones en el primer render con el almacén lleno")
+
+    print(f"importación    {medidas['importacion_s']:>7.3f} s  (límite {args.importacion} s)")
+    print(f"primer render  {medidas['primer_render_s']:>7.3f} s  (límite {args.primer_render} s)")
+    print(f"con almacén    {restaurado['primer_render_s']:>7.3f} s  ({consultas_restaurado} consultas a los endpoints)")
+    for fallo in fallos:
+        print(f"FALLO: {fallo}")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Benchmark de app.py contra el servidor de respuestas grabadas (bench.replay).
+
+Ejecuta la app sin navegador con `streamlit.testing.v1.AppTest` y mide, para cada
+sección, el tiempo en frío (cachés del proceso vacías) y en caliente (sesión nueva
+con las cachés ya llenas), junto con las consultas y bytes servidos por el replay.
+Cada acción vuelve a ejecutar la página entera, así que en frío se le descuenta una
+reejecución en frío de la página sin la acción: lo que queda es el coste de la sección.
+
+    python -m bench.benchmark [--latencia 0.2 --jitter 0.05 --repeticiones 5]
+    python -m bench.benchmark --grabar local      # graba fixtures desde el grafo local
+    python -m bench.benchmark --comparar bench/resultados/abc1234.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from . import replay
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+HISTORIAS = {
+    "historia_1986": "Argentina vs. Inglaterra (1986)",
+    "historia_drogba": "Drogba y la Paz en Costa de Marfil",
+    "historia_chile": "Chile y el 'Partido Fantasma' (1973)",
+}
+
+# Mensaje con el que run_query/run_queries muestran una consulta fallida
+PREFIJO_ERROR_CONSULTA = "Error al ejecutar la consulta"
+# Medidas de las que se descuenta la página base en frío
+DESCONTADAS = ("segundos", "consultas", "bytes")
+
+
+def _pulsar(clave):
+    return lambda at: at.button(key=clave).click().run()
+
+
+def _elegir_historia(titulo):
+    return lambda at: at.radio(key="historia_elegida").set_value(titulo).run()
+
+
+def _reejecutar(at):
+    at.run()
+
+
+# Sección -> acción sobre una app ya cargada (None: la propia carga inicial)
+SECCIONES = {
+    "carga_inicial": None,
+    "campeon": _pulsar("consultar_campeon"),
+    "quiz": _pulsar("generar_quiz"),
+    "dos_clubes": _pulsar("nuevos_clubes"),
+    **{seccion: _elegir_historia(titulo) for seccion, titulo in HISTORIAS.items()},
+}
+
+
+def commit_actual():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        sucio = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+    return f"{commit}-sucio" if sucio else commit
+
+
+class Medidor:
+    def __init__(self, servidor, timeout, semilla):
+        from streamlit.testing.v1 import AppTest
+        import consultas
+
+        self.AppTest = AppTest
+        self.consultas = consultas
+        self.servidor = servidor
+        self.timeout = timeout
+        self.semilla = semilla
+
+    def _sesion(self):
+        return self.AppTest.from_file(APP, default_timeout=self.timeout)
+
+    def medir(self, accion, frio):
+        """Ejecuta una vez la sección y devuelve tiempo, consultas, bytes y errores.
+
+        En frío, a una acción se le resta lo que cuesta reejecutar la página en frío sin ella.
+        """
+        if accion is None or not frio:
+            return self._medir(accion, frio)
+        base = self._medir(_reejecutar, True)
+        total = self._medir(accion, True)
+        return {clave: total[clave] - base[clave] if clave in DESCONTADAS else total[clave] for clave in total}
+
+    def _medir(self, accion, frio):
+        at = self._sesion()
+        if accion is not None:
+            at.run()
+        if frio:
+            self.consultas.reiniciar()
+        self.servidor.reiniciar_estadisticas()
+        random.seed(self.semilla)
+        inicio = time.perf_counter()
+        if accion is None:
+            at.run()
+        else:
+            accion(at)
+        segundos = time.perf_counter() - inicio
+        estadisticas = self.servidor.copiar_estadisticas()
+        return {
+            "segundos": segundos,
+            "consultas": sum(e["consultas"] for e in estadisticas.values()),
+            "bytes": sum(e["bytes"] for e in estadisticas.values()),
+            "sin_fixture": sum(e["sin_fixture"] for e in estadisticas.values()),
+            "errores": len(at.exception) + sum(e.value.startswith(PREFIJO_ERROR_CONSULTA) for e in at.error),
+        }
+
+
+def _resumir(muestras):
+    tiempos = [m["segundos"] for m in muestras]
+    ultima = muestras[-1]
+    return {
+        "mediana_s": round(statistics.median(tiempos), 4),
+        "min_s": round(min(tiempos), 4),
+        "max_s": round(max(tiempos), 4),
+        "consultas": ultima["consultas"],
+        "bytes": ultima["bytes"],
+        "sin_fixture": max(m["sin_fixture"] for m in muestras),
+        "errores": max(m["errores"] for m in muestras),
+    }
+
+
+def ejecutar_benchmark(servidor, secciones, repeticiones, timeout=120, semilla=0):
+    medidor = Medidor(servidor, timeout, semilla)
+    resultados = {}
+    for seccion in secciones:
+        accion = SECCIONES[seccion]
+        resultados[seccion] = {}
+        for modo, frio in (("frio", True), ("caliente", False)):
+            muestras = [medidor.medir(accion, frio) for _ in range(repeticiones)]
+            resultados[seccion][modo] = _resumir(muestras)
+        print(
+            f"{seccion:<16} frío {resultados[seccion]['frio']['mediana_s']:>8.3f} s"
+            f" ({resultados[seccion]['frio']['consultas']} consultas)"
+            f"  caliente {resultados[seccion]['caliente']['mediana_s']:>8.3f} s"
+            f" ({resultados[seccion]['caliente']['consultas']} consultas)",
+            file=sys.stderr,
+        )
+    return resultados
+
+
+def comparar(anterior, actual):
+    """Imprime la variación de la mediana por sección y modo respecto a otra ejecución"""
+    for seccion, modos in actual["secciones"].items():
+        for modo, valores in modos.items():
+            previo = anterior["secciones"].get(seccion, {}).get(modo)
+            if not previo:
+                continue
+            base = previo["mediana_s"]
+            cambio = (valores["mediana_s"] - base) / base * 100 if base else 0.0
+            print(
+                f"{seccion:<16} {modo:<9} {base:>8.3f} s -> {valores['mediana_s']:>8.3f} s ({cambio:+.1f} %)"
+                f"  consultas {previo['consultas']} -> {valores['consultas']}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=replay.DIRECTORIO_FIXTURES)
+    parser.add_argument("--latencia", type=float, default=0.1, help="segundos por respuesta del replay")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--secciones", nargs="+", choices=SECCIONES, default=list(SECCIONES))
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de `random` antes de cada medida")
+    parser.add_argument("--grabar", choices=replay.FUENTES, help="graba las consultas sin fixture desde esta fuente")
+    parser.add_argument("--salida", help="fichero JSON de resultados (por defecto bench/resultados/<commit>.json)")
+    parser.add_argument("--comparar", help="resultados de otra ejecución con los que comparar")
+    args = parser.parse_args(argv)
+
+    servidor = replay.iniciar(
+        fixtures=args.fixtures, latencia=args.latencia, jitter=args.jitter, grabar=replay.FUENTES.get(args.grabar)
+    )
+    # La app debe ir contra el replay, no contra el backend local
+    servidor.configurar_entorno()
+    os.environ["FUTBOL_SPARQL_BACKEND"] = "remoto"
+    # La precarga en segundo plano falsearía las mediciones en frío
+    os.environ["FUTBOL_PRECARGA"] = "0"
+    # Sin catálogo en disco: el quiz usa siempre los Mundiales fijos de las fixtures
+    os.environ["FUTBOL_CATALOGO"] = ""
+    os.environ["FUTBOL_ALMACEN"] = ""
+    try:
+        secciones = ejecutar_benchmark(servidor, args.secciones, args.repeticiones, semilla=args.semilla)
+    finally:
+        if args.grabar:
+            servidor.guardar_fixtures()
+        servidor.shutdown()
+
+    commit = commit_actual()
+    resultado = {
+        "commit": commit,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "parametros": {
+            "latencia": args.latencia,
+            "jitter": args.jitter,
+            "repeticiones": args.repeticiones,
+            "semilla": args.semilla,
+        },
+        "secciones": secciones,
+    }
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(json.load(f), resultado)
+
+
+if __name__ == "__main__":
+    main()
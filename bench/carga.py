@@ -0,0 +1,274 @@
+"""Prueba de carga: varias sesiones de app.py a la vez en un mismo proceso.
+
+Cada sesión es un `AppTest` en su propio hilo que repite el recorrido de un usuario
+(responder el quiz y pedir otra pregunta, "🔁 Probar con otros clubes" y cambiar de
+historia) contra el servidor de respuestas grabadas (bench.replay). Cada nivel de
+concurrencia se mide en un proceso hijo nuevo: tras un recorrido de calentamiento,
+las sesiones se ejecutan durante `--duracion` segundos y se informa de los reruns
+por segundo, los percentiles de latencia de cada rerun, las consultas que llegan a
+los endpoints y la memoria máxima (RSS) del proceso.
+
+    python -m bench.carga [--sesiones 1 2 4 8 16 --duracion 20 --pausa 0.5]
+    python -m bench.carga --comparar bench/resultados/carga-abc1234.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from . import replay
+from .benchmark import APP, DIRECTORIO_RESULTADOS, HISTORIAS, PREFIJO_ERROR_CONSULTA, RAIZ, commit_actual
+from .respaldo import percentil
+
+
+def _responder_quiz(at, rng):
+    clave = f"quiz_respuesta_{at.session_state.quiz_year}" if "quiz_year" in at.session_state else None
+    radios = [radio for radio in at.radio if radio.key == clave]
+    if not radios:
+        # Ya acertada (o sin pregunta): el usuario pide otra
+        return _generar_quiz(at, rng)
+    radios[0].set_value(rng.choice(radios[0].options))
+    at.button(key="responder_quiz").click().run()
+
+
+def _generar_quiz(at, rng):
+    at.button(key="generar_quiz").click().run()
+
+
+def _otros_clubes(at, rng):
+    at.button(key="nuevos_clubes").click().run()
+
+
+def _cambiar_historia(at, rng):
+    radio = at.radio(key="historia_elegida")
+    radio.set_value(rng.choice([titulo for titulo in HISTORIAS.values() if titulo != radio.value])).run()
+
+
+# Recorrido que repite cada sesión; cada paso es un rerun
+PASOS = {
+    "responder_quiz": _responder_quiz,
+    "generar_quiz": _generar_quiz,
+    "otros_clubes": _otros_clubes,
+    "cambiar_historia": _cambiar_historia,
+}
+
+
+def compartir_runtime():
+    """Permite ejecutar varios `AppTest` a la vez en hilos del mismo proceso.
+
+    AppTest instala un Runtime simulado al empezar cada ejecución y lo quita al
+    acabar, así que una sesión se lo quitaría a otra a mitad de ejecución. Sin
+    Runtime instalado se sigue usando el último (todos son equivalentes).
+    """
+    from streamlit.runtime import Runtime
+
+    ultimo = []
+    instance = Runtime.instance.__func__
+
+    def instancia(cls):
+        if cls._instance is not None:
+            ultimo[:] = [cls._instance]
+            return cls._instance
+        return ultimo[0] if ultimo else instance(cls)
+
+    Runtime.instance = classmethod(instancia)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(ultimo))
+
+
+def _errores(at):
+    return len(at.exception) + sum(e.value.startswith(PREFIJO_ERROR_CONSULTA) for e in at.error)
+
+
+def _consultas_replay(url_estadisticas):
+    with urllib.request.urlopen(url_estadisticas) as respuesta:
+        return sum(valores["consultas"] for valores in json.load(respuesta).values())
+
+
+def medir_hijo(sesiones, duracion, pausa, semilla, timeout, url_estadisticas):
+    """Se ejecuta en el proceso hijo: devuelve las medidas de un nivel de concurrencia"""
+    compartir_runtime()
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1.util import patch_config_options
+
+    random.seed(semilla)
+    # Una vez para todo el proceso: cada AppTest lo vuelve a aplicar y restaurar, y en hilos se cruzarían
+    with patch_config_options({"global.appTest": True}):
+        # Calentamiento: un usuario recorre la app entera, como el primero que llega al proceso
+        at = AppTest.from_file(APP, default_timeout=timeout).run()
+        rng = random.Random(semilla)
+        for paso in PASOS.values():
+            paso(at, rng)
+        calentamiento = _consultas_replay(url_estadisticas)
+
+        latencias = {nombre: [] for nombre in ("carga_inicial", *PASOS)}
+        errores = []
+        fin = time.monotonic() + duracion
+
+        def sesion(indice):
+            rng = random.Random(semilla + 1 + indice)
+            try:
+                at = AppTest.from_file(APP, default_timeout=timeout)
+                inicio = time.perf_counter()
+                at.run()
+                latencias["carga_inicial"].append(time.perf_counter() - inicio)
+                errores.append(_errores(at))
+                while time.monotonic() < fin:
+                    for nombre, paso in PASOS.items():
+                        if pausa:
+                            time.sleep(rng.uniform(0.5, 1.5) * pausa)
+                        inicio = time.perf_counter()
+                        paso(at, rng)
+                        latencias[nombre].append(time.perf_counter() - inicio)
+                        errores.append(_errores(at))
+                        if time.monotonic() >= fin:
+                            break
+            except Exception as e:
+                print(f"sesión {indice}: {e!r}", file=sys.stderr)
+                errores.append(1)
+
+        inicio = time.monotonic()
+        hilos = [threading.Thread(target=sesion, args=(i,), name=f"sesion-{i}") for i in range(sesiones)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.monotonic() - inicio
+
+    todas = [latencia for valores in latencias.values() for latencia in valores]
+    return {
+        "sesiones": sesiones,
+        "reruns": len(todas),
+        "segundos": round(segundos, 3),
+        "reruns_s": round(len(todas) / segundos, 2),
+        "p50_s": round(statistics.median(todas), 4),
+        "p95_s": round(percentil(todas, 0.95), 4),
+        "p99_s": round(percentil(todas, 0.99), 4),
+        "max_s": round(max(todas), 4),
+        "errores": sum(errores),
+        "consultas_calentamiento": calentamiento,
+        # En Linux ru_maxrss va en KiB
+        "rss_max_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "pasos": {
+            nombre: {
+                "reruns": len(valores),
+                "p50_s": round(statistics.median(valores), 4),
+                "p95_s": round(percentil(valores, 0.95), 4),
+            }
+            for nombre, valores in latencias.items() if valores
+        },
+    }
+
+
+def comparar(anterior, actual):
+    """Imprime la variación de reruns/s y p99 por nivel de concurrencia respecto a otra ejecución"""
+    previos = {nivel["sesiones"]: nivel for nivel in anterior["niveles"]}
+    for nivel in actual["niveles"]:
+        previo = previos.get(nivel["sesiones"])
+        if not previo:
+            continue
+        cambio = (nivel["reruns_s"] - previo["reruns_s"]) / previo["reruns_s"] * 100 if previo["reruns_s"] else 0.0
+        print(
+            f"{nivel['sesiones']:>3} sesiones  {previo['reruns_s']:>7.2f} -> {nivel['reruns_s']:>7.2f} reruns/s"
+            f" ({cambio:+.1f} %)"
+            f"  p99 {previo['p99_s']:.3f} -> {nivel['p99_s']:.3f} s"
+            f"  consultas {previo['consultas']} -> {nivel['consultas']}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=replay.DIRECTORIO_FIXTURES)
+    parser.add_argument("--latencia", type=float, default=0.1, help="segundos por respuesta del replay")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="niveles de concurrencia")
+    parser.add_argument("--duracion", type=float, default=20.0, help="segundos de medida por nivel")
+    parser.add_argument("--pausa", type=float, default=0.5, help="segundos medios que piensa el usuario entre reruns")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="segundos máximos de cada rerun")
+    parser.add_argument("--grabar", choices=replay.FUENTES, help="graba las consultas sin fixture desde esta fuente")
+    parser.add_argument("--salida", help="fichero JSON de resultados (por defecto bench/resultados/carga-<commit>.json)")
+    parser.add_argument("--comparar", help="resultados de otra ejecución con los que comparar")
+    parser.add_argument("--hijo", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--estadisticas", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.hijo:
+        medidas = medir_hijo(
+            args.sesiones[0], args.duracion, args.pausa, args.semilla, args.timeout, args.estadisticas
+        )
+        print(json.dumps(medidas))
+        return 0
+
+    servidor = replay.iniciar(
+        fixtures=args.fixtures, latencia=args.latencia, jitter=args.jitter, grabar=replay.FUENTES.get(args.grabar)
+    )
+    servidor.configurar_entorno()
+    host, puerto = servidor.server_address[:2]
+    # Como en bench.benchmark: contra el replay, sin precarga ni nada guardado en disco
+    entorno = dict(
+        os.environ, FUTBOL_SPARQL_BACKEND="remoto", FUTBOL_PRECARGA="0", FUTBOL_CATALOGO="", FUTBOL_ALMACEN=""
+    )
+    niveles = []
+    print(
+        f"{'sesiones':>8} {'reruns/s':>9} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'consultas':>10} {'RSS MB':>8} {'errores':>8}",
+        file=sys.stderr,
+    )
+    try:
+        for sesiones in args.sesiones:
+            servidor.reiniciar_estadisticas()
+            salida = subprocess.run(
+                [
+                    sys.executable, "-m", "bench.carga", "--hijo", "--sesiones", str(sesiones),
+                    "--duracion", str(args.duracion), "--pausa", str(args.pausa), "--semilla", str(args.semilla),
+                    "--timeout", str(args.timeout), "--estadisticas", f"http://{host}:{puerto}/__stats",
+                ],
+                cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True,
+            ).stdout
+            nivel = json.loads(salida.strip().splitlines()[-1])
+            estadisticas = servidor.copiar_estadisticas()
+            nivel["consultas"] = sum(e["consultas"] for e in estadisticas.values()) - nivel["consultas_calentamiento"]
+            nivel["sin_fixture"] = sum(e["sin_fixture"] for e in estadisticas.values())
+            niveles.append(nivel)
+            print(
+                f"{sesiones:>8} {nivel['reruns_s']:>9.2f} {nivel['p50_s']:>7.3f} {nivel['p95_s']:>7.3f}"
+                f" {nivel['p99_s']:>7.3f} {nivel['consultas']:>10} {nivel['rss_max_mb']:>8.1f} {nivel['errores']:>8}",
+                file=sys.stderr,
+            )
+    finally:
+        if args.grabar:
+            servidor.guardar_fixtures()
+        servidor.shutdown()
+
+    commit = commit_actual()
+    resultado = {
+        "commit": commit,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "parametros": {
+            "latencia": args.latencia,
+            "jitter": args.jitter,
+            "duracion": args.duracion,
+            "pausa": args.pausa,
+            "semilla": args.semilla,
+        },
+        "niveles": niveles,
+    }
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"carga-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(json.load(f), resultado)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Comprueba que las plantillas agregadas devuelven una sola fila por clave.
+
+Ejecuta cada plantilla de consultas.plantillas contra el backend configurado
+(`FUTBOL_SPARQL_BACKEND`, p. ej. `local` con el volcado) y termina con código 1
+si alguna devuelve filas repetidas.
+
+    FUTBOL_SPARQL_BACKEND=local FUTBOL_DATOS_LOCALES=bench/datos/muestra.ttl python -m bench.multiplicidad
+"""
+import sys
+
+from consultas import EQUIPOS, WIKIDATA_ENDPOINT, ejecutar, uri_completa
+from consultas.cache import tamano_resultado
+from consultas.columnas import a_columnas
+from consultas.plantillas import (
+    CLAVES_CARRERAS_EN_AMBOS_CLUBES,
+    CLAVES_CARRERAS_POR_CLUB,
+    carreras_en_ambos_clubes,
+    carreras_por_club,
+    filas_repetidas,
+)
+
+# Pares de clubes con muchos jugadores en común
+PARES = [("Real Madrid", "FC Barcelona"), ("Inter Milan", "AC Milan"), ("Juventus FC", "AC Milan")]
+
+
+def casos():
+    clubes = {nombre: uri_completa(info["uri"]) for nombre, info in EQUIPOS.items()}
+    desconocidos = sorted({nombre for par in PARES for nombre in par} - set(clubes))
+    if desconocidos:
+        raise SystemExit(f"Clubes de PARES que no están en EQUIPOS: {', '.join(desconocidos)}")
+    yield "carreras_por_club", carreras_por_club(list(clubes.values())), CLAVES_CARRERAS_POR_CLUB
+    for a, b in PARES:
+        yield f"carreras_en_ambos_clubes {a} / {b}", carreras_en_ambos_clubes(clubes[a], clubes[b]), CLAVES_CARRERAS_EN_AMBOS_CLUBES
+
+
+def main():
+    fallos = 0
+    for nombre, query, claves in casos():
+        resultado = ejecutar(query, WIKIDATA_ENDPOINT)
+        filas = a_columnas(resultado)
+        repetidas = filas_repetidas(filas, claves)
+        fallos += repetidas > 0
+        estado = "OK" if repetidas == 0 else f"{repetidas} FILAS REPETIDAS"
+        print(f"{nombre:<55} {len(filas):>7} filas {tamano_resultado(resultado):>10} bytes  {estado}")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Endpoint SPARQL local que reproduce respuestas grabadas con latencia configurable.
+
+Cada endpoint real se expone bajo un prefijo (`/wikidata/sparql`, `/dbpedia/sparql`,
+`/dbpedia-es/sparql`), y sus espejos bajo `/<nombre>/espejo<n>/sparql` con las
+mismas respuestas. Las respuestas se buscan en `fixtures/<nombre>.json` por la
+query normalizada; en modo grabación las que faltan se piden a la fuente elegida
+(los endpoints reales o el grafo local de `consultas.local`) y se guardan. Con
+`cola` una fracción de las respuestas tarda además `latencia_cola` segundos.
+
+Uso directo: python -m bench.replay --puerto 8900 [--latencia 0.2 --jitter 0.05]
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Nombre del prefijo -> endpoint real al que sustituye
+UPSTREAM = {
+    "wikidata": "https://query.wikidata.org/sparql",
+    "dbpedia": "https://dbpedia.org/sparql",
+    "dbpedia-es": "https://es.dbpedia.org/sparql",
+}
+
+# Variables de entorno que hacen que la app use este servidor
+VARIABLES_ENDPOINT = {
+    "wikidata": "FUTBOL_WIKIDATA_ENDPOINT",
+    "dbpedia": "FUTBOL_DBPEDIA_ENDPOINT",
+    "dbpedia-es": "FUTBOL_DBPEDIA_ES_ENDPOINT",
+}
+
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+# Volcado con el que se graban las fixtures versionadas (fuente "local")
+VOLCADO_MUESTRA = os.path.join(os.path.dirname(__file__), "datos", "muestra.ttl")
+
+
+def fuente_remota(query, nombre):
+    from consultas.cliente import ejecutar_remoto
+    return ejecutar_remoto(query, UPSTREAM[nombre])
+
+
+def fuente_local(query, nombre):
+    # Sin volcado configurado, el de muestra: así las fixtures se pueden regenerar tal cual
+    os.environ.setdefault("FUTBOL_DATOS_LOCALES", VOLCADO_MUESTRA)
+    from consultas.local import ejecutar_local
+    return ejecutar_local(query, UPSTREAM[nombre])
+
+
+FUENTES = {"remoto": fuente_remota, "local": fuente_local}
+
+
+def normalizar(query):
+    # Importado aquí para que las URLs de consultas.endpoints se lean después de configurar el entorno
+    from consultas.cache import normalizar_query
+    return normalizar_query(query)
+
+
+class ServidorReplay(ThreadingHTTPServer):
+    """Servidor HTTP de respuestas grabadas; `grabar` es una de FUENTES o None"""
+
+    daemon_threads = True
+
+    def __init__(
+        self, direccion, fixtures=DIRECTORIO_FIXTURES, latencia=0.0, jitter=0.0, grabar=None, cola=0.0, latencia_cola=0.0
+    ):
+        super().__init__(direccion, ManejadorSparql)
+        self.fixtures = fixtures
+        self.latencia = latencia
+        self.jitter = jitter
+        self.cola = cola
+        self.latencia_cola = latencia_cola
+        self.grabar = grabar
+        self.respuestas = {}
+        for nombre in UPSTREAM:
+            ruta = os.path.join(fixtures, f"{nombre}.json")
+            if os.path.exists(ruta):
+                with open(ruta, encoding="utf-8") as f:
+                    self.respuestas[nombre] = {
+                        query: json.dumps(resultado).encode("utf-8") for query, resultado in json.load(f).items()
+                    }
+            else:
+                self.respuestas[nombre] = {}
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+    def url(self, nombre, espejo=None):
+        host, puerto = self.server_address[:2]
+        if espejo is not None:
+            return f"http://{host}:{puerto}/{nombre}/espejo{espejo}/sparql"
+        return f"http://{host}:{puerto}/{nombre}/sparql"
+
+    def configurar_entorno(self):
+        """Apunta las variables FUTBOL_*_ENDPOINT a este servidor"""
+        for nombre, variable in VARIABLES_ENDPOINT.items():
+            os.environ[variable] = self.url(nombre)
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self.estadisticas = {nombre: {"consultas": 0, "bytes": 0, "sin_fixture": 0} for nombre in UPSTREAM}
+
+    def copiar_estadisticas(self):
+        with self._lock:
+            return {nombre: dict(valores) for nombre, valores in self.estadisticas.items()}
+
+    def responder(self, nombre, query):
+        """Devuelve el cuerpo JSON de la respuesta, o None si no hay fixture"""
+        clave = normalizar(query)
+        cuerpo = self.respuestas[nombre].get(clave)
+        if cuerpo is None and self.grabar is not None:
+            cuerpo = json.dumps(self.grabar(query, nombre)).encode("utf-8")
+            with self._lock:
+                self.respuestas[nombre][clave] = cuerpo
+        with self._lock:
+            estadisticas = self.estadisticas[nombre]
+            estadisticas["consultas"] += 1
+            if cuerpo is None:
+                estadisticas["sin_fixture"] += 1
+            else:
+                estadisticas["bytes"] += len(cuerpo)
+        espera = self.latencia + random.uniform(-self.jitter, self.jitter)
+        if self.cola and random.random() < self.cola:
+            espera += self.latencia_cola
+        if espera > 0:
+            time.sleep(espera)
+        return cuerpo
+
+    def guardar_fixtures(self):
+        os.makedirs(self.fixtures, exist_ok=True)
+        for nombre, respuestas in self.respuestas.items():
+            if not respuestas:
+                continue
+            contenido = {query: json.loads(cuerpo) for query, cuerpo in sorted(respuestas.items())}
+            with open(os.path.join(self.fixtures, f"{nombre}.json"), "w", encoding="utf-8") as f:
+                json.dump(contenido, f, ensure_ascii=False, indent=1)
+
+
+class ManejadorSparql(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _enviar(self, codigo, cuerpo, tipo="application/sparql-results+json"):
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _atender(self, parametros):
+        partes = urlparse(self.path).path.strip("/").split("/")
+        if partes == ["__stats"]:
+            return self._enviar(200, json.dumps(self.server.copiar_estadisticas()).encode(), "application/json")
+        # /<nombre>/sparql o /<nombre>/espejo<n>/sparql
+        ruta_valida = partes[-1] == "sparql" and (len(partes) == 2 or len(partes) == 3 and partes[1].startswith("espejo"))
+        if not ruta_valida or partes[0] not in UPSTREAM or "query" not in parametros:
+            return self._enviar(400, b"consulta no reconocida", "text/plain")
+        try:
+            cuerpo = self.server.responder(partes[0], parametros["query"][0])
+        except Exception as e:
+            return self._enviar(502, str(e).encode("utf-8"), "text/plain")
+        if cuerpo is None:
+            return self._enviar(404, b"sin fixture para esta consulta", "text/plain")
+        self._enviar(200, cuerpo)
+
+    def do_GET(self):
+        self._atender(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        longitud = int(self.headers.get("Content-Length", 0))
+        cuerpo = self.rfile.read(longitud).decode("utf-8")
+        if self.headers.get("Content-Type", "").startswith("application/sparql-query"):
+            parametros = {"query": [cuerpo]}
+        else:
+            parametros = parse_qs(cuerpo)
+        self._atender(parametros)
+
+
+def iniciar(puerto=0, **opciones):
+    """Arranca el servidor en un hilo y lo devuelve"""
+    servidor = ServidorReplay(("127.0.0.1", puerto), **opciones)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--puerto", type=int, default=8900)
+    parser.add_argument("--fixtures", default=DIRECTORIO_FIXTURES)
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variación aleatoria (± segundos)")
+    parser.add_argument("--grabar", choices=FUENTES, help="pide a esta fuente y guarda las consultas sin fixture")
+    parser.add_argument("--cola", type=float, default=0.0, help="fracción de respuestas lentas")
+    parser.add_argument("--latencia-cola", type=float, default=0.0, help="segundos extra de las respuestas lentas")
+    args = parser.parse_args()
+    servidor = ServidorReplay(
+        ("127.0.0.1", args.puerto), args.fixtures, args.latencia, args.jitter, FUENTES.get(args.grabar),
+        args.cola, args.latencia_cola,
+    )
+    for nombre, variable in VARIABLES_ENDPOINT.items():
+        print(f"{variable}={servidor.url(nombre)}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        if args.grabar:
+            servidor.guardar_fixtures()
@@ -0,0 +1,85 @@
+"""Latencia de las consultas de las historias con y sin peticiones de respaldo a espejos.
+
+Lanza las consultas de las historias contra el servidor de respuestas grabadas
+(bench.replay), con una fracción de respuestas lentas, primero solo contra cada
+endpoint y luego con `consultas.respaldo` y `--espejos` espejos por endpoint, y
+compara sus percentiles.
+
+    python -m bench.respaldo [--repeticiones 100 --cola 0.03 --latencia-cola 0.5]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from . import replay
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def medir(consultas, ejecutar, repeticiones):
+    """Latencias de `ejecutar(query, endpoint)` para cada consulta, `repeticiones` veces"""
+    latencias = []
+    for _ in range(repeticiones):
+        for query, endpoint, _ in consultas:
+            inicio = time.perf_counter()
+            ejecutar(query, endpoint)
+            latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=replay.DIRECTORIO_FIXTURES)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    parser.add_argument("--latencia", type=float, default=0.02, help="segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--cola", type=float, default=0.03, help="fracción de respuestas lentas")
+    parser.add_argument("--latencia-cola", type=float, default=0.5, help="segundos extra de las respuestas lentas")
+    parser.add_argument("--espejos", type=int, default=1, help="espejos por endpoint")
+    args = parser.parse_args(argv)
+
+    servidor = replay.iniciar(
+        fixtures=args.fixtures, latencia=args.latencia, jitter=args.jitter,
+        cola=args.cola, latencia_cola=args.latencia_cola,
+    )
+    # Antes de importar consultas, para que sus endpoints sean los del replay
+    servidor.configurar_entorno()
+    from consultas.cliente import ejecutar_remoto
+    from consultas.historias import todas_las_consultas
+    from consultas.respaldo import GrupoEndpoints
+
+    consultas = todas_las_consultas()
+    nombres = {servidor.url(nombre): nombre for nombre in replay.UPSTREAM}
+    grupos = {
+        endpoint: GrupoEndpoints(endpoint, [servidor.url(nombres[endpoint], i) for i in range(1, args.espejos + 1)])
+        for _, endpoint, _ in consultas
+    }
+
+    def con_respaldo(query, endpoint):
+        return grupos[endpoint].ejecutar(lambda url, cancelado: ejecutar_remoto(query, url))
+
+    try:
+        modos = {
+            "sin respaldo": medir(consultas, ejecutar_remoto, args.repeticiones),
+            "con respaldo": medir(consultas, con_respaldo, args.repeticiones),
+        }
+    finally:
+        servidor.shutdown()
+
+    for modo, latencias in modos.items():
+        print(
+            f"{modo:<13} p50 {statistics.median(latencias):.3f} s  p95 {percentil(latencias, 0.95):.3f} s  "
+            f"p99 {percentil(latencias, 0.99):.3f} s  máx {max(latencias):.3f} s"
+        )
+    peticiones = sum(grupo.peticiones for grupo in grupos.values())
+    respaldos = sum(grupo.respaldos for grupo in grupos.values())
+    print(f"respaldos lanzados: {respaldos} de {peticiones} consultas ({respaldos / peticiones:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Capa de acceso a datos SPARQL de Fútbol Conectado."""
+from .cache import CacheResultados, normalizar_query
+from .cliente import (
+    DBPEDIA_ENDPOINT,
+    DBPEDIA_ES_ENDPOINT,
+    WIKIDATA_ENDPOINT,
+    cache,
+    consultar,
+    consultar_con_origen,
+    consultar_guardado,
+    ejecutar,
+    ejecutar_remoto,
+    vuelos,
+)
+from .lotes import consultar_lote, lanzar_lote
+from .persistencia import AlmacenResultados, almacen as almacen_resultados
+from .metricas import Metricas, iniciar_servidor as iniciar_servidor_metricas, registro as registro_metricas
+from .resiliencia import CircuitoAbierto, LimiteExcedido
+from .plazos import (
+    Plazo,
+    PlazoVencido,
+    Respuesta,
+    consultar_con_plazo,
+    consultar_por_llegada,
+    ejecutar_con_plazo,
+    estadisticas as estadisticas_plazos,
+)
+from .respaldo import GrupoEndpoints, RespuestaInvalida, estadisticas as estadisticas_respaldo
+from .campeones import TablaCampeones, cargar_tabla_campeones
+from .catalogo import Catalogo, catalogo, mundiales_disponibles, tabla_campeones, tabla_campeones_cargada
+from .clubes import IndiceClubes, cargar_indice_clubes, cargar_jugadores_en_comun, indice_cargado, uri_completa
+from .imagenes import imagen_miniatura, imagenes_miniaturas, miniatura, miniaturas
+from .etiquetas import CacheEtiquetas, etiquetar, etiquetas as cache_etiquetas, resolver as resolver_etiquetas
+from .datos import COMPETICIONES, COPA_MUNDIAL, EQUIPOS, ENTIDADES_HISTORIAS, MUNDIALES, RECURSOS_DBPEDIA
+from .historias import CONSULTAS_HISTORIAS
+from .precarga import Precarga, iniciar_precarga
+from .pares import AlmacenPares, CarreraJugador, Par, almacen as almacen_pares, id_par, obtener_par, par_desde_consulta
+from .preguntas import ColaPreguntas, pregunta_clubes, pregunta_mundial, preparar_pregunta_clubes
+from .nombres import IndiceNombres, plegar
+
+
+def reiniciar():
+    """Vacía las cachés y tablas en memoria del proceso (benchmarks y pruebas de carga).
+
+    El almacén en disco no se toca: lo comparten otros procesos.
+    """
+    from . import campeones, clubes, etiquetas, pares
+
+    cache.limpiar()
+    etiquetas.etiquetas.limpiar()
+    campeones._tablas.clear()
+    clubes._indices.clear()
+    pares.almacen.limpiar()
@@ -0,0 +1,124 @@
+"""Caché de resultados SPARQL con TTL por endpoint y desalojo LRU por tamaño."""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Cadenas, IRIs y tramos de comentarios y espacios: lo único que se toca al normalizar
+# son los comentarios y los espacios; cadenas e IRIs se conservan tal cual.
+_TOKENS = re.compile(
+    r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|<[^\s<>]*>)'
+    r"|((?:\s|#[^\n]*)+)"
+)
+
+
+def normalizar_query(query):
+    """Colapsa espacios y elimina comentarios para que consultas equivalentes compartan clave"""
+    def reemplazar(m):
+        return m.group(1) if m.group(1) is not None else " "
+    return _TOKENS.sub(reemplazar, query).strip()
+
+
+def tamano_resultado(resultado):
+    """Estima en bytes lo que ocupa un resultado (serializado, o en memoria si es columnar)"""
+    if hasattr(resultado, "memory_usage"):
+        return int(resultado.memory_usage(deep=True).sum())
+    return len(json.dumps(resultado, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+class CacheResultados:
+    """Caché LRU con presupuesto de bytes y TTL configurable por endpoint.
+
+    Los resultados se comparten entre sesiones: quien los lea no debe modificarlos.
+    """
+
+    def __init__(self, max_bytes, ttl_por_defecto, ttl_por_endpoint=None):
+        self.max_bytes = max_bytes
+        self.ttl_por_defecto = ttl_por_defecto
+        self.ttl_por_endpoint = dict(ttl_por_endpoint or {})
+        self._entradas = OrderedDict()  # clave -> (resultado, expira, tamaño)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self.servidos_caducados = 0
+
+    @staticmethod
+    def clave(query, endpoint, columnar=False):
+        # La versión columnar se guarda aparte: no comparte formato con la JSON
+        if columnar:
+            return (endpoint, normalizar_query(query), "columnas")
+        return (endpoint, normalizar_query(query))
+
+    def ttl(self, endpoint):
+        return self.ttl_por_endpoint.get(endpoint, self.ttl_por_defecto)
+
+    def obtener(self, clave):
+        """Devuelve el resultado guardado o None si no existe o ha expirado"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            resultado, expira, _ = entrada
+            if expira <= time.monotonic():
+                # Se conserva (hasta que el LRU lo desaloje) como respaldo si el endpoint falla
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+
+    def obtener_caducado(self, clave):
+        """Devuelve el último resultado guardado aunque haya expirado, o None"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            self.servidos_caducados += 1
+            return entrada[0]
+
+    def guardar(self, clave, resultado, ttl=None):
+        """Guarda un resultado, desalojando los menos usados si se supera el presupuesto, y devuelve su tamaño.
+
+        Sin `ttl` dura el TTL de su endpoint.
+        """
+        tamano = tamano_resultado(resultado)
+        if tamano > self.max_bytes:
+            return tamano
+        expira = time.monotonic() + (self.ttl(clave[0]) if ttl is None else ttl)
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[2]
+            self._entradas[clave] = (resultado, expira, tamano)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+                self.desalojos += 1
+        return tamano
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "expirados": self.expirados,
+                "servidos_caducados": self.servidos_caducados,
+                "ratio_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
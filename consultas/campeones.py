@@ -0,0 +1,89 @@
+"""Tabla en memoria de campeones del Mundial, cargada con una sola consulta."""
+import random
+import threading
+import time
+
+from .cliente import WIKIDATA_ENDPOINT, cache, consultar
+from .etiquetas import etiquetar
+
+
+def query_campeones(mundiales):
+    """Devuelve una query VALUES con el campeón de cada Mundial del diccionario (sin etiquetas, ver `etiquetas`)"""
+    values_clause = " ".join(f"wd:{qid}" for qid in mundiales.values())
+    return f"""
+    SELECT ?mundial ?winner WHERE {{
+        VALUES ?mundial {{ {values_clause} }}
+        ?mundial wdt:P1346 ?winner .
+    }}
+    """
+
+
+class TablaCampeones:
+    """Campeones indexados por año: {año: {"qid", "uri", "label"}}"""
+
+    def __init__(self, mundiales, resultados):
+        anio_por_qid = {qid: anio for anio, qid in mundiales.items()}
+        self.por_anio = {}
+        for r in resultados["results"]["bindings"]:
+            qid = r["mundial"]["value"].rsplit("/", 1)[-1]
+            if qid in anio_por_qid:
+                self.por_anio[anio_por_qid[qid]] = {
+                    "qid": qid,
+                    "uri": r["winner"]["value"],
+                    "label": r["winnerLabel"]["value"],
+                }
+
+    @classmethod
+    def desde_anios(cls, por_anio):
+        """Tabla a partir de campeones ya conocidos: {año: {"qid", "uri", "label"}}"""
+        tabla = cls({}, {"results": {"bindings": []}})
+        tabla.por_anio = dict(por_anio)
+        return tabla
+
+    def campeon(self, anio):
+        return self.por_anio.get(anio)
+
+    def pregunta(self, num_incorrectas=3, rng=random):
+        """Devuelve (año, respuesta correcta, opciones barajadas) o None si no hay datos suficientes"""
+        if not self.por_anio:
+            return None
+        anio = rng.choice(list(self.por_anio))
+        correcta = self.por_anio[anio]["label"]
+        incorrectas = sorted({c["label"] for c in self.por_anio.values()} - {correcta})
+        if not incorrectas:
+            return None
+        opciones = rng.sample(incorrectas, min(num_incorrectas, len(incorrectas))) + [correcta]
+        rng.shuffle(opciones)
+        return anio, correcta, opciones
+
+
+_tablas = {}  # mundiales congelados -> (tabla, expira)
+_lock = threading.Lock()
+
+
+def cargar_tabla_campeones(mundiales, refrescar=False):
+    """Devuelve la tabla de campeones, consultándola solo cuando no existe o ha expirado.
+
+    Con `refrescar` se vuelve a consultar aunque siga vigente; mientras tanto las demás
+    llamadas siguen recibiendo la tabla anterior, que se sustituye de una vez.
+    """
+    clave = tuple(sorted(mundiales.items()))
+    ahora = time.monotonic()
+    entrada = _tablas.get(clave)
+    if not refrescar and entrada is not None and entrada[1] > ahora:
+        return entrada[0]
+    with _lock:
+        entrada = _tablas.get(clave)
+        if not refrescar and entrada is not None and entrada[1] > time.monotonic():
+            return entrada[0]
+        resultados = consultar(query_campeones(mundiales), WIKIDATA_ENDPOINT, "campeones", refrescar=refrescar)
+        resultados = etiquetar(resultados, "winner", refrescar=refrescar)
+        tabla = TablaCampeones(mundiales, resultados)
+        _tablas[clave] = (tabla, time.monotonic() + cache.ttl(WIKIDATA_ENDPOINT))
+        return tabla
+
+
+def tabla_cargada(mundiales):
+    """Tabla ya cargada para esos Mundiales (aunque haya expirado), o None; nunca consulta la red"""
+    entrada = _tablas.get(tuple(sorted(mundiales.items())))
+    return entrada[0] if entrada is not None else None
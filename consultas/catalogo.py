@@ -0,0 +1,252 @@
+"""Catálogo de torneos (ediciones de las competiciones de datos.COMPETICIONES) con sincronización incremental.
+
+Una consulta masiva descubre todas las ediciones con su `schema:dateModified`; solo
+las nuevas o modificadas desde la última sincronización se vuelven a pedir (año,
+nombre y campeón), en lotes. El catálogo se guarda en disco, así un proceso nuevo
+arranca con él sin consultar nada y un refresco cuesta tanto como los cambios.
+
+    python -m consultas.catalogo   # sincroniza ahora y muestra el resumen
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from .campeones import TablaCampeones, cargar_tabla_campeones, tabla_cargada
+from .cliente import WIKIDATA_ENDPOINT, consultar
+from .datos import COMPETICIONES, COPA_MUNDIAL, MUNDIALES
+from .endpoints import BACKEND
+from .etiquetas import etiquetar
+from .lotes import consultar_lote
+
+# Fichero del catálogo; vacío desactiva el catálogo y se usan los Mundiales fijos de datos.MUNDIALES.
+# Por defecto cada backend tiene el suyo, para que el del grafo local no pase por el de Wikidata.
+RUTA = os.environ.get(
+    "FUTBOL_CATALOGO",
+    os.path.join(".cache", "catalogo.json" if BACKEND == "remoto" else f"catalogo-{BACKEND}.json"),
+)
+# Torneos por consulta de detalle
+TORNEOS_POR_CONSULTA = 50
+VERSION = 1
+
+_ANIO = re.compile(r"\b(1[89]\d\d|20\d\d)\b")
+
+
+def query_descubrimiento(competiciones):
+    """Devuelve la query con una fila por edición de las competiciones y su fecha de modificación"""
+    values_clause = " ".join(f"wd:{qid}" for qid in competiciones)
+    return f"""
+    SELECT ?torneo ?competicion ?modificado WHERE {{
+        VALUES ?competicion {{ {values_clause} }}
+        ?torneo wdt:P3450 ?competicion;
+                schema:dateModified ?modificado .
+    }}
+    """
+
+
+def query_detalle(qids):
+    """Devuelve la query con las fechas y el campeón de los torneos dados (los nombres, de `etiquetas`)"""
+    values_clause = " ".join(f"wd:{qid}" for qid in qids)
+    return f"""
+    SELECT ?torneo ?inicio ?momento ?winner WHERE {{
+        VALUES ?torneo {{ {values_clause} }}
+        OPTIONAL {{ ?torneo wdt:P580 ?inicio . }}
+        OPTIONAL {{ ?torneo wdt:P585 ?momento . }}
+        OPTIONAL {{ ?torneo wdt:P1346 ?winner . }}
+    }}
+    """
+
+
+def _qid(uri):
+    return uri.rsplit("/", 1)[-1]
+
+
+def _valor(fila, campo):
+    return fila[campo]["value"] if campo in fila else None
+
+
+def _detalles(resultados):
+    """{qid: {anio, etiqueta, campeon}} a partir de las filas de `query_detalle`"""
+    detalles = {}
+    for fila in resultados["results"]["bindings"]:
+        qid = _qid(fila["torneo"]["value"])
+        detalle = detalles.setdefault(qid, {"anio": None, "etiqueta": None, "campeon": None})
+        detalle["etiqueta"] = detalle["etiqueta"] or _valor(fila, "torneoLabel")
+        # El año sale de la fecha de inicio o de la fecha puntual; si no hay, del nombre
+        for campo in ("inicio", "momento"):
+            fecha = _valor(fila, campo)
+            if fecha and (detalle["anio"] is None or fecha[:4] < detalle["anio"]):
+                detalle["anio"] = fecha[:4]
+        if detalle["campeon"] is None and "winner" in fila:
+            detalle["campeon"] = {"uri": fila["winner"]["value"], "label": _valor(fila, "winnerLabel")}
+    for detalle in detalles.values():
+        if detalle["anio"] is None and detalle["etiqueta"]:
+            m = _ANIO.search(detalle["etiqueta"])
+            detalle["anio"] = m.group(1) if m else None
+    return detalles
+
+
+class Catalogo:
+    """Torneos conocidos por QID, persistidos en `ruta` y sincronizados por cambios.
+
+    Los datos se sustituyen de una vez al terminar cada sincronización: quien los
+    lea mientras tanto sigue viendo la versión anterior.
+    """
+
+    def __init__(self, ruta=RUTA, competiciones=COMPETICIONES):
+        self.ruta = ruta
+        self.competiciones = list(competiciones)
+        self.ultima = {}  # resumen de la última sincronización
+        self._torneos = None  # qid -> {competicion, modificado, anio, etiqueta, campeon}
+        self._sincronizado = None
+        self._tablas = {}  # competicion -> TablaCampeones de la versión actual
+        self._lock = threading.Lock()
+        self._lock_sincronizar = threading.Lock()
+
+    def torneos(self):
+        """Torneos actuales (se leen del disco la primera vez); no deben modificarse"""
+        if self._torneos is None:
+            with self._lock:
+                if self._torneos is None:
+                    self._torneos, self._sincronizado = self._leer()
+        return self._torneos
+
+    def __len__(self):
+        return len(self.torneos())
+
+    def _leer(self):
+        try:
+            with open(self.ruta, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}, None
+        # Un catálogo de otro backend (misma ruta explícita) se descarta como uno de otra versión
+        if datos.get("version") != VERSION or datos.get("backend", "remoto") != BACKEND:
+            return {}, None
+        return datos["torneos"], datos.get("sincronizado")
+
+    def _escribir(self, torneos, sincronizado):
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": VERSION, "backend": BACKEND, "sincronizado": sincronizado, "torneos": torneos},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(temporal, self.ruta)
+
+    def sincronizar(self):
+        """Descubre las ediciones y vuelve a pedir solo las nuevas o modificadas; devuelve el resumen.
+
+        Una sincronización en curso hace esperar a la siguiente en lugar de repetirla a la vez.
+        """
+        with self._lock_sincronizar:
+            inicio = time.perf_counter()
+            anteriores = self.torneos()
+            resultados = consultar(
+                query_descubrimiento(self.competiciones), WIKIDATA_ENDPOINT, "catalogo", refrescar=True
+            )
+            modificados = {}
+            for fila in resultados["results"]["bindings"]:
+                qid = _qid(fila["torneo"]["value"])
+                modificado = fila["modificado"]["value"]
+                # Con varias fechas (no debería) se queda la más reciente
+                if modificado > modificados.get(qid, ("", ""))[1]:
+                    modificados[qid] = (_qid(fila["competicion"]["value"]), modificado)
+
+            cambiados = sorted(
+                qid for qid, (_, modificado) in modificados.items()
+                if qid not in anteriores or anteriores[qid]["modificado"] != modificado
+            )
+            lotes = [cambiados[i:i + TORNEOS_POR_CONSULTA] for i in range(0, len(cambiados), TORNEOS_POR_CONSULTA)]
+            detalles = {}
+            for resultado in consultar_lote(
+                [(query_detalle(lote), WIKIDATA_ENDPOINT, "catalogo_detalle") for lote in lotes], refrescar=True
+            ):
+                if isinstance(resultado, Exception):
+                    raise resultado
+                # Estricto: el catálogo guarda las etiquetas en disco y no volvería a pedir las que faltasen
+                detalles.update(_detalles(etiquetar(resultado, "torneo", "winner", refrescar=True, estricto=True)))
+
+            torneos = {}
+            for qid, (competicion, modificado) in modificados.items():
+                if qid in detalles:
+                    torneos[qid] = {"competicion": competicion, "modificado": modificado, **detalles[qid]}
+                elif qid in anteriores and anteriores[qid]["modificado"] == modificado:
+                    torneos[qid] = anteriores[qid]
+            sincronizado = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self.ultima = {
+                "torneos": len(torneos),
+                "nuevos": sum(qid not in anteriores for qid in cambiados),
+                "modificados": sum(qid in anteriores for qid in cambiados),
+                "eliminados": sum(qid not in modificados for qid in anteriores),
+                "consultas": 1 + len(lotes),
+                "duracion_s": round(time.perf_counter() - inicio, 3),
+            }
+            if cambiados or self.ultima["eliminados"] or self._sincronizado is None:
+                if self.ruta:
+                    self._escribir(torneos, sincronizado)
+                with self._lock:
+                    self._torneos = torneos
+                    self._tablas = {}
+            with self._lock:
+                self._sincronizado = sincronizado
+            return self.ultima
+
+    def ediciones(self, competicion=COPA_MUNDIAL):
+        """{año: qid} de las ediciones con campeón de una competición, ordenadas por año"""
+        return {
+            torneo["anio"]: qid
+            for qid, torneo in sorted(self.torneos().items(), key=lambda item: item[1]["anio"] or "")
+            if torneo["competicion"] == competicion and torneo["anio"] and torneo["campeon"]
+        }
+
+    def tabla(self, competicion=COPA_MUNDIAL):
+        """Tabla de campeones de la competición construida desde el catálogo (sin consultar), o None si no hay datos"""
+        tabla = self._tablas.get(competicion)
+        if tabla is None:
+            torneos = self.torneos()
+            por_anio = {
+                torneo["anio"]: {"qid": qid, "uri": torneo["campeon"]["uri"], "label": torneo["campeon"]["label"]}
+                for qid, torneo in torneos.items()
+                if torneo["competicion"] == competicion and torneo["anio"] and torneo["campeon"]
+            }
+            if not por_anio:
+                return None
+            tabla = TablaCampeones.desde_anios(por_anio)
+            with self._lock:
+                if self._torneos is torneos:
+                    self._tablas[competicion] = tabla
+        return tabla
+
+    def estadisticas(self):
+        return {"ruta": self.ruta, "torneos": len(self), "sincronizado": self._sincronizado, "ultima": self.ultima}
+
+
+catalogo = Catalogo() if RUTA else None
+
+
+def tabla_campeones():
+    """Tabla de campeones de la Copa Mundial: la del catálogo si tiene datos, si no la de datos.MUNDIALES"""
+    tabla = catalogo.tabla() if catalogo is not None else None
+    return tabla if tabla is not None else cargar_tabla_campeones(MUNDIALES)
+
+
+def tabla_campeones_cargada():
+    """Como `tabla_campeones`, pero solo con lo ya cargado (aunque haya expirado) o None; nunca consulta la red"""
+    tabla = catalogo.tabla() if catalogo is not None else None
+    return tabla if tabla is not None else tabla_cargada(MUNDIALES)
+
+
+def mundiales_disponibles():
+    """{año: qid} de los Mundiales que ofrece la app: los del catálogo o, sin él, los de datos.MUNDIALES"""
+    return (catalogo.ediciones() if catalogo is not None else None) or MUNDIALES
+
+
+if __name__ == "__main__":
+    if catalogo is None:
+        sys.exit("FUTBOL_CATALOGO está vacío: el catálogo está desactivado")
+    print(json.dumps(catalogo.sincronizar(), ensure_ascii=False))
@@ -0,0 +1,166 @@
+"""Ejecución de consultas SPARQL contra los endpoints remotos."""
+import os
+import time
+
+from .cache import CacheResultados
+from .coalescencia import VueloUnico
+from .endpoints import BACKEND, DBPEDIA_ENDPOINT, DBPEDIA_ES_ENDPOINT, WIKIDATA_ENDPOINT
+from .metricas import filas, registro as metricas
+from .persistencia import almacen
+from .resiliencia import proteger
+from .respaldo import grupo
+
+USER_AGENT = "FutbolConectadoApp/1.0 (mailto:daniel@example.com)"
+
+# Segundos máximos de cada petición HTTP a un endpoint
+TIMEOUT = float(os.environ.get("FUTBOL_SPARQL_TIMEOUT", 30))
+# Consultas más largas se envían por POST (p. ej. lotes de etiquetas): una URL tan larga se rechaza
+MAX_LONGITUD_GET = 2000
+
+# Los datos cambian como mucho semanalmente: horas de TTL son suficientes.
+cache = CacheResultados(
+    max_bytes=int(os.environ.get("FUTBOL_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ttl_por_defecto=6 * 3600,
+    ttl_por_endpoint={
+        WIKIDATA_ENDPOINT: 6 * 3600,
+        DBPEDIA_ENDPOINT: 24 * 3600,
+        DBPEDIA_ES_ENDPOINT: 24 * 3600,
+    },
+)
+
+# Consultas idénticas simultáneas (de cualquier sesión) comparten una sola petición
+vuelos = VueloUnico()
+
+
+def ejecutar_remoto(query, endpoint):
+    """Lanza la consulta contra el endpoint sin pasar por la caché"""
+    # Importado aquí: el backend local y el arranque de la app no lo necesitan
+    from SPARQLWrapper import JSON, POST, SPARQLWrapper
+
+    sparql = SPARQLWrapper(endpoint)
+    sparql.setQuery(query)
+    if len(query) > MAX_LONGITUD_GET:
+        sparql.setMethod(POST)
+    sparql.setReturnFormat(JSON)
+    sparql.setTimeout(TIMEOUT)
+    sparql.addCustomHttpHeader("User-Agent", USER_AGENT)
+    return sparql.query().convert()
+
+
+def ejecutar(query, endpoint):
+    """Lanza la consulta contra el backend configurado sin pasar por la caché.
+
+    Si el endpoint tiene espejos, se lanza además contra ellos cuando tarda (ver `respaldo`).
+    """
+    if BACKEND == "local":
+        from .local import ejecutar_local
+        return ejecutar_local(query, endpoint)
+    espejos = grupo(endpoint, TIMEOUT)
+    if espejos is not None:
+        return espejos.ejecutar(lambda url, cancelado: proteger(url, lambda: ejecutar_remoto(query, url), cancelado))
+    return proteger(endpoint, lambda: ejecutar_remoto(query, endpoint))
+
+
+def consultar(query, endpoint, etiqueta=None, columnar=False, tipos=None, refrescar=False):
+    """Devuelve el resultado de la consulta, sirviéndolo desde la caché si es posible.
+
+    Si el endpoint falla se sirve el último resultado conocido aunque haya caducado;
+    si no lo hay, se propaga la excepción. Los errores nunca se guardan en caché.
+    `etiqueta` agrupa la consulta en las métricas. Con `columnar` se devuelve (y se
+    guarda en caché) un DataFrame de `a_columnas(resultado, tipos)`, mucho más compacto.
+    Con `refrescar` se consulta el endpoint aunque la entrada siga vigente y se reemplaza
+    en la caché (lo usa la precarga para renovar los datos antes de que caduquen).
+    Lo que no está en memoria se busca en el almacén en disco compartido entre procesos
+    (`persistencia`) antes de ir al endpoint.
+    """
+    return consultar_con_origen(query, endpoint, etiqueta, columnar, tipos, refrescar)[0]
+
+
+def consultar_con_origen(query, endpoint, etiqueta=None, columnar=False, tipos=None, refrescar=False):
+    """Como `consultar`, pero devuelve (resultado, origen); el origen es el de las métricas ("cache", "caducado"...)"""
+    inicio = time.perf_counter()
+    clave = cache.clave(query, endpoint, columnar)
+    resultado = None if refrescar else cache.obtener(clave)
+    if resultado is not None:
+        metricas.observar(etiqueta, endpoint, time.perf_counter() - inicio, "cache", num_filas=filas(resultado))
+        return resultado, "cache"
+    # Solo se rellena si esta llamada lanza la petición; si no, se esperó la de otra sesión
+    traza = {}
+    try:
+        resultado = vuelos.ejecutar(
+            clave, lambda: _consultar_y_guardar(clave, query, endpoint, traza, columnar, tipos, refrescar)
+        )
+    except Exception as e:
+        metricas.observar(etiqueta, endpoint, time.perf_counter() - inicio, "error", error=e)
+        raise
+    origen = traza.get("origen", "coalescida")
+    metricas.observar(etiqueta, endpoint, time.perf_counter() - inicio, origen, traza.get("bytes", 0), filas(resultado))
+    return resultado, origen
+
+
+def consultar_guardado(query, endpoint, etiqueta=None, columnar=False, tipos=None):
+    """(resultado, origen) si la consulta tiene un resultado vigente en memoria o en el almacén, o None.
+
+    Nunca consulta la red ni espera a otras peticiones: sirve para contestar en el
+    acto lo que ya se tiene y lanzar solo lo que falta.
+    """
+    inicio = time.perf_counter()
+    clave = cache.clave(query, endpoint, columnar)
+    resultado, origen = cache.obtener(clave), "cache"
+    if resultado is None:
+        restaurado = _restaurar(query, endpoint, columnar, tipos)
+        if restaurado is None:
+            return None
+        resultado, expira = restaurado
+        origen = "almacen"
+        cache.guardar(clave, resultado, expira - time.time())
+    metricas.observar(etiqueta, endpoint, time.perf_counter() - inicio, origen, num_filas=filas(resultado))
+    return resultado, origen
+
+
+def ultimo_conocido(query, endpoint, columnar=False, tipos=None):
+    """Último resultado guardado de la consulta (en memoria o en el almacén) aunque haya caducado, o None.
+
+    Nunca consulta la red.
+    """
+    resultado = cache.obtener_caducado(cache.clave(query, endpoint, columnar))
+    if resultado is None:
+        restaurado = _restaurar(query, endpoint, columnar, tipos, caducado=True)
+        resultado = restaurado[0] if restaurado is not None else None
+    return resultado
+
+
+def _restaurar(query, endpoint, columnar=False, tipos=None, caducado=False):
+    """(resultado, expira) del almacén compartido, ya en columnas si se piden, o None"""
+    guardado = almacen.obtener(query, endpoint, caducado) if almacen is not None else None
+    if guardado is None or not columnar:
+        return guardado
+    from .columnas import a_columnas
+    return a_columnas(guardado[0], tipos), guardado[1]
+
+
+def _consultar_y_guardar(clave, query, endpoint, traza, columnar=False, tipos=None, refrescar=False):
+    # Antes que a la red, a lo que guardó otra réplica (o este proceso antes de reiniciarse)
+    restaurado = None if refrescar else _restaurar(query, endpoint, columnar, tipos)
+    if restaurado is not None:
+        resultado, expira = restaurado
+        traza["origen"] = "almacen"
+        cache.guardar(clave, resultado, expira - time.time())
+        return resultado
+    try:
+        crudo = ejecutar(query, endpoint)
+        resultado = crudo
+        if columnar:
+            from .columnas import a_columnas
+            resultado = a_columnas(crudo, tipos)
+    except Exception:
+        caducado = ultimo_conocido(query, endpoint, columnar, tipos)
+        if caducado is not None:
+            traza["origen"] = "caducado"
+            return caducado
+        raise
+    if almacen is not None:
+        almacen.guardar(query, endpoint, crudo, cache.ttl(endpoint))
+    traza["origen"] = "red"
+    traza["bytes"] = cache.guardar(clave, resultado)
+    return resultado
@@ -0,0 +1,306 @@
+"""Índice jugador×club de co-membresías (P54) para el juego de los dos clubes."""
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from .cliente import WIKIDATA_ENDPOINT, cache, consultar
+from .columnas import anios, enteros_o_none
+from .etiquetas import resolver
+from .lotes import consultar_lote
+from .nombres import IndiceNombres
+from .plantillas import carreras_en_ambos_clubes, carreras_por_club, tipos_carrera
+
+WD = "http://www.wikidata.org/entity/"
+
+# Clubes por consulta: con miles de clubes la carga se reparte en varios lotes.
+CLUBES_POR_CONSULTA = 20
+# Índices de nombres por par de clubes que se conservan en memoria
+MAX_INDICES_NOMBRES = 256
+
+
+def uri_completa(uri):
+    """Convierte 'wd:Q7156' o 'Q7156' en la URI completa de la entidad"""
+    if uri.startswith("http"):
+        return uri
+    return WD + uri.split(":", 1)[-1]
+
+
+def query_membresias(club_uris):
+    """Devuelve la query con una fila por (jugador, club) de los clubes dados, ya agregada"""
+    return carreras_por_club([uri_completa(uri) for uri in club_uris])
+
+
+def query_alias(club_uris):
+    """Devuelve la query con los alias (skos:altLabel) de los jugadores de los clubes dados"""
+    values_clause = " ".join(f"<{uri_completa(uri)}>" for uri in club_uris)
+    return f"""
+    SELECT DISTINCT ?jugador ?alias WHERE {{
+        VALUES ?club {{ {values_clause} }}
+        ?jugador p:P54 ?stmt .
+        ?stmt ps:P54 ?club .
+        ?jugador wdt:P106 wd:Q937857;
+                 skos:altLabel ?alias .
+        FILTER(LANG(?alias) IN ("es", "en"))
+    }}
+    """
+
+
+def _bitset(ids):
+    """Construye un entero con un bit encendido por cada id"""
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _min(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _sumar(a, b):
+    return b if a is None else a if b is None else a + b
+
+
+class IndiceClubes:
+    """Índice compacto de qué jugadores pasaron por qué clubes.
+
+    Cada jugador recibe un id entero; cada club guarda un bitset (int) y un array
+    con los ids de sus jugadores, de modo que la intersección de dos clubes es
+    un AND de enteros y no hace falta consultar la red.
+    """
+
+    def __init__(self, club_uris):
+        self.clubes = [uri_completa(uri) for uri in club_uris]
+        self._idx_club = {uri: i for i, uri in enumerate(self.clubes)}
+        self.nombres = []   # id jugador -> etiqueta
+        self.imagenes = []  # id jugador -> URL de imagen o None
+        self.clubes_de_jugador = []  # id jugador -> array con los índices de sus clubes
+        self.alias = {}  # id jugador -> lista de alias
+        self._id_jugador = {}
+        self.miembros = [0] * len(self.clubes)
+        self.plantillas = [array("I") for _ in self.clubes]
+        self.carreras = {}  # (id jugador, idx club) -> [inicio, fin, partidos, goles]
+        self._socios = {}
+        self._indices_nombres = OrderedDict()
+        self._lock_nombres = threading.Lock()
+
+    def agregar(self, filas, nombres):
+        """Incorpora las filas (columnares, ver `a_columnas`) de una respuesta de query_membresias.
+
+        `nombres` es {uri: etiqueta} de sus jugadores (ver `etiquetas.resolver`).
+        """
+        filas = filas.assign(club=filas["club"].astype(object).map(self._idx_club)).dropna(subset=["club"])
+        if filas.empty:
+            return
+
+        for uri in filas["jugador"].astype(object).unique():
+            if uri not in self._id_jugador:
+                self._id_jugador[uri] = len(self.nombres)
+                self.nombres.append(nombres[uri])
+                self.imagenes.append(None)
+                self.clubes_de_jugador.append(array("I"))
+        filas = filas.assign(jugador=filas["jugador"].astype(object).map(self._id_jugador))
+        con_imagen = filas.dropna(subset=["imagen"]).drop_duplicates("jugador")
+        for jugador, imagen in con_imagen[["jugador", "imagen"]].itertuples(index=False):
+            if self.imagenes[jugador] is None:
+                self.imagenes[jugador] = imagen
+
+        # La consulta ya trae una fila por (jugador, club) con sus etapas agregadas;
+        # solo queda fusionar si el mismo club llega en más de un lote
+        columnas = [
+            enteros_o_none(anios(filas["inicio"])),
+            enteros_o_none(anios(filas["fin"])),
+            enteros_o_none(filas["partidos"].where(filas["con_partidos"] > 0)),
+            enteros_o_none(filas["goles"].where(filas["con_goles"] > 0)),
+        ]
+        claves = zip(enteros_o_none(filas["jugador"]), enteros_o_none(filas["club"]))
+        modificados = set()
+        for (jugador, club), *nueva in zip(claves, *columnas):
+            carrera = self.carreras.get((jugador, club))
+            if carrera is None:
+                self.carreras[(jugador, club)] = nueva
+                self.plantillas[club].append(jugador)
+                self.clubes_de_jugador[jugador].append(club)
+                modificados.add(club)
+            else:
+                carrera[:] = [
+                    _min(carrera[0], nueva[0]), _max(carrera[1], nueva[1]),
+                    _sumar(carrera[2], nueva[2]), _sumar(carrera[3], nueva[3]),
+                ]
+        for club in modificados:
+            self.miembros[club] = _bitset(self.plantillas[club])
+        self._socios.clear()
+        self._indices_nombres.clear()
+
+    def agregar_alias(self, filas):
+        """Incorpora las filas (columnares) de una respuesta de query_alias"""
+        for uri, alias in filas[["jugador", "alias"]].itertuples(index=False):
+            jugador = self._id_jugador.get(uri)
+            if jugador is not None:
+                self.alias.setdefault(jugador, []).append(alias)
+        self._indices_nombres.clear()
+
+    def comunes(self, club_a, club_b):
+        """Ids de los jugadores que pasaron por ambos clubes"""
+        a = self._idx_club[uri_completa(club_a)]
+        b = self._idx_club[uri_completa(club_b)]
+        if a == b:
+            return []
+        interseccion = self.miembros[a] & self.miembros[b]
+        ids = []
+        while interseccion:
+            bit = interseccion & -interseccion
+            ids.append(bit.bit_length() - 1)
+            interseccion ^= bit
+        return ids
+
+    def socios(self, club):
+        """Índices de los clubes con al menos un jugador en común con `club`"""
+        socios = self._socios.get(club)
+        if socios is None:
+            socios = set()
+            for jugador in self.plantillas[club]:
+                socios.update(self.clubes_de_jugador[jugador])
+            socios.discard(club)
+            self._socios[club] = socios
+        return socios
+
+    def sortear_par(self, rng=random):
+        """Devuelve dos URIs de club con jugadores en común, o None si no existe ningún par"""
+        candidatos = [i for i, plantilla in enumerate(self.plantillas) if plantilla]
+        rng.shuffle(candidatos)
+        for a in candidatos:
+            socios = self.socios(a)
+            if socios:
+                b = rng.choice(sorted(socios))
+                return self.clubes[a], self.clubes[b]
+        return None
+
+    def jugadores_en_comun(self, club_a, club_b):
+        """Detalle por jugador en el formato que usa la app: {nombre: {imagen, equipo1, equipo2}}"""
+        a = self._idx_club[uri_completa(club_a)]
+        b = self._idx_club[uri_completa(club_b)]
+        detalle = {}
+        for jugador in self.comunes(club_a, club_b):
+            equipos = []
+            for club in (a, b):
+                inicio, fin, partidos, goles = self.carreras[(jugador, club)]
+                equipos.append({"start": inicio, "end": fin, "matches": partidos, "goals": goles})
+            detalle[self.nombres[jugador]] = {
+                "imagen": self.imagenes[jugador],
+                "equipo1": equipos[0],
+                "equipo2": equipos[1],
+            }
+        return detalle
+
+    def indice_nombres(self, club_a, club_b):
+        """Índice de nombres de las plantillas de ambos clubes, construido una vez por par.
+
+        Incluye también a quienes jugaron en un solo club, para que el autocompletado
+        no revele las respuestas.
+        """
+        a = self._idx_club[uri_completa(club_a)]
+        b = self._idx_club[uri_completa(club_b)]
+        clave = (min(a, b), max(a, b))
+        with self._lock_nombres:
+            indice = self._indices_nombres.get(clave)
+            if indice is not None:
+                self._indices_nombres.move_to_end(clave)
+                return indice
+        jugadores = sorted(set(self.plantillas[a]) | set(self.plantillas[b]))
+        indice = IndiceNombres((self.nombres[j], self.alias.get(j, ())) for j in jugadores)
+        with self._lock_nombres:
+            self._indices_nombres[clave] = indice
+            if len(self._indices_nombres) > MAX_INDICES_NOMBRES:
+                self._indices_nombres.popitem(last=False)
+        return indice
+
+
+_indices = {}  # clubes congelados -> (índice, expira)
+_lock = threading.Lock()
+
+
+def cargar_indice_clubes(club_uris, refrescar=False):
+    """Devuelve el índice de co-membresías, cargándolo en lotes solo cuando no existe o ha expirado.
+
+    Con `refrescar` se reconstruye aunque siga vigente (ver `cargar_tabla_campeones`).
+    """
+    clave = tuple(club_uris)
+    entrada = _indices.get(clave)
+    if not refrescar and entrada is not None and entrada[1] > time.monotonic():
+        return entrada[0]
+    with _lock:
+        entrada = _indices.get(clave)
+        if not refrescar and entrada is not None and entrada[1] > time.monotonic():
+            return entrada[0]
+        lotes = [clave[i:i + CLUBES_POR_CONSULTA] for i in range(0, len(clave), CLUBES_POR_CONSULTA)]
+        resultados = consultar_lote(
+            [(query_membresias(lote), WIKIDATA_ENDPOINT, "membresias_clubes") for lote in lotes]
+            + [(query_alias(lote), WIKIDATA_ENDPOINT, "alias_clubes") for lote in lotes],
+            columnar=True,
+            tipos=tipos_carrera(),
+            refrescar=refrescar,
+        )
+        membresias, alias = resultados[:len(lotes)], resultados[len(lotes):]
+        for resultado in membresias:
+            if isinstance(resultado, Exception):
+                raise resultado
+        # Estricto: los nombres son las respuestas del juego y el índice dura todo el TTL
+        nombres = resolver(
+            [uri for resultado in membresias for uri in resultado["jugador"].astype(object).unique()], refrescar,
+            estricto=True,
+        )
+        indice = IndiceClubes(clave)
+        for resultado in membresias:
+            indice.agregar(resultado, nombres)
+        # Los alias solo mejoran la validación: si fallan, el juego sigue funcionando
+        for resultado in alias:
+            if not isinstance(resultado, Exception):
+                indice.agregar_alias(resultado)
+        _indices[clave] = (indice, time.monotonic() + cache.ttl(WIKIDATA_ENDPOINT))
+        return indice
+
+
+def indice_cargado(club_uris):
+    """Índice ya cargado para esos clubes (aunque haya expirado), o None; nunca consulta la red"""
+    entrada = _indices.get(tuple(club_uris))
+    return entrada[0] if entrada is not None else None
+
+
+def cargar_jugadores_en_comun(club_a, club_b):
+    """Jugadores de dos clubes en el formato de `IndiceClubes.jugadores_en_comun`, con una sola consulta.
+
+    Sirve de alternativa cuando no se puede cargar el índice completo.
+    """
+    import pandas as pd
+
+    filas = consultar(
+        carreras_en_ambos_clubes(uri_completa(club_a), uri_completa(club_b)), WIKIDATA_ENDPOINT,
+        "carreras_en_ambos_clubes", columnar=True, tipos=tipos_carrera("1", "2"),
+    )
+    equipos = {}
+    for sufijo in ("1", "2"):
+        equipos[sufijo] = zip(
+            enteros_o_none(anios(filas[f"inicio{sufijo}"])),
+            enteros_o_none(anios(filas[f"fin{sufijo}"])),
+            enteros_o_none(filas[f"partidos{sufijo}"].where(filas[f"con_partidos{sufijo}"] > 0)),
+            enteros_o_none(filas[f"goles{sufijo}"].where(filas[f"con_goles{sufijo}"] > 0)),
+        )
+    jugadores = filas["jugador"].astype(object)
+    nombres = resolver(jugadores.unique(), estricto=True)
+    detalle = {}
+    for jugador, imagen, equipo1, equipo2 in zip(jugadores, filas["imagen"].astype(object), equipos["1"], equipos["2"]):
+        detalle[nombres[jugador]] = {
+            "imagen": None if pd.isna(imagen) else imagen,
+            "equipo1": dict(zip(("start", "end", "matches", "goals"), equipo1)),
+            "equipo2": dict(zip(("start", "end", "matches", "goals"), equipo2)),
+        }
+    return detalle
@@ -0,0 +1,44 @@
+"""Coalescencia de consultas idénticas en curso (single-flight)."""
+import threading
+from concurrent.futures import Future
+
+
+class VueloUnico:
+    """Garantiza una sola ejecución simultánea por clave.
+
+    Si llega una petición con la misma clave mientras otra está en curso, espera
+    su resultado (o su excepción) en lugar de lanzar una nueva.
+    """
+
+    def __init__(self):
+        self._en_curso = {}
+        self._lock = threading.Lock()
+        self.lanzadas = 0
+        self.coalescidas = 0
+
+    def ejecutar(self, clave, funcion):
+        with self._lock:
+            futuro = self._en_curso.get(clave)
+            lider = futuro is None
+            if lider:
+                futuro = self._en_curso[clave] = Future()
+                self.lanzadas += 1
+            else:
+                self.coalescidas += 1
+        if not lider:
+            return futuro.result()
+        try:
+            resultado = funcion()
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+
+    def estadisticas(self):
+        with self._lock:
+            return {"en_curso": len(self._en_curso), "lanzadas": self.lanzadas, "coalescidas": self.coalescidas}
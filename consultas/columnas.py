@@ -0,0 +1,62 @@
+"""Representación columnar (pandas) de los resultados SPARQL JSON.
+
+pandas se importa dentro de cada función, solo cuando se pide un resultado columnar.
+"""
+XSD = "http://www.w3.org/2001/XMLSchema#"
+TIPOS_FECHA = {XSD + "dateTime", XSD + "date"}
+TIPOS_NUMERO = {
+    XSD + "integer", XSD + "int", XSD + "long", XSD + "short", XSD + "nonNegativeInteger",
+    XSD + "positiveInteger", XSD + "decimal", XSD + "double", XSD + "float",
+}
+
+
+def _tipo(bindings, variable):
+    """Datatype del primer valor presente de la variable (las columnas SPARQL suelen ser homogéneas)"""
+    for fila in bindings:
+        celda = fila.get(variable)
+        if celda is not None:
+            return celda.get("datatype")
+    return None
+
+
+def a_columnas(resultado, tipos=None):
+    """Convierte un resultado SPARQL JSON en un DataFrame con una columna por variable.
+
+    Fechas y números se convierten de una vez (vectorizado) a datetime64/float64, con
+    NaT/NaN donde falta el valor; URIs y literales se guardan como `category`, de modo
+    que cada cadena repetida (clubes, jugadores con varias filas) se almacena una sola vez.
+    El tipo se deduce del datatype de los valores; `tipos` ({variable: "fecha" | "numero" | "texto"})
+    lo fija para las variables que pueden llegar vacías.
+    """
+    import pandas as pd
+
+    tipos = tipos or {}
+    variables = resultado["head"]["vars"]
+    bindings = resultado["results"]["bindings"]
+    columnas = {}
+    for variable in variables:
+        valores = [fila[variable]["value"] if variable in fila else None for fila in bindings]
+        tipo = tipos.get(variable) or _tipo(bindings, variable)
+        if tipo == "fecha" or tipo in TIPOS_FECHA:
+            columnas[variable] = pd.to_datetime(pd.Series(valores, dtype=object), utc=True, errors="coerce", format="ISO8601")
+        elif tipo == "numero" or tipo in TIPOS_NUMERO:
+            columnas[variable] = pd.to_numeric(pd.Series(valores, dtype=object), errors="coerce")
+        else:
+            columnas[variable] = pd.Series(valores, dtype="category")
+    return pd.DataFrame(columnas, columns=variables)
+
+
+def anios(serie):
+    """Año de cada valor de una columna de fechas (o de cadenas 'AAAA-...'), como float con NaN"""
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.dt.year.astype("float64")
+    return pd.to_numeric(serie.astype("string").str[:4], errors="coerce")
+
+
+def enteros_o_none(valores):
+    """Array de objetos con int de Python o None, convertido de una vez"""
+    import pandas as pd
+
+    return pd.array(valores, dtype="Int64").to_numpy(dtype=object, na_value=None)
@@ -0,0 +1,92 @@
+"""Entidades de Wikidata y DBpedia que usa la aplicación."""
+from .cliente import DBPEDIA_ENDPOINT, DBPEDIA_ES_ENDPOINT
+
+# Competiciones cuyas ediciones se sincronizan en el catálogo (consultas.catalogo)
+COPA_MUNDIAL = "Q19317"
+COMPETICIONES = {
+    COPA_MUNDIAL: "Copa Mundial de la FIFA",
+}
+
+# Mundiales y sus QIDs de Wikidata (se usan mientras no haya catálogo)
+MUNDIALES = {
+    "1982": "Q46934",
+    "1986": "Q46938",
+    "1990": "Q132529",
+    "1994": "Q101751",
+    "1998": "Q101730",
+    "2002": "Q47735",
+    "2006": "Q37285",
+    "2010": "Q176883",
+    "2014": "Q79859",
+    "2018": "Q170645"
+}
+
+# Equipos con sus URIs de Wikidata y logos
+EQUIPOS = {
+    "FC Barcelona": {
+        "uri": "wd:Q7156",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/Barcelona-Logo.png"
+    },
+    "AC Milan": {
+        "uri": "wd:Q1543",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/11/Milan-Logo.png"
+    },
+    "Real Madrid": {
+        "uri": "wd:Q8682",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/Real-Madrid-Logo.png"
+    },
+    "Inter Milan": {
+        "uri": "wd:Q631",
+        "logo": "https://logos-world.net/wp-content/uploads/2021/04/FC-Internazionale-Milano-Logo.png"
+    },
+    "Manchester United": {
+        "uri": "wd:Q18656",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/Manchester-United-logo.png"
+    },
+    "Juventus FC": {
+        "uri": "wd:Q1422",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/Juventus-Logo.png"
+    },
+    "Bayern Munich": {
+        "uri": "wd:Q15789",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/FC-Bayern-Munchen-Logo.png"
+    },
+    "Arsenal FC": {
+        "uri": "wd:Q9617",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/05/Arsenal-Logo.png"
+    },
+    "Chelsea FC": {
+        "uri": "wd:Q9616",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/05/Chelsea-Logo.png"
+    },
+    "Atletico de Madrid": {
+        "uri": "wd:Q8701",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/06/atletico-madrid-Logo.png"
+    },
+    "Borussia Dortmund": {
+        "uri": "wd:Q41420",
+        "logo": "https://logos-world.net/wp-content/uploads/2020/11/Borussia-Dortmund-Logo.png"
+    }
+}
+
+# Entidades de Wikidata consultadas por las historias
+ENTIDADES_HISTORIAS = [
+    "Q622495",   # La Mano de Dios
+    "Q1363790",  # El Gol del Siglo
+    "Q48892",    # Didier Drogba
+    "Q4610331",  # Partido en Bouaké
+    "Q856670",   # Estadio Nacional de Chile
+    "Q1987588",  # Repechaje Chile-URSS 1973
+]
+
+# Recursos de DBpedia cuyo abstract usan las historias, por endpoint
+RECURSOS_DBPEDIA = {
+    DBPEDIA_ENDPOINT: [
+        "http://dbpedia.org/resource/Falklands_War",
+        "http://dbpedia.org/resource/First_Ivorian_Civil_War",
+        "http://dbpedia.org/resource/1973_Chilean_coup_d'état",
+    ],
+    DBPEDIA_ES_ENDPOINT: [
+        "http://es.dbpedia.org/resource/Argentina_vs._Inglaterra_(1986)",
+    ],
+}
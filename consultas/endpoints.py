@@ -0,0 +1,22 @@
+"""URLs de los endpoints SPARQL (sobrescribibles por entorno, p. ej. para el servidor de benchmarks)."""
+import os
+
+# "remoto" consulta los endpoints públicos; "local" usa el grafo rdflib de consultas.local.
+# Forma parte de las claves del almacén y de la ruta del catálogo: sus datos no se mezclan.
+BACKEND = os.environ.get("FUTBOL_SPARQL_BACKEND", "remoto")
+WIKIDATA_ENDPOINT = os.environ.get("FUTBOL_WIKIDATA_ENDPOINT", "https://query.wikidata.org/sparql")
+DBPEDIA_ENDPOINT = os.environ.get("FUTBOL_DBPEDIA_ENDPOINT", "https://dbpedia.org/sparql")
+DBPEDIA_ES_ENDPOINT = os.environ.get("FUTBOL_DBPEDIA_ES_ENDPOINT", "https://es.dbpedia.org/sparql")
+
+
+def _espejos(variable):
+    return [url.strip() for url in os.environ.get(variable, "").split(",") if url.strip()]
+
+
+# Espejos equivalentes de cada endpoint (URLs separadas por comas); con alguno, las
+# consultas lanzan una petición de respaldo si el principal tarda (ver consultas.respaldo)
+ESPEJOS = {
+    WIKIDATA_ENDPOINT: _espejos("FUTBOL_WIKIDATA_ESPEJOS"),
+    DBPEDIA_ENDPOINT: _espejos("FUTBOL_DBPEDIA_ESPEJOS"),
+    DBPEDIA_ES_ENDPOINT: _espejos("FUTBOL_DBPEDIA_ES_ESPEJOS"),
+}
@@ -0,0 +1,153 @@
+"""Caché compartida de etiquetas de entidades, separada de `SERVICE wikibase:label`.
+
+Las consultas devuelven URIs sin etiquetar (el servicio de etiquetas es de lo más
+caro de una consulta en WDQS) y las etiquetas se rellenan desde esta caché de
+proceso, común al quiz, los clubes y el catálogo. Las que faltan se piden en
+lotes, con una consulta VALUES sobre rdfs:label por lote: en español, si no en
+inglés y, sin ninguna de las dos, el QID (igual que el servicio).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .cliente import WIKIDATA_ENDPOINT, cache
+from .lotes import consultar_lote
+
+IDIOMAS = ("es", "en")
+# Entidades por consulta; las consultas largas van por POST (ver cliente.MAX_LONGITUD_GET)
+ETIQUETAS_POR_CONSULTA = 2000
+MAX_ETIQUETAS = 200_000
+# Las etiquetas cambian aún menos que los datos: duran varias veces su TTL
+FACTOR_TTL = 4
+
+
+def query_etiquetas(uris):
+    """Devuelve la query con la etiqueta de cada entidad en cada idioma de IDIOMAS"""
+    values_clause = " ".join(f"<{uri}>" for uri in uris)
+    opcionales = "".join(
+        f'\n        OPTIONAL {{ ?item rdfs:label ?{idioma} . FILTER(LANG(?{idioma}) = "{idioma}") }}'
+        for idioma in IDIOMAS
+    )
+    return f"""
+    SELECT ?item {" ".join(f"?{idioma}" for idioma in IDIOMAS)} WHERE {{
+        VALUES ?item {{ {values_clause} }}{opcionales}
+    }}
+    """
+
+
+def _qid(uri):
+    return uri.rsplit("/", 1)[-1]
+
+
+class CacheEtiquetas:
+    """Etiquetas por URI con TTL y desalojo LRU por número de entradas"""
+
+    def __init__(self, max_etiquetas=MAX_ETIQUETAS):
+        self.max_etiquetas = max_etiquetas
+        self._entradas = OrderedDict()  # uri -> (etiqueta, expira)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.consultas = 0
+        self.errores = 0  # lotes que fallaron
+
+    def _ttl(self):
+        return cache.ttl(WIKIDATA_ENDPOINT) * FACTOR_TTL
+
+    def resolver(self, uris, refrescar=False, estricto=False):
+        """{uri: etiqueta} de las URIs dadas, consultando en lotes solo las que no están en caché.
+
+        Si falla un lote, sus URIs se etiquetan con el QID (como las que no tienen
+        etiqueta) sin guardarlas, para volver a pedirlas la próxima vez: un problema con
+        las etiquetas nunca hace perder los datos ya obtenidos. Con `estricto` se
+        propaga en cambio el error del lote, tras guardar las etiquetas ya resueltas.
+        """
+        etiquetas = {}
+        faltan = []
+        ahora = time.monotonic()
+        with self._lock:
+            for uri in dict.fromkeys(uris):
+                entrada = None if refrescar else self._entradas.get(uri)
+                if entrada is not None and entrada[1] > ahora:
+                    self._entradas.move_to_end(uri)
+                    etiquetas[uri] = entrada[0]
+                else:
+                    faltan.append(uri)
+            self.aciertos += len(etiquetas)
+            self.fallos += len(faltan)
+        if not faltan:
+            return etiquetas
+
+        lotes = [faltan[i:i + ETIQUETAS_POR_CONSULTA] for i in range(0, len(faltan), ETIQUETAS_POR_CONSULTA)]
+        resultados = consultar_lote([(query_etiquetas(lote), WIKIDATA_ENDPOINT, "etiquetas") for lote in lotes])
+        nuevas = {}
+        fallidos = []
+        for lote, resultado in zip(lotes, resultados):
+            if isinstance(resultado, Exception):
+                fallidos.append(resultado)
+                etiquetas.update({uri: _qid(uri) for uri in lote})
+                continue
+            encontradas = {}
+            for fila in resultado["results"]["bindings"]:
+                uri = fila["item"]["value"]
+                for idioma in IDIOMAS:
+                    if idioma in fila and uri not in encontradas:
+                        encontradas[uri] = fila[idioma]["value"]
+            nuevas.update({uri: encontradas.get(uri) or _qid(uri) for uri in lote})
+        expira = time.monotonic() + self._ttl()
+        with self._lock:
+            self.consultas += len(lotes)
+            self.errores += len(fallidos)
+            for uri, etiqueta in nuevas.items():
+                self._entradas[uri] = (etiqueta, expira)
+                self._entradas.move_to_end(uri)
+            while len(self._entradas) > self.max_etiquetas:
+                self._entradas.popitem(last=False)
+        if fallidos and estricto:
+            raise fallidos[0]
+        etiquetas.update(nuevas)
+        return etiquetas
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "consultas": self.consultas,
+                "errores": self.errores,
+            }
+
+
+etiquetas = CacheEtiquetas()
+
+
+def resolver(uris, refrescar=False, estricto=False):
+    """{uri: etiqueta} desde la caché compartida (ver `CacheEtiquetas.resolver`)"""
+    return etiquetas.resolver(uris, refrescar, estricto)
+
+
+def etiquetar(resultado, *variables, refrescar=False, estricto=False):
+    """Copia de un resultado SPARQL JSON con `?<variable>Label` en cada fila, como el servicio de Wikidata.
+
+    El resultado original puede estar en la caché compartida, así que no se modifica.
+    Las etiquetas que no se pudieron obtener quedan como el QID (con `estricto`, se
+    propaga el error).
+    """
+    filas = resultado["results"]["bindings"]
+    nombres = resolver(
+        [fila[variable]["value"] for fila in filas for variable in variables if variable in fila], refrescar, estricto
+    )
+    etiquetadas = []
+    for fila in filas:
+        fila = dict(fila)
+        for variable in variables:
+            if variable in fila:
+                fila[variable + "Label"] = {"type": "literal", "value": nombres[fila[variable]["value"]]}
+        etiquetadas.append(fila)
+    cabecera = dict(resultado["head"], vars=resultado["head"]["vars"] + [variable + "Label" for variable in variables])
+    return {"head": cabecera, "results": {"bindings": etiquetadas}}
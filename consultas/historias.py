@@ -0,0 +1,95 @@
+"""Consultas SPARQL de las historias del storytelling.
+
+Se definen aquí y no en la app para que la precarga en segundo plano pueda
+mantenerlas en caché con exactamente el mismo texto que consulta la app.
+"""
+from .cliente import DBPEDIA_ENDPOINT, DBPEDIA_ES_ENDPOINT, WIKIDATA_ENDPOINT
+
+# --- Argentina vs. Inglaterra (1986) ---
+# Contexto Guerra
+FALKLANDS_QUERY = """
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    PREFIX dbr: <http://dbpedia.org/resource/>
+    SELECT ?abstract WHERE {
+        dbr:Falklands_War dbo:abstract ?abstract . FILTER(LANG(?abstract) = "es")
+    } LIMIT 1
+    """
+
+# Contexto Partido
+MATCH_ABSTRACT_QUERY = """
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    SELECT ?abstract WHERE {
+      <http://es.dbpedia.org/resource/Argentina_vs._Inglaterra_(1986)> dbo:abstract ?abstract . FILTER(LANG(?abstract) = "es")
+    } LIMIT 1
+    """
+
+# Datos de los goles (Wikidata)
+STORY_QUERY_1986 = """
+    SELECT ?item ?itemDescription ?image WHERE {
+      VALUES ?item { wd:Q622495 wd:Q1363790 } # Hand of God, Goal of the Century
+      OPTIONAL { ?item schema:description ?itemDescription . FILTER(LANG(?itemDescription) = "es") }
+      OPTIONAL { ?item wdt:P18 ?image. }
+    }
+    """
+
+# --- Drogba y Costa de Marfil ---
+# Contexto Guerra Civil
+CIVIL_WAR_QUERY = """
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    PREFIX dbr: <http://dbpedia.org/resource/>
+    SELECT ?abstract WHERE {
+        dbr:First_Ivorian_Civil_War dbo:abstract ?abstract . FILTER(LANG(?abstract) = "es")
+    } LIMIT 1
+    """
+
+# Datos de Drogba y el partido simbólico en Bouaké
+DROGBA_STORY_QUERY = """
+    SELECT ?item ?image ?date WHERE {
+      VALUES ?item { wd:Q48892 wd:Q4610331 } # Drogba, Partido en Bouaké
+      OPTIONAL { ?item wdt:P18 ?image. }
+      OPTIONAL { ?item wdt:P585 ?date. }
+    }
+    """
+
+# --- Chile y el 'Partido Fantasma' ---
+# Contexto Golpe de Estado
+COUP_QUERY = """
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    PREFIX dbr: <http://dbpedia.org/resource/>
+    SELECT ?abstract WHERE {
+        <dbr:1973_Chilean_coup_d'état> dbo:abstract ?abstract .
+        FILTER(LANG(?abstract) = "es")
+    } LIMIT 1
+    """
+
+# Datos del Estadio y del Partido
+CHILE_STORY_QUERY = """
+    SELECT ?item ?image ?date WHERE {
+      VALUES ?item { wd:Q856670 wd:Q1987588 } # Estadio Nacional, Play-off match
+      OPTIONAL { ?item wdt:P18 ?image. }
+      OPTIONAL { ?item wdt:P585 ?date. }
+    }
+    """
+
+
+# Consultas de cada historia, en el orden en que las usa la app: (query, endpoint, etiqueta)
+CONSULTAS_HISTORIAS = {
+    "1986": [
+        (FALKLANDS_QUERY, DBPEDIA_ENDPOINT, "falklands_query"),
+        (MATCH_ABSTRACT_QUERY, DBPEDIA_ES_ENDPOINT, "match_abstract_query"),
+        (STORY_QUERY_1986, WIKIDATA_ENDPOINT, "story_query_1986"),
+    ],
+    "drogba": [
+        (CIVIL_WAR_QUERY, DBPEDIA_ENDPOINT, "civil_war_query"),
+        (DROGBA_STORY_QUERY, WIKIDATA_ENDPOINT, "drogba_story_query"),
+    ],
+    "chile": [
+        (COUP_QUERY, DBPEDIA_ENDPOINT, "coup_query"),
+        (CHILE_STORY_QUERY, WIKIDATA_ENDPOINT, "chile_story_query"),
+    ],
+}
+
+
+def todas_las_consultas():
+    """Consultas de todas las historias, para cargarlas de una vez"""
+    return [consulta for consultas in CONSULTAS_HISTORIAS.values() for consulta in consultas]
@@ -0,0 +1,210 @@
+"""Miniaturas de fotos y logos: se descargan una vez, se reducen a WebP y se guardan en disco.
+
+La app pasa los bytes de las miniaturas a `st.image`, así el navegador recibe unos
+pocos KB por imagen en lugar del original de Wikimedia Commons. Streamlit las sirve
+con una URL que depende del contenido: el navegador las reutiliza entre reejecuciones
+en lugar de recibirlas incrustadas en cada una. Con un plazo (`consultas.Plazo`)
+las que no se generan a tiempo siguen en segundo plano y, mientras, se muestra la URL.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from urllib.parse import quote, unquote, urlparse
+from urllib.request import Request, urlopen
+
+DIRECTORIO = os.environ.get("FUTBOL_CACHE_IMAGENES", os.path.join(".cache", "miniaturas"))
+MAX_BYTES = int(os.environ.get("FUTBOL_CACHE_IMAGENES_MAX_BYTES", 100 * 1024 * 1024))
+USER_AGENT = "FutbolConectadoApp/1.0 (mailto:daniel@example.com)"
+TIMEOUT = 10
+CALIDAD_WEBP = 80
+# Las miniaturas se generan al doble del ancho mostrado para pantallas de alta densidad
+ESCALA = 2
+# Una imagen que no se pudo descargar no se reintenta hasta pasado este tiempo
+SEGUNDOS_FALLO = 600
+MAX_HILOS = 8
+
+_COMMONS_FILEPATH = "/wiki/Special:FilePath/"
+
+_pool = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix="miniaturas")
+_fallos = {}  # (url, ancho) -> instante hasta el que no se reintenta
+_en_curso = {}  # (url, ancho) -> futuro de la miniatura que se está generando
+_lock = threading.Lock()
+_bytes_en_disco = None
+
+
+def url_origen(url, ancho):
+    """URL a descargar: para Commons se pide ya reducida (`?width=`) en lugar del original"""
+    partes = urlparse(url)
+    if partes.netloc.endswith("wikimedia.org") and partes.path.startswith(_COMMONS_FILEPATH):
+        archivo = quote(unquote(partes.path[len(_COMMONS_FILEPATH):]))
+        return f"https://commons.wikimedia.org{_COMMONS_FILEPATH}{archivo}?width={ancho}"
+    return url
+
+
+def _ruta(url, ancho):
+    nombre = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(DIRECTORIO, f"{nombre}-{ancho}.webp")
+
+
+def _descargar(url):
+    peticion = Request(url, headers={"User-Agent": USER_AGENT})
+    with urlopen(peticion, timeout=TIMEOUT) as respuesta:
+        return respuesta.read()
+
+
+def _reducir(original, ancho):
+    """Reescala la imagen a `ancho` píxeles (sin ampliar) y la codifica en WebP"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(original)) as imagen:
+        imagen.thumbnail((ancho, ancho * 4))
+        if imagen.mode not in ("RGB", "RGBA"):
+            imagen = imagen.convert("RGBA")
+        salida = io.BytesIO()
+        imagen.save(salida, format="WEBP", quality=CALIDAD_WEBP, method=4)
+        return salida.getvalue()
+
+
+def _ocupado():
+    """Bytes en disco de la caché (se mide una vez y luego se lleva la cuenta)"""
+    global _bytes_en_disco
+    if _bytes_en_disco is None:
+        try:
+            _bytes_en_disco = sum(entrada.stat().st_size for entrada in os.scandir(DIRECTORIO))
+        except FileNotFoundError:
+            _bytes_en_disco = 0
+    return _bytes_en_disco
+
+
+def _guardar(ruta, datos):
+    global _bytes_en_disco
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    temporal = f"{ruta}.{threading.get_ident()}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(datos)
+    with _lock:
+        _ocupado()  # la primera medida, antes de reemplazar, para no contar dos veces el fichero
+    try:
+        reemplazado = os.path.getsize(ruta)  # al regenerar una miniatura se sustituye la anterior
+    except FileNotFoundError:
+        reemplazado = 0
+    os.replace(temporal, ruta)
+    with _lock:
+        _bytes_en_disco = _ocupado() + len(datos) - reemplazado
+        if _bytes_en_disco > MAX_BYTES:
+            _desalojar()
+
+
+def _desalojar():
+    """Borra las miniaturas usadas hace más tiempo hasta quedar en el 90 % del presupuesto"""
+    global _bytes_en_disco
+    entradas = sorted(
+        (entrada for entrada in os.scandir(DIRECTORIO) if entrada.name.endswith(".webp")),
+        key=lambda entrada: entrada.stat().st_mtime,
+    )
+    for entrada in entradas:
+        if _bytes_en_disco <= MAX_BYTES * 0.9:
+            break
+        try:
+            tamano = entrada.stat().st_size
+            os.remove(entrada.path)
+            _bytes_en_disco -= tamano
+        except FileNotFoundError:
+            pass
+
+
+def _generar(url, ancho, ruta):
+    datos = _reducir(_descargar(url_origen(url, ancho)), ancho)
+    _guardar(ruta, datos)
+    return datos
+
+
+def _en_disco(ruta):
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read()
+    except FileNotFoundError:
+        return None
+    os.utime(ruta)  # marca de uso para el desalojo
+    return datos
+
+
+def _generar_o_fallar(url, ancho, ruta):
+    try:
+        return _generar(url, ancho, ruta)
+    except Exception:
+        ahora = time.monotonic()
+        with _lock:
+            # Se aprovecha para olvidar los fallos ya vencidos de URLs que no se han vuelto a pedir
+            for clave in [clave for clave, hasta in _fallos.items() if hasta <= ahora]:
+                del _fallos[clave]
+            _fallos[(url, ancho)] = ahora + SEGUNDOS_FALLO
+        return None
+    finally:
+        with _lock:
+            _en_curso.pop((url, ancho), None)
+
+
+def _fallo_reciente(clave):
+    """Si la miniatura falló hace menos de SEGUNDOS_FALLO; un fallo ya vencido se olvida"""
+    with _lock:
+        hasta = _fallos.get(clave)
+        if hasta is not None and hasta <= time.monotonic():
+            del _fallos[clave]
+            hasta = None
+    return hasta is not None
+
+
+def _pedir(url, ancho):
+    """Futuro con los bytes de la miniatura: ya resuelto si está en disco, no hay URL o falló hace poco.
+
+    Una miniatura que ya se está generando (para esta u otra sesión) no se vuelve a pedir.
+    """
+    ancho = ancho * ESCALA
+    clave = (url, ancho)
+    datos = _en_disco(_ruta(url, ancho)) if url else None
+    if datos is None and url and not _fallo_reciente(clave):
+        with _lock:
+            if clave not in _en_curso:
+                _en_curso[clave] = _pool.submit(_generar_o_fallar, url, ancho, _ruta(url, ancho))
+            return _en_curso[clave]
+    futuro = Future()
+    futuro.set_result(datos)
+    return futuro
+
+
+def miniaturas(urls, ancho, plazo=None, esperar=True):
+    """Bytes WebP de las miniaturas de `urls`, generando en paralelo las que no están en disco.
+
+    En cada posición queda None si no se puede obtener o, con `plazo`, si no estuvo
+    a tiempo; en ese caso se sigue generando en segundo plano para la próxima vez.
+    Sin `esperar` solo se devuelven las que ya están en disco y se encargan las demás.
+    """
+    futuros = [_pedir(url, ancho) for url in urls]
+    if esperar:
+        wait(futuros, timeout=plazo.espera() if plazo is not None else None)
+    return [futuro.result() if futuro.done() else None for futuro in futuros]
+
+
+def miniatura(url, ancho, plazo=None, esperar=True):
+    """Bytes WebP de la miniatura de `url` a `ancho` píxeles mostrados, o None (ver `miniaturas`)"""
+    return miniaturas([url], ancho, plazo, esperar)[0]
+
+
+def _imagen(url, ancho, datos):
+    if datos is None:
+        return url_origen(url, ancho * ESCALA) if url else url
+    return datos
+
+
+def imagen_miniatura(url, ancho, plazo=None):
+    """Imagen para `st.image`: los bytes de la miniatura o, si falla o no llega a tiempo, una URL reducida"""
+    return _imagen(url, ancho, miniatura(url, ancho, plazo))
+
+
+def imagenes_miniaturas(urls, ancho, plazo=None):
+    """`imagen_miniatura` de varias URLs, descargando en paralelo las que no están en disco"""
+    return [_imagen(url, ancho, datos) for url, datos in zip(urls, miniaturas(urls, ancho, plazo))]
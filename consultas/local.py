@@ -0,0 +1,162 @@
+"""Backend local: ejecuta las mismas consultas SPARQL sobre un grafo rdflib en memoria.
+
+El grafo se carga desde volcados N-Triples/Turtle (ver `consultas.volcado`) y se
+emulan los prefijos de Wikidata y el servicio `SERVICE wikibase:label`.
+"""
+import glob
+import json
+import os
+import re
+import threading
+
+PREFIJOS = {
+    "wd": "http://www.wikidata.org/entity/",
+    "wdt": "http://www.wikidata.org/prop/direct/",
+    "p": "http://www.wikidata.org/prop/",
+    "ps": "http://www.wikidata.org/prop/statement/",
+    "pq": "http://www.wikidata.org/prop/qualifier/",
+    "wikibase": "http://wikiba.se/ontology#",
+    "bd": "http://www.bigdata.com/rdf#",
+    "schema": "http://schema.org/",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "dbo": "http://dbpedia.org/ontology/",
+    "dbr": "http://dbpedia.org/resource/",
+}
+
+_SERVICIO_ETIQUETAS = re.compile(
+    r'SERVICE\s+wikibase:label\s*\{\s*bd:serviceParam\s+wikibase:language\s+"([^"]*)"\s*\.?\s*\}',
+    re.IGNORECASE,
+)
+_VARIABLE_ETIQUETA = re.compile(r"\?(\w+?)(Label|Description)\b")
+_OPCIONAL = re.compile(r"OPTIONAL\s*\{([^{}]*)\}", re.IGNORECASE)
+_VALUES = re.compile(r"VALUES\s+\?(\w+)\s*\{([^{}]*)\}", re.IGNORECASE)
+# Términos de un VALUES que se expanden a una sola cadena de UNION (ver `_union`)
+MAX_UNION_PLANA = 50
+_TERMINO = re.compile(r'<[^>]*>|"(?:[^"\\]|\\.)*"\S*|[^\s#]+')
+
+_grafo = None
+_lock = threading.Lock()
+# El parser SPARQL de rdflib (pyparsing) no es seguro entre hilos
+_lock_consulta = threading.Lock()
+
+
+def rutas_volcado():
+    """Archivos de volcado configurados en FUTBOL_DATOS_LOCALES (rutas o globs separados por os.pathsep)"""
+    patrones = os.environ.get("FUTBOL_DATOS_LOCALES", "datos/*.nt" + os.pathsep + "datos/*.ttl")
+    rutas = []
+    for patron in patrones.split(os.pathsep):
+        rutas.extend(sorted(glob.glob(patron)))
+    return rutas
+
+
+def _formato(ruta):
+    return "nt" if ruta.endswith(".nt") else "turtle"
+
+
+def cargar_grafo(rutas=None):
+    """Devuelve el grafo local, cargándolo de los volcados la primera vez"""
+    global _grafo
+    if _grafo is not None and rutas is None:
+        return _grafo
+    from rdflib import Graph
+
+    with _lock:
+        if _grafo is not None and rutas is None:
+            return _grafo
+        grafo = Graph()
+        for ruta in rutas if rutas is not None else rutas_volcado():
+            grafo.parse(ruta, format=_formato(ruta))
+        _grafo = grafo
+        return grafo
+
+
+def _opcional_con(cuerpo, base):
+    """Bloque OPTIONAL simple que contiene todas las apariciones de ?base en el cuerpo, o None"""
+    apariciones = len(re.findall(rf"\?{base}\b", cuerpo))
+    for m in _OPCIONAL.finditer(cuerpo):
+        if len(re.findall(rf"\?{base}\b", m.group(1))) == apariciones:
+            return m
+    return None
+
+
+def _emular_etiquetas(query, idiomas, inicio):
+    """Sustituye el SERVICE wikibase:label por OPTIONALs sobre rdfs:label/schema:description.
+
+    Devuelve los patrones que van en lugar del SERVICE y {posición: patrones} que
+    se insertan dentro de un OPTIONAL: si la variable solo se enlaza en él, un
+    OPTIONAL de etiqueta fuera la enlazaría a cualquier entidad con etiqueta.
+    """
+    desplazamiento = query.find("{")
+    cuerpo = query[desplazamiento:inicio]
+    patrones = []
+    anidados = {}
+    emuladas = set()
+    for m in _VARIABLE_ETIQUETA.finditer(query):
+        base, tipo = m.group(1), m.group(2)
+        variable = base + tipo
+        if variable in emuladas or not re.search(rf"\?{base}\b", cuerpo) or re.search(rf"\?{variable}\b", cuerpo):
+            continue
+        emuladas.add(variable)
+        predicado = "rdfs:label" if tipo == "Label" else "schema:description"
+        bloque = _opcional_con(cuerpo, base)
+        destino = patrones if bloque is None else anidados.setdefault(desplazamiento + bloque.end() - 1, [])
+        candidatas = []
+        for idioma in idiomas:
+            auxiliar = f"?{variable}__{idioma.replace('-', '_')}"
+            destino.append(
+                f'OPTIONAL {{ ?{base} {predicado} {auxiliar} . FILTER(LANG({auxiliar}) = "{idioma}") }}'
+            )
+            candidatas.append(auxiliar)
+        if tipo == "Label":
+            # Igual que el servicio de Wikidata: sin etiqueta se devuelve el QID
+            candidatas.append(f'STRAFTER(STR(?{base}), "{PREFIJOS["wd"]}")')
+        patrones.append(f"BIND(COALESCE({', '.join(candidatas)}) AS ?{variable})")
+    return "\n".join(patrones), anidados
+
+
+def _expandir_values(m):
+    """Convierte `VALUES ?x { a b }` en `{ BIND(a AS ?x) } UNION { BIND(b AS ?x) }`.
+
+    rdflib une el bloque VALUES al final del grupo, así que un OPTIONAL sin
+    coincidencias descarta filas que en Wikidata sí aparecen.
+    """
+    variable = m.group(1)
+    contenido = re.sub(r"#[^\n]*", "", m.group(2))
+    terminos = _TERMINO.findall(contenido)
+    return _union([f"{{ BIND({termino} AS ?{variable}) }}" for termino in terminos])
+
+
+def _union(bloques):
+    """Une los bloques con UNION, anidando las listas largas en un árbol equilibrado.
+
+    Una cadena de cientos de UNION agota la recursión del parser de rdflib.
+    """
+    if len(bloques) <= MAX_UNION_PLANA:
+        return " UNION ".join(bloques)
+    mitad = len(bloques) // 2
+    return f"{{ {_union(bloques[:mitad])} }} UNION {{ {_union(bloques[mitad:])} }}"
+
+
+def traducir_query(query):
+    """Reescribe una consulta de Wikidata para que rdflib pueda ejecutarla"""
+    m = _SERVICIO_ETIQUETAS.search(query)
+    if m is not None:
+        idiomas = [idioma.strip() for idioma in m.group(1).split(",") if idioma.strip()]
+        patrones, anidados = _emular_etiquetas(query, idiomas, m.start())
+        query = query[:m.start()] + patrones + query[m.end():]
+        for posicion in sorted(anidados, reverse=True):
+            query = query[:posicion] + " ".join(anidados[posicion]) + " " + query[posicion:]
+    return _VALUES.sub(_expandir_values, query)
+
+
+def ejecutar_local(query, endpoint=None):
+    """Ejecuta la consulta sobre el grafo local y devuelve el JSON de resultados SPARQL.
+
+    Todos los endpoints comparten el mismo grafo, por lo que `endpoint` se ignora.
+    """
+    grafo = cargar_grafo()
+    with _lock_consulta:
+        resultado = grafo.query(traducir_query(query), initNs=PREFIJOS)
+        return json.loads(resultado.serialize(format="json"))
@@ -0,0 +1,66 @@
+"""Ejecución concurrente de consultas SPARQL independientes."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .cliente import DBPEDIA_ENDPOINT, DBPEDIA_ES_ENDPOINT, WIKIDATA_ENDPOINT, consultar_con_origen, consultar_guardado
+
+# Consultas simultáneas permitidas por endpoint (WDQS admite 5 por cliente).
+LIMITE_POR_DEFECTO = 4
+LIMITES_POR_ENDPOINT = {
+    WIKIDATA_ENDPOINT: 5,
+    DBPEDIA_ENDPOINT: 4,
+    DBPEDIA_ES_ENDPOINT: 2,
+}
+
+# Un pool por endpoint con tantos hilos como su límite: las consultas de más esperan
+# en la cola de su endpoint sin ocupar un hilo, y un endpoint lento no retrasa a los demás
+_pools = {}  # endpoint -> ThreadPoolExecutor
+_lock_pools = threading.Lock()
+
+
+def _pool(endpoint):
+    with _lock_pools:
+        if endpoint not in _pools:
+            limite = LIMITES_POR_ENDPOINT.get(endpoint, LIMITE_POR_DEFECTO)
+            _pools[endpoint] = ThreadPoolExecutor(max_workers=limite, thread_name_prefix="sparql")
+        return _pools[endpoint]
+
+
+def _resuelto(valor):
+    futuro = Future()
+    futuro.set_result(valor)
+    return futuro
+
+
+def _lanzar(query, endpoint, etiqueta=None, columnar=False, tipos=None, refrescar=False):
+    # Lo que ya está en memoria o en el almacén se contesta aquí, sin esperar turno detrás de consultas lentas
+    guardado = None if refrescar else consultar_guardado(query, endpoint, etiqueta, columnar, tipos)
+    if guardado is not None:
+        return _resuelto(guardado)
+    return _pool(endpoint).submit(consultar_con_origen, query, endpoint, etiqueta, columnar, tipos, refrescar)
+
+
+def lanzar_lote(pares, columnar=False, tipos=None, refrescar=False):
+    """Lanza en paralelo las consultas de `consultar_lote` sin esperarlas.
+
+    Devuelve un futuro por consulta, en el mismo orden; cada uno da (resultado, origen)
+    como `consultar_con_origen` o su excepción. Los resultados vigentes en memoria o en
+    el almacén se buscan antes de lanzar nada y sus futuros vuelven ya resueltos.
+    """
+    return [_lanzar(*par, columnar=columnar, tipos=tipos, refrescar=refrescar) for par in pares]
+
+
+def consultar_lote(pares, columnar=False, tipos=None, refrescar=False):
+    """Ejecuta en paralelo una lista de pares (query, endpoint) o ternas (query, endpoint, etiqueta).
+
+    Devuelve los resultados en el mismo orden de entrada; si una consulta falla,
+    en su posición se devuelve la excepción en lugar del resultado. `columnar`,
+    `tipos` y `refrescar` se aplican a todas las consultas (ver `consultar`).
+    """
+    resultados = []
+    for futuro in lanzar_lote(pares, columnar, tipos, refrescar):
+        try:
+            resultados.append(futuro.result()[0])
+        except Exception as e:
+            resultados.append(e)
+    return resultados
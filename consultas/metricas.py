@@ -0,0 +1,209 @@
+"""Métricas de las consultas SPARQL por etiqueta y endpoint: latencia, tamaño, filas, errores y caché."""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Límites superiores (segundos) de los cubos del histograma de latencia
+CUBOS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Cómo se resolvió cada consulta: caché, almacén compartido en disco, petición propia,
+# esperando la de otra sesión (coalescida), resultado caducado tras un fallo, o error
+ORIGENES = ("cache", "almacen", "red", "coalescida", "caducado", "error")
+
+SIN_ETIQUETA = "sin_etiqueta"
+
+
+def filas(resultado):
+    """Número de filas de un resultado SPARQL JSON o columnar"""
+    if not isinstance(resultado, dict):
+        return len(resultado)
+    try:
+        return len(resultado["results"]["bindings"])
+    except (KeyError, TypeError):
+        return 0
+
+
+class Serie:
+    """Contadores e histograma de una combinación (etiqueta, endpoint)"""
+
+    def __init__(self):
+        self.cubos = [0] * (len(CUBOS_LATENCIA) + 1)  # el último es +Inf
+        self.segundos = 0.0
+        self.total = 0
+        self.origenes = dict.fromkeys(ORIGENES, 0)
+        self.errores = {}  # clase de excepción -> veces
+        self.bytes = 0
+        self.filas = 0
+
+    def observar(self, segundos, origen, tamano, num_filas, error):
+        i = 0
+        while i < len(CUBOS_LATENCIA) and segundos > CUBOS_LATENCIA[i]:
+            i += 1
+        self.cubos[i] += 1
+        self.segundos += segundos
+        self.total += 1
+        self.origenes[origen] += 1
+        self.bytes += tamano
+        self.filas += num_filas
+        if error is not None:
+            nombre = type(error).__name__
+            self.errores[nombre] = self.errores.get(nombre, 0) + 1
+
+    def percentil(self, p):
+        """Estimación del percentil `p` (0-1) por el límite superior de su cubo"""
+        if not self.total:
+            return 0.0
+        objetivo = p * self.total
+        acumulado = 0
+        for limite, cuenta in zip(CUBOS_LATENCIA + (float("inf"),), self.cubos):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return limite
+        return float("inf")
+
+    def resumen(self):
+        respondidas = self.total - self.origenes["error"]
+        return {
+            "consultas": self.total,
+            "segundos": round(self.segundos, 6),
+            "media_s": round(self.segundos / self.total, 6) if self.total else 0.0,
+            "p50_s": self.percentil(0.5),
+            "p95_s": self.percentil(0.95),
+            "origenes": dict(self.origenes),
+            "ratio_aciertos": self.origenes["cache"] / respondidas if respondidas else 0.0,
+            "bytes": self.bytes,
+            "filas": self.filas,
+            "errores": dict(self.errores),
+            "histograma": dict(zip([str(c) for c in CUBOS_LATENCIA] + ["+Inf"], self.cubos)),
+        }
+
+
+class Metricas:
+    """Registro de métricas compartido por todas las sesiones del proceso"""
+
+    def __init__(self):
+        self._series = {}  # (etiqueta, endpoint) -> Serie
+        self._lock = threading.Lock()
+
+    def observar(self, etiqueta, endpoint, segundos, origen, tamano=0, num_filas=0, error=None):
+        clave = (etiqueta or SIN_ETIQUETA, endpoint)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = Serie()
+            serie.observar(segundos, origen, tamano, num_filas, error)
+
+    def limpiar(self):
+        with self._lock:
+            self._series.clear()
+
+    def resumen(self):
+        """Lista de diccionarios, uno por (etiqueta, endpoint)"""
+        with self._lock:
+            return [
+                {"etiqueta": etiqueta, "endpoint": endpoint, **serie.resumen()}
+                for (etiqueta, endpoint), serie in sorted(self._series.items())
+            ]
+
+    def exportar_json(self, extra=None):
+        return json.dumps({"series": self.resumen(), **(extra or {})}, ensure_ascii=False, indent=2)
+
+    def exportar_prometheus(self, extra=None):
+        """Formato de texto de Prometheus; `extra` son gauges sueltos {nombre: valor}"""
+        familias = {
+            "futbol_sparql_latencia_segundos": ("histogram", []),
+            "futbol_sparql_consultas_total": ("counter", []),
+            "futbol_sparql_bytes_total": ("counter", []),
+            "futbol_sparql_filas_total": ("counter", []),
+            "futbol_sparql_errores_total": ("counter", []),
+        }
+        with self._lock:
+            for (etiqueta, endpoint), serie in sorted(self._series.items()):
+                base = f'etiqueta="{etiqueta}",endpoint="{endpoint}"'
+                latencia = familias["futbol_sparql_latencia_segundos"][1]
+                acumulado = 0
+                for limite, cuenta in zip(CUBOS_LATENCIA + ("+Inf",), serie.cubos):
+                    acumulado += cuenta
+                    latencia.append(f'futbol_sparql_latencia_segundos_bucket{{{base},le="{limite}"}} {acumulado}')
+                latencia.append(f"futbol_sparql_latencia_segundos_sum{{{base}}} {serie.segundos}")
+                latencia.append(f"futbol_sparql_latencia_segundos_count{{{base}}} {serie.total}")
+                for origen, cuenta in serie.origenes.items():
+                    familias["futbol_sparql_consultas_total"][1].append(
+                        f'futbol_sparql_consultas_total{{{base},origen="{origen}"}} {cuenta}'
+                    )
+                familias["futbol_sparql_bytes_total"][1].append(f"futbol_sparql_bytes_total{{{base}}} {serie.bytes}")
+                familias["futbol_sparql_filas_total"][1].append(f"futbol_sparql_filas_total{{{base}}} {serie.filas}")
+                for clase, cuenta in serie.errores.items():
+                    familias["futbol_sparql_errores_total"][1].append(
+                        f'futbol_sparql_errores_total{{{base},clase="{clase}"}} {cuenta}'
+                    )
+        lineas = []
+        for nombre, (tipo, muestras) in familias.items():
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            lineas.extend(muestras)
+        for nombre, valor in (extra or {}).items():
+            lineas.append(f"# TYPE {nombre} gauge")
+            lineas.append(f"{nombre} {float(valor)}")
+        return "\n".join(lineas) + "\n"
+
+registro = Metricas()
+
+
+def extra():
+    """Estadísticas de las cachés, del almacén en disco, de la coalescencia, de los plazos y de los respaldos como gauges"""
+    from . import plazos, respaldo
+    from .cliente import cache, vuelos
+    from .etiquetas import etiquetas
+    from .persistencia import almacen
+
+    extra = {f"futbol_cache_{nombre}": valor for nombre, valor in cache.estadisticas().items()}
+    extra.update({f"futbol_vuelos_{nombre}": valor for nombre, valor in vuelos.estadisticas().items()})
+    extra.update({f"futbol_etiquetas_{nombre}": valor for nombre, valor in etiquetas.estadisticas().items()})
+    if almacen is not None:
+        extra.update({
+            f"futbol_almacen_{nombre}": valor for nombre, valor in almacen.estadisticas().items() if valor is not None
+        })
+    extra.update({f"futbol_plazos_{nombre}": valor for nombre, valor in plazos.estadisticas().items()})
+    grupos = respaldo.estadisticas().values()
+    for nombre in ("peticiones", "respaldos", "ganadas_por_respaldo"):
+        extra[f"futbol_respaldo_{nombre}"] = sum(grupo[nombre] for grupo in grupos)
+    return extra
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            cuerpo, tipo = registro.exportar_prometheus(extra()), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            cuerpo, tipo = registro.exportar_json(extra()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        cuerpo = cuerpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+_servidor = None
+_servidor_lock = threading.Lock()
+
+
+def iniciar_servidor(puerto=None):
+    """Expone /metrics y /metrics.json en `puerto` (o FUTBOL_METRICAS_PUERTO); una vez por proceso"""
+    global _servidor
+    puerto = puerto or os.environ.get("FUTBOL_METRICAS_PUERTO")
+    if not puerto:
+        return None
+    with _servidor_lock:
+        if _servidor is None:
+            _servidor = ThreadingHTTPServer(("0.0.0.0", int(puerto)), _ManejadorMetricas)
+            _servidor.daemon_threads = True
+            threading.Thread(target=_servidor.serve_forever, daemon=True, name="metricas").start()
+        return _servidor
@@ -0,0 +1,156 @@
+"""Índice de nombres de jugadores insensible a tildes, con alias y búsqueda por trigramas."""
+import bisect
+import re
+import unicodedata
+
+_APOSTROFES = re.compile(r"[’'`´]")
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+# Longitud mínima de cada palabra para aceptar coincidencias por prefijo
+MIN_PREFIJO = 3
+# Similitud de trigramas (Jaccard) mínima para sugerir un nombre mal escrito
+MIN_SIMILITUD = 0.4
+# ... y para darlo por bueno como respuesta
+MIN_SIMILITUD_RESPUESTA = 0.6
+
+
+def plegar(texto):
+    """Normaliza un nombre: sin tildes, en minúsculas y con las palabras separadas por un espacio"""
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).casefold()
+    texto = _APOSTROFES.sub("", texto)
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def trigramas(texto_plegado):
+    relleno = f"  {texto_plegado} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceNombres:
+    """Índice de búsqueda sobre nombres canónicos y sus alias.
+
+    `entradas` es un iterable de pares (nombre, [alias, ...]); las búsquedas
+    devuelven siempre nombres canónicos.
+    """
+
+    def __init__(self, entradas):
+        self.nombres = []
+        self._exactos = {}    # forma plegada -> ids
+        self._palabras = {}   # palabra -> ids
+        self._apellidos = {}  # última palabra -> ids
+        self._trigramas = {}  # trigrama -> ids de forma
+        self._formas = []     # id de forma -> (id de nombre, nº de trigramas)
+        for nombre, alias in entradas:
+            id_nombre = len(self.nombres)
+            self.nombres.append(nombre)
+            for forma in {plegar(forma) for forma in [nombre, *alias]} - {""}:
+                self._exactos.setdefault(forma, set()).add(id_nombre)
+                for palabra in forma.split():
+                    self._palabras.setdefault(palabra, set()).add(id_nombre)
+                self._apellidos.setdefault(forma.split()[-1], set()).add(id_nombre)
+                trigramas_forma = trigramas(forma)
+                for trigrama in trigramas_forma:
+                    self._trigramas.setdefault(trigrama, []).append(len(self._formas))
+                self._formas.append((id_nombre, len(trigramas_forma)))
+        self._palabras_ordenadas = sorted(self._palabras)
+
+    def _con_prefijo(self, prefijo):
+        """Ids de los nombres con alguna palabra que empieza por `prefijo`"""
+        ids = set()
+        i = bisect.bisect_left(self._palabras_ordenadas, prefijo)
+        while i < len(self._palabras_ordenadas) and self._palabras_ordenadas[i].startswith(prefijo):
+            ids |= self._palabras[self._palabras_ordenadas[i]]
+            i += 1
+        return ids
+
+    def _por_palabras(self, palabras, prefijo):
+        ids = None
+        for palabra in palabras:
+            if prefijo:
+                if len(palabra) < MIN_PREFIJO:
+                    return set()
+                encontrados = self._con_prefijo(palabra)
+            else:
+                encontrados = self._palabras.get(palabra, set())
+            ids = encontrados if ids is None else ids & encontrados
+            if not ids:
+                return set()
+        return ids or set()
+
+    def _similitudes(self, consulta, minima):
+        """{id de nombre: similitud} de los nombres al menos tan parecidos a `consulta` como `minima`"""
+        buscados = trigramas(consulta)
+        comunes = {}
+        for trigrama in buscados:
+            for id_forma in self._trigramas.get(trigrama, ()):
+                comunes[id_forma] = comunes.get(id_forma, 0) + 1
+        similitudes = {}
+        for id_forma, compartidos in comunes.items():
+            id_nombre, total = self._formas[id_forma]
+            similitud = compartidos / (len(buscados) + total - compartidos)
+            if similitud >= minima and similitud > similitudes.get(id_nombre, 0):
+                similitudes[id_nombre] = similitud
+        return similitudes
+
+    def _por_trigramas(self, consulta):
+        """Ids de los nombres parecidos a `consulta`, del más al menos similar"""
+        similitudes = self._similitudes(consulta, MIN_SIMILITUD)
+        return sorted(similitudes, key=lambda id_nombre: -similitudes[id_nombre])
+
+    def buscar(self, texto, limite=5):
+        """Nombres que coinciden con `texto`, del más al menos probable.
+
+        Orden: coincidencia exacta, todas las palabras completas, todas las palabras
+        como prefijo y, por último, similitud de trigramas (erratas).
+        """
+        consulta = plegar(texto or "")
+        if not consulta:
+            return []
+        palabras = consulta.split()
+        resultado = []
+        vistos = set()
+        niveles = [
+            lambda: sorted(self._exactos.get(consulta, ())),
+            lambda: sorted(self._por_palabras(palabras, prefijo=False)),
+            lambda: sorted(self._por_palabras(palabras, prefijo=True)),
+            lambda: self._por_trigramas(consulta),
+        ]
+        # Cada nivel solo se calcula si los anteriores no bastan para llenar el límite
+        for nivel in niveles:
+            for id_nombre in nivel():
+                if id_nombre not in vistos:
+                    vistos.add(id_nombre)
+                    resultado.append(self.nombres[id_nombre])
+                    if len(resultado) == limite:
+                        return resultado
+        return resultado
+
+    def identificar(self, texto):
+        """Nombres que `texto` identifica como respuesta: los del nivel más fuerte que coincide.
+
+        Niveles: coincidencia exacta, palabras completas que incluyen el apellido (la
+        última palabra) y, para erratas, los más parecidos por trigramas con al menos
+        MIN_SIMILITUD_RESPUESTA. Los prefijos solo sirven para `sugerencias`.
+        """
+        consulta = plegar(texto or "")
+        if not consulta:
+            return []
+        palabras = consulta.split()
+        ids = self._exactos.get(consulta, set())
+        if not ids:
+            ids = self._por_palabras(palabras, prefijo=False)
+            ids = ids & set().union(*(self._apellidos.get(palabra, set()) for palabra in palabras))
+        if not ids:
+            similitudes = self._similitudes(consulta, MIN_SIMILITUD_RESPUESTA)
+            mejor = max(similitudes.values(), default=None)
+            ids = {id_nombre for id_nombre, similitud in similitudes.items() if similitud == mejor}
+        return [self.nombres[id_nombre] for id_nombre in sorted(ids)]
+
+    def sugerencias(self, texto, limite=8):
+        """Nombres cuyas palabras empiezan por las escritas en `texto` (autocompletado)"""
+        palabras = plegar(texto or "").split()
+        if not palabras:
+            return []
+        ids = self._por_palabras(palabras, prefijo=True)
+        return sorted(self.nombres[id_nombre] for id_nombre in ids)[:limite]
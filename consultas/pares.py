@@ -0,0 +1,156 @@
+"""Almacén compartido y de solo lectura de los pares de clubes del juego.
+
+Los datos de un par (carreras de los jugadores en común e índice de nombres) se
+construyen una vez por proceso y se comparten entre sesiones: cada sesión guarda
+solo el id del par y su propio progreso, así su memoria no crece con el número de
+jugadores en común.
+"""
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
+
+from .clubes import cargar_indice_clubes, cargar_jugadores_en_comun, indice_cargado, uri_completa
+from .nombres import IndiceNombres
+
+# Pares que se conservan en memoria; uno desalojado se reconstruye al pedirlo
+MAX_PARES = 512
+
+_SIN_DATO = -1
+_CAMPOS_ETAPA = ("start", "end", "matches", "goals")
+
+
+class CarreraJugador:
+    """Carrera de un jugador en los dos clubes de un par: inicio, fin, partidos y goles en cada uno"""
+
+    __slots__ = ("nombre", "imagen", "_etapas")
+
+    def __init__(self, nombre, imagen, etapa1, etapa2):
+        self.nombre = nombre
+        self.imagen = imagen
+        self._etapas = array("i", (_SIN_DATO if v is None else v for v in (*etapa1, *etapa2)))
+
+    def _etapa(self, i):
+        valores = self._etapas[4 * i:4 * i + 4]
+        return {campo: None if v == _SIN_DATO else v for campo, v in zip(_CAMPOS_ETAPA, valores)}
+
+    @property
+    def equipo1(self):
+        return self._etapa(0)
+
+    @property
+    def equipo2(self):
+        return self._etapa(1)
+
+
+class Par:
+    """Dos clubes y sus jugadores en común, inmutable una vez construido.
+
+    `origen` es el índice de co-membresías del que sale (None si salió de una consulta);
+    se guarda como referencia débil para no retener índices ya refrescados.
+    """
+
+    __slots__ = ("id", "club1", "club2", "jugadores", "indice_nombres", "origen")
+
+    def __init__(self, id_par, club1, club2, carreras, indice_nombres=None, origen=None):
+        self.id = id_par
+        self.club1 = club1
+        self.club2 = club2
+        self.origen = weakref.ref(origen) if origen is not None else None
+        self.jugadores = MappingProxyType({carrera.nombre: carrera for carrera in carreras})
+        # Sin índice de las plantillas, el autocompletado y la validación usan solo las respuestas
+        self.indice_nombres = indice_nombres or IndiceNombres((nombre, ()) for nombre in self.jugadores)
+
+
+def id_par(club_a, club_b):
+    """Id de un par de clubes: 'Q7156-Q8682' (el orden importa, es el de presentación)"""
+    return f"{uri_completa(club_a).rsplit('/', 1)[-1]}-{uri_completa(club_b).rsplit('/', 1)[-1]}"
+
+
+def _nombres_por_uri(equipos):
+    return {uri_completa(info["uri"]): nombre for nombre, info in equipos.items()}
+
+
+def _carreras(detalle):
+    """Registros compactos a partir del formato {nombre: {imagen, equipo1, equipo2}}"""
+    return [
+        CarreraJugador(
+            nombre, info["imagen"],
+            [info["equipo1"][campo] for campo in _CAMPOS_ETAPA],
+            [info["equipo2"][campo] for campo in _CAMPOS_ETAPA],
+        )
+        for nombre, info in detalle.items()
+    ]
+
+
+def par_desde_indice(indice, club_a, club_b, equipos):
+    """Construye el par a partir del índice de co-membresías (sin consultar la red)"""
+    nombres = _nombres_por_uri(equipos)
+    return Par(
+        id_par(club_a, club_b), nombres[uri_completa(club_a)], nombres[uri_completa(club_b)],
+        _carreras(indice.jugadores_en_comun(club_a, club_b)), indice.indice_nombres(club_a, club_b), indice,
+    )
+
+
+def par_desde_consulta(club_a, club_b, equipos):
+    """Construye el par con una consulta agregada (cuando no hay índice)"""
+    nombres = _nombres_por_uri(equipos)
+    return Par(
+        id_par(club_a, club_b), nombres[uri_completa(club_a)], nombres[uri_completa(club_b)],
+        _carreras(cargar_jugadores_en_comun(club_a, club_b)),
+    )
+
+
+class AlmacenPares:
+    """Pares construidos, por id, con desalojo LRU"""
+
+    def __init__(self, max_pares=MAX_PARES):
+        self.max_pares = max_pares
+        self._pares = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pares)
+
+    def guardar(self, par):
+        with self._lock:
+            self._pares[par.id] = par
+            self._pares.move_to_end(par.id)
+            if len(self._pares) > self.max_pares:
+                self._pares.popitem(last=False)
+        return par
+
+    def obtener(self, id_par):
+        with self._lock:
+            par = self._pares.get(id_par)
+            if par is not None:
+                self._pares.move_to_end(id_par)
+            return par
+
+    def limpiar(self):
+        with self._lock:
+            self._pares.clear()
+
+
+almacen = AlmacenPares()
+
+
+def obtener_par(id_par, equipos):
+    """Devuelve el par con ese id, reconstruyéndolo si no está o si el índice se ha refrescado.
+
+    Con el par en el almacén y el índice al día no se consulta nada; si hay que
+    reconstruirlo sin índice en memoria, se intenta cargar y, si falla, se usa una consulta.
+    """
+    club_uris = [info["uri"] for info in equipos.values()]
+    par = almacen.obtener(id_par)
+    indice = indice_cargado(club_uris)
+    if par is not None and (indice is None or (par.origen is not None and par.origen() is indice)):
+        return par
+    club_a, club_b = (uri_completa(qid) for qid in id_par.split("-"))
+    if indice is None:
+        try:
+            indice = cargar_indice_clubes(club_uris)
+        except Exception:
+            return almacen.guardar(par_desde_consulta(club_a, club_b, equipos))
+    return almacen.guardar(par_desde_indice(indice, club_a, club_b, equipos))
@@ -0,0 +1,178 @@
+"""Almacén en disco de resultados SPARQL, compartido entre procesos (SQLite en modo WAL).
+
+Las réplicas de la app detrás de un balanceador apuntan al mismo fichero: lo que
+consulta una lo sirven las demás, y un proceso nuevo (p. ej. tras un despliegue)
+sirve sus primeras páginas con los resultados de los anteriores, sin consultar los
+endpoints. En modo WAL los lectores no bloquean al escritor ni entre sí; los
+escritores se turnan esperando hasta ESPERA_BLOQUEO. Los resultados se guardan como
+JSON comprimido con zlib y caducan por hora de reloj, la misma en todos los procesos.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .cache import normalizar_query
+from .endpoints import BACKEND
+
+# Fichero del almacén; vacío lo desactiva y cada proceso solo tiene su caché en memoria
+RUTA = os.environ.get("FUTBOL_ALMACEN", os.path.join(".cache", "resultados.sqlite3"))
+MAX_BYTES = int(os.environ.get("FUTBOL_ALMACEN_MAX_BYTES", 256 * 1024 * 1024))
+# Segundos que espera una escritura a que otro proceso libere la base
+ESPERA_BLOQUEO = 5.0
+# Cada cuántas escrituras de este proceso se comprueba el presupuesto de bytes
+ESCRITURAS_POR_PURGA = 50
+NIVEL_COMPRESION = 6
+# Forma parte de la clave: al cambiar el formato, las entradas antiguas dejan de leerse y se purgan
+VERSION = 3
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    clave TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    valor BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    guardado REAL NOT NULL,
+    expira REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_guardado ON resultados (guardado);
+"""
+
+
+class AlmacenResultados:
+    """Resultados SPARQL JSON por (backend, endpoint, query normalizada) en un fichero SQLite.
+
+    Los errores de SQLite (base bloqueada demasiado tiempo, disco lleno, fichero
+    dañado) no se propagan: el almacén es una caché y la consulta sigue contra el
+    endpoint. Se cuentan en `errores`. Al superar `max_bytes` se borran los
+    resultados guardados hace más tiempo. El backend entra en la clave: lo que
+    responde el grafo local no se sirve nunca como respuesta del endpoint real.
+    """
+
+    def __init__(self, ruta=RUTA, max_bytes=MAX_BYTES, backend=BACKEND):
+        self.ruta = ruta
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self._local = threading.local()  # una conexión por hilo: sqlite3 no las comparte
+        self._lock = threading.Lock()
+        self._sin_purgar = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        self.errores = 0
+
+    def clave(self, query, endpoint):
+        texto = f"{VERSION}\n{self.backend}\n{endpoint}\n{normalizar_query(query)}"
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            # En WAL basta con sincronizar en los checkpoints: un corte solo pierde las últimas escrituras
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.executescript(_ESQUEMA)
+            self._local.conexion = conexion
+        return conexion
+
+    def _contar(self, contador, n=1):
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + n)
+
+    def obtener(self, query, endpoint, caducado=False):
+        """(resultado, expira) si hay un resultado vigente (o, con `caducado`, aunque haya expirado); si no, None.
+
+        `expira` es una hora de reloj (`time.time()`).
+        """
+        try:
+            fila = self._conexion().execute(
+                "SELECT valor, expira FROM resultados WHERE clave = ?", (self.clave(query, endpoint),)
+            ).fetchone()
+            if fila is None or not caducado and fila[1] <= time.time():
+                self._contar("fallos")
+                return None
+            resultado = json.loads(zlib.decompress(fila[0]))
+        except (sqlite3.Error, zlib.error, ValueError):
+            self._contar("errores")
+            return None
+        self._contar("aciertos")
+        return resultado, fila[1]
+
+    def guardar(self, query, endpoint, resultado, ttl):
+        """Guarda (o reemplaza) el resultado de la consulta para los próximos `ttl` segundos"""
+        valor = zlib.compress(
+            json.dumps(resultado, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), NIVEL_COMPRESION
+        )
+        if len(valor) > self.max_bytes:
+            return
+        ahora = time.time()
+        try:
+            conexion = self._conexion()
+            conexion.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?)",
+                (self.clave(query, endpoint), endpoint, valor, len(valor), ahora, ahora + ttl),
+            )
+            with self._lock:
+                self.escrituras += 1
+                self._sin_purgar += 1
+                purgar = self._sin_purgar >= ESCRITURAS_POR_PURGA
+                if purgar:
+                    self._sin_purgar = 0
+            if purgar:
+                self._purgar(conexion)
+        except sqlite3.Error:
+            self._contar("errores")
+
+    def _purgar(self, conexion):
+        """Borra los resultados guardados hace más tiempo hasta volver al presupuesto de bytes"""
+        exceso = conexion.execute("SELECT COALESCE(SUM(bytes), 0) FROM resultados").fetchone()[0] - self.max_bytes
+        if exceso <= 0:
+            return
+        borrar = 0
+        cursor = conexion.execute("SELECT bytes FROM resultados ORDER BY guardado")
+        for (tamano,) in cursor:
+            borrar += 1
+            exceso -= tamano
+            if exceso <= 0:
+                break
+        cursor.close()
+        conexion.execute(
+            "DELETE FROM resultados WHERE clave IN (SELECT clave FROM resultados ORDER BY guardado LIMIT ?)", (borrar,)
+        )
+        self._contar("desalojos", borrar)
+
+    def limpiar(self):
+        try:
+            self._conexion().execute("DELETE FROM resultados")
+        except sqlite3.Error:
+            self._contar("errores")
+
+    def estadisticas(self):
+        try:
+            entradas, total = self._conexion().execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM resultados"
+            ).fetchone()
+        except sqlite3.Error:
+            entradas = total = None
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": entradas,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "escrituras": self.escrituras,
+                "desalojos": self.desalojos,
+                "errores": self.errores,
+                "ratio_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+almacen = AlmacenResultados() if RUTA else None
@@ -0,0 +1,106 @@
+"""Plantillas SPARQL de carreras de jugadores, agregadas en el servidor.
+
+Un jugador puede tener varias declaraciones P54 con el mismo club (cesiones, regresos)
+y varias imágenes; sin agregar, cada combinación es una fila más. Estas plantillas
+agrupan en una subconsulta por (jugador, club) antes de añadir la imagen, de
+modo que devuelven una sola fila por clave y las sumas no se duplican. Los nombres
+de los jugadores no se piden aquí: se resuelven aparte con `consultas.etiquetas`.
+
+Las columnas `con_partidos`/`con_goles` cuentan los valores sumados: SUM sobre
+valores ausentes da 0, y así se distingue "0 partidos" de "sin datos". Los HAVING
+no filtran nada en Wikidata: descartan el grupo vacío que rdflib devuelve al agrupar
+cero filas y que, en una subconsulta, se uniría con todo.
+"""
+
+# Filtro de jugadores: humanos con ocupación futbolista
+FILTRO_FUTBOLISTA = "wdt:P31 wd:Q5; wdt:P106 wd:Q937857"
+
+# Claves que identifican una fila de cada plantilla (para comprobar la multiplicidad)
+CLAVES_CARRERAS_POR_CLUB = ("jugador", "club")
+CLAVES_CARRERAS_EN_AMBOS_CLUBES = ("jugador",)
+
+
+def tipos_carrera(*sufijos):
+    """Tipos de columna (ver `a_columnas`) de las carreras con los sufijos dados"""
+    tipos = {}
+    for sufijo in sufijos or ("",):
+        tipos.update({f"inicio{sufijo}": "fecha", f"fin{sufijo}": "fecha"})
+        for columna in ("partidos", "con_partidos", "goles", "con_goles"):
+            tipos[columna + sufijo] = "numero"
+    return tipos
+
+
+def valores(uris):
+    return " ".join(f"<{uri}>" for uri in uris)
+
+
+def _agregados_carrera(stmt, sufijo=""):
+    """Patrones y proyecciones que resumen las declaraciones P54 `stmt` de un jugador en un club"""
+    patrones = f"""
+            OPTIONAL {{ {stmt} pq:P580 ?inicio_{sufijo} . }}
+            OPTIONAL {{ {stmt} pq:P582 ?fin_{sufijo} . }}
+            OPTIONAL {{ {stmt} pq:P1350 ?partidos_{sufijo} . }}
+            OPTIONAL {{ {stmt} pq:P1351 ?goles_{sufijo} . }}"""
+    proyecciones = (
+        f"(MIN(?inicio_{sufijo}) AS ?inicio{sufijo}) (MAX(?fin_{sufijo}) AS ?fin{sufijo}) "
+        f"(SUM(COALESCE(?partidos_{sufijo}, 0)) AS ?partidos{sufijo}) (COUNT(?partidos_{sufijo}) AS ?con_partidos{sufijo}) "
+        f"(SUM(COALESCE(?goles_{sufijo}, 0)) AS ?goles{sufijo}) (COUNT(?goles_{sufijo}) AS ?con_goles{sufijo})"
+    )
+    return patrones, proyecciones
+
+
+def _columnas_carrera(sufijo=""):
+    return f"?inicio{sufijo} ?fin{sufijo} ?partidos{sufijo} ?con_partidos{sufijo} ?goles{sufijo} ?con_goles{sufijo}"
+
+
+def carreras_por_club(club_uris):
+    """Una fila por (jugador, club) con el periodo y las estadísticas agregadas de sus etapas"""
+    patrones, proyecciones = _agregados_carrera("?stmt")
+    columnas = _columnas_carrera()
+    return f"""
+    SELECT ?jugador ?club {columnas} (SAMPLE(?imagen_) AS ?imagen) WHERE {{
+        {{
+            SELECT ?jugador ?club {proyecciones} WHERE {{
+                VALUES ?club {{ {valores(club_uris)} }}
+                ?jugador p:P54 ?stmt .
+                ?stmt ps:P54 ?club .
+                ?jugador {FILTRO_FUTBOLISTA} .{patrones}
+            }}
+            GROUP BY ?jugador ?club
+            HAVING (COUNT(?stmt) > 0)
+        }}
+        OPTIONAL {{ ?jugador wdt:P18 ?imagen_ . }}
+    }}
+    GROUP BY ?jugador ?club {columnas}
+    HAVING (BOUND(?jugador))
+    """
+
+
+def carreras_en_ambos_clubes(club_a, club_b):
+    """Una fila por jugador que pasó por ambos clubes, con su carrera en cada uno (sufijos 1 y 2)"""
+    subconsultas = []
+    for sufijo, club in (("1", club_a), ("2", club_b)):
+        patrones, proyecciones = _agregados_carrera(f"?stmt{sufijo}", sufijo)
+        subconsultas.append(f"""
+        {{
+            SELECT ?jugador {proyecciones} WHERE {{
+                ?jugador p:P54 ?stmt{sufijo} .
+                ?stmt{sufijo} ps:P54 <{club}> .{patrones}
+            }}
+            GROUP BY ?jugador
+            HAVING (COUNT(?stmt{sufijo}) > 0)
+        }}""")
+    columnas = f"{_columnas_carrera('1')} {_columnas_carrera('2')}"
+    return f"""
+    SELECT ?jugador {columnas} (SAMPLE(?imagen_) AS ?imagen) WHERE {{{"".join(subconsultas)}
+        ?jugador {FILTRO_FUTBOLISTA} .
+        OPTIONAL {{ ?jugador wdt:P18 ?imagen_ . }}
+    }}
+    GROUP BY ?jugador {columnas}
+    HAVING (BOUND(?jugador))
+    """
+
+
+def filas_repetidas(filas, claves):
+    """Número de filas de más respecto a una por clave (0 si la plantilla cumple su contrato)"""
+    return len(filas) - len(filas.drop_duplicates(list(claves)))
@@ -0,0 +1,156 @@
+"""Plazos de consultas y secciones: la página responde a tiempo aunque el endpoint no.
+
+Cada consulta espera como mucho PLAZO_CONSULTA, y cada ejecución de una sección
+reparte entre las suyas un presupuesto (`Plazo`, PLAZO_SECCION). Si no llega la
+respuesta a tiempo se sirve el último resultado conocido marcado como caducado o,
+si no hay ninguno, `PlazoVencido`. La petición no se cancela: sigue en segundo
+plano, coalescida con las de otras sesiones, y deja su resultado en la caché para
+la siguiente ejecución.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .cliente import ultimo_conocido
+from .lotes import lanzar_lote
+
+# Segundos por consulta y por ejecución de sección; 0 espera sin límite
+PLAZO_CONSULTA = float(os.environ.get("FUTBOL_PLAZO_CONSULTA", 4))
+PLAZO_SECCION = float(os.environ.get("FUTBOL_PLAZO_SECCION", 6))
+MAX_HILOS = 8
+
+_pool = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix="plazos")
+
+
+class PlazoVencido(TimeoutError):
+    """No hubo respuesta en el plazo y no hay ningún resultado anterior que servir"""
+
+
+class Plazo:
+    """Presupuesto de tiempo de una ejecución de sección, compartido por todas sus consultas"""
+
+    def __init__(self, segundos=PLAZO_SECCION):
+        self.fin = time.monotonic() + segundos if segundos else None
+
+    def espera(self):
+        """Segundos que quedan (None si no vence nunca)"""
+        return None if self.fin is None else max(0.0, self.fin - time.monotonic())
+
+
+def _espera(*plazos):
+    """Segundos hasta que vence el primero de los plazos (None si ninguno vence)"""
+    esperas = [espera for espera in (plazo.espera() for plazo in plazos) if espera is not None]
+    return min(esperas) if esperas else None
+
+
+class Respuesta:
+    """Resultado de una espera con plazo.
+
+    `caducado` indica que es el último resultado conocido y no uno recién obtenido;
+    sin resultado que mostrar, `error` tiene la excepción (PlazoVencido si no llegó a tiempo).
+    """
+
+    __slots__ = ("resultado", "caducado", "error")
+
+    def __init__(self, resultado=None, caducado=False, error=None):
+        self.resultado = resultado
+        self.caducado = caducado
+        self.error = error
+
+
+_contadores = {"a_tiempo": 0, "caducadas": 0, "sin_datos": 0}
+_en_curso = {}  # clave -> futuro de ejecutar_con_plazo
+_lock = threading.Lock()
+
+
+def _contar(respuesta):
+    contador = "sin_datos" if respuesta.error is not None else "caducadas" if respuesta.caducado else "a_tiempo"
+    with _lock:
+        _contadores[contador] += 1
+    return respuesta
+
+
+def _respuesta(futuro):
+    try:
+        resultado, origen = futuro.result()
+    except Exception as e:
+        return Respuesta(error=e)
+    # "caducado": el endpoint falló y `consultar` ya sirvió el último resultado conocido
+    return Respuesta(resultado, caducado=origen == "caducado")
+
+
+def _vencida(anterior, descripcion):
+    if anterior is not None:
+        return Respuesta(anterior, caducado=True)
+    return Respuesta(error=PlazoVencido(f"{descripcion} no respondió a tiempo"))
+
+
+def consultar_por_llegada(pares, plazo=None, columnar=False, tipos=None):
+    """Lanza en paralelo las consultas (query, endpoint[, etiqueta]) y genera (posición, Respuesta) según llegan.
+
+    Las que ya tienen un resultado vigente se generan en el acto, sin lanzarlas. Las
+    que no llegan dentro de PLAZO_CONSULTA ni de lo que quede de `plazo` se generan
+    al final con el último resultado conocido.
+    """
+    plazo = plazo or Plazo()
+    futuros = {futuro: i for i, futuro in enumerate(lanzar_lote(pares, columnar, tipos))}
+    fin_consulta = Plazo(PLAZO_CONSULTA)
+    pendientes = set(futuros)
+    while pendientes:
+        hechos, pendientes = wait(pendientes, timeout=_espera(plazo, fin_consulta), return_when=FIRST_COMPLETED)
+        if not hechos:
+            break
+        for futuro in hechos:
+            yield futuros[futuro], _contar(_respuesta(futuro))
+    for futuro in sorted(pendientes, key=futuros.get):
+        query, endpoint = pares[futuros[futuro]][:2]
+        yield futuros[futuro], _contar(_vencida(ultimo_conocido(query, endpoint, columnar, tipos), endpoint))
+
+
+def consultar_con_plazo(query, endpoint, etiqueta=None, columnar=False, tipos=None, plazo=None):
+    """Respuesta de una sola consulta con plazo (ver `consultar_por_llegada`)"""
+    return next(consultar_por_llegada([(query, endpoint, etiqueta)], plazo, columnar, tipos))[1]
+
+
+def ejecutar_con_plazo(funcion, plazo=None, anterior=None, clave=None):
+    """Respuesta de `funcion()` si termina dentro de PLAZO_CONSULTA y de lo que quede de `plazo`.
+
+    Si no termina a tiempo sigue en segundo plano y, como si falla, se devuelve como
+    caducado lo que dé `anterior()` (lo último cargado, sin consultar la red). Las llamadas con la
+    misma `clave` mientras una sigue en curso esperan a esa en lugar de lanzar otra.
+    `funcion` se ejecuta fuera del script de Streamlit, así que no debe usar `st`.
+    """
+    plazo = plazo or Plazo()
+    fin_consulta = Plazo(PLAZO_CONSULTA)
+    with _lock:
+        futuro = _en_curso.get(clave) if clave is not None else None
+        nuevo = futuro is None
+        if nuevo:
+            futuro = _pool.submit(funcion)
+            if clave is not None:
+                _en_curso[clave] = futuro
+    if nuevo and clave is not None:
+        # Fuera del lock: si ya terminó, la función se llama aquí mismo
+        futuro.add_done_callback(lambda _: _olvidar(clave, futuro))
+    hechos, _ = wait([futuro], timeout=_espera(plazo, fin_consulta))
+    previo = None
+    if not hechos or futuro.exception() is not None:
+        previo = anterior() if anterior is not None else None
+    if not hechos:
+        return _contar(_vencida(previo, clave or "la carga"))
+    if futuro.exception() is not None:
+        return _contar(Respuesta(previo, caducado=True) if previo is not None else Respuesta(error=futuro.exception()))
+    return _contar(Respuesta(futuro.result()))
+
+
+def _olvidar(clave, futuro):
+    with _lock:
+        if _en_curso.get(clave) is futuro:
+            del _en_curso[clave]
+
+
+def estadisticas():
+    """Respuestas servidas a tiempo, caducadas por plazo o fallo, y sin datos que mostrar"""
+    with _lock:
+        return {**_contadores, "en_curso": len(_en_curso)}
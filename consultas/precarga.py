@@ -0,0 +1,159 @@
+"""Precarga en segundo plano de los datos del quiz, los clubes y las historias.
+
+Un hilo planificador lanza cada tarea al arrancar el proceso y la repite antes de que
+caduquen sus datos (refresh-ahead): el catálogo de Mundiales (o, sin él, la tabla de
+campeones fija), el índice de clubes y las
+consultas de las historias se renuevan mientras las sesiones siguen leyendo la versión
+anterior, de modo que ninguna ejecución del script espera a la red por ellos.
+"""
+import heapq
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .campeones import cargar_tabla_campeones
+from .catalogo import catalogo
+from .cliente import WIKIDATA_ENDPOINT, cache
+from .clubes import cargar_indice_clubes
+from .datos import EQUIPOS, MUNDIALES
+from .historias import todas_las_consultas
+from .lotes import consultar_lote
+
+ACTIVA = os.environ.get("FUTBOL_PRECARGA", "1") != "0"
+# Segundos entre refrescos; sin definir, una fracción del TTL de los datos de cada tarea
+INTERVALO = float(os.environ["FUTBOL_PRECARGA_INTERVALO"]) if os.environ.get("FUTBOL_PRECARGA_INTERVALO") else None
+FRACCION_TTL = 0.8
+# Variación aleatoria (±) del intervalo, para que los refrescos no coincidan entre procesos
+JITTER = float(os.environ.get("FUTBOL_PRECARGA_JITTER", 0.1))
+# Tareas de precarga que pueden ejecutarse a la vez
+MAX_HILOS = int(os.environ.get("FUTBOL_PRECARGA_HILOS", 2))
+# Tras un fallo se reintenta antes, duplicando la espera hasta llegar al intervalo normal
+REINTENTO_INICIAL = 30
+
+
+def _precargar_campeones(refrescar):
+    # El catálogo se sincroniza por cambios: cada refresco solo pide los torneos modificados
+    if catalogo is not None:
+        catalogo.sincronizar()
+    else:
+        cargar_tabla_campeones(MUNDIALES, refrescar=refrescar)
+
+
+def _precargar_clubes(refrescar):
+    cargar_indice_clubes([info["uri"] for info in EQUIPOS.values()], refrescar=refrescar)
+
+
+def _precargar_historias(refrescar):
+    for resultado in consultar_lote(todas_las_consultas(), refrescar=refrescar):
+        if isinstance(resultado, Exception):
+            raise resultado
+
+
+def _ttl_historias():
+    return min(cache.ttl(endpoint) for _, endpoint, _ in todas_las_consultas())
+
+
+# Tareas: nombre -> (función(refrescar), TTL en segundos de los datos que mantiene)
+TAREAS = {
+    "campeones": (_precargar_campeones, lambda: cache.ttl(WIKIDATA_ENDPOINT)),
+    "clubes": (_precargar_clubes, lambda: cache.ttl(WIKIDATA_ENDPOINT)),
+    "historias": (_precargar_historias, _ttl_historias),
+}
+
+
+class Precarga:
+    """Planificador de tareas periódicas con jitter, reintentos y un límite de concurrencia.
+
+    La primera ejecución de cada tarea aprovecha lo que ya esté en caché; las
+    siguientes fuerzan la consulta (`refrescar=True`) para renovar los datos
+    antes de que caduquen.
+    """
+
+    def __init__(self, tareas=TAREAS, intervalo=INTERVALO, jitter=JITTER, hilos=MAX_HILOS, rng=random):
+        self.tareas = tareas
+        self.intervalo = intervalo
+        self.jitter = jitter
+        self.hilos = hilos
+        self.rng = rng
+        self.estado = {
+            nombre: {"ejecuciones": 0, "fallos": 0, "ultima": None, "proxima": None, "error": None}
+            for nombre in tareas
+        }
+        self._agenda = []  # montículo de (instante, nombre)
+        self._condicion = threading.Condition()
+        self._detenida = False
+        self._hilo = None
+        self._pool = None
+
+    def _intervalo(self, nombre):
+        intervalo = self.intervalo or self.tareas[nombre][1]() * FRACCION_TTL
+        return intervalo * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _programar(self, nombre, espera):
+        with self._condicion:
+            self.estado[nombre]["proxima"] = time.time() + espera
+            heapq.heappush(self._agenda, (time.monotonic() + espera, nombre))
+            self._condicion.notify()
+
+    def _ejecutar(self, nombre):
+        estado = self.estado[nombre]
+        funcion = self.tareas[nombre][0]
+        try:
+            funcion(refrescar=estado["ejecuciones"] > 0)
+        except Exception as e:
+            estado["fallos"] += 1
+            estado["error"] = str(e)
+            espera = min(REINTENTO_INICIAL * 2 ** (estado["fallos"] - 1), self._intervalo(nombre))
+        else:
+            estado["ejecuciones"] += 1
+            estado["fallos"] = 0
+            estado["error"] = None
+            estado["ultima"] = time.time()
+            espera = self._intervalo(nombre)
+        if not self._detenida:
+            self._programar(nombre, espera)
+
+    def _bucle(self):
+        while True:
+            with self._condicion:
+                while not self._detenida and (not self._agenda or self._agenda[0][0] > time.monotonic()):
+                    self._condicion.wait(self._agenda[0][0] - time.monotonic() if self._agenda else None)
+                if self._detenida:
+                    return
+                _, nombre = heapq.heappop(self._agenda)
+                self.estado[nombre]["proxima"] = None
+            self._pool.submit(self._ejecutar, nombre)
+
+    def iniciar(self):
+        """Arranca el planificador en un hilo daemon y lanza todas las tareas de inmediato"""
+        self._pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="precarga")
+        for nombre in self.tareas:
+            self._programar(nombre, 0)
+        self._hilo = threading.Thread(target=self._bucle, name="precarga", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el planificador; las tareas en curso terminan pero no se reprograman"""
+        with self._condicion:
+            self._detenida = True
+            self._condicion.notify()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+
+_precarga = None
+_lock = threading.Lock()
+
+
+def iniciar_precarga():
+    """Arranca la precarga una sola vez por proceso (salvo con FUTBOL_PRECARGA=0) y la devuelve"""
+    global _precarga
+    if not ACTIVA:
+        return None
+    with _lock:
+        if _precarga is None:
+            _precarga = Precarga()
+            _precarga.iniciar()
+        return _precarga
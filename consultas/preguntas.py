@@ -0,0 +1,98 @@
+"""Colas de preguntas ya preparadas para los dos quizzes.
+
+Cada sesión guarda una `ColaPreguntas` por quiz: pedir la siguiente pregunta es
+sacar un elemento de un buffer circular, y un hilo en segundo plano lo vuelve a
+llenar después de cada consumo. Solo cuando la cola está vacía (la primera
+pregunta de la sesión) la app genera la pregunta en el momento.
+"""
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .catalogo import tabla_campeones
+from .clubes import cargar_indice_clubes
+from .imagenes import miniatura
+from .pares import almacen, par_desde_indice
+
+# Preguntas preparadas por cola (0 desactiva la preparación en segundo plano)
+CAPACIDAD = int(os.environ.get("FUTBOL_COLA_PREGUNTAS", 3))
+MAX_HILOS = 2
+
+_pool = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix="preguntas")
+
+
+class ColaPreguntas:
+    """Buffer circular de preguntas que se rellena en segundo plano.
+
+    `generar` no recibe argumentos y devuelve una pregunta o None si no hay datos;
+    se ejecuta fuera del script de Streamlit, así que no debe usar `st`.
+    """
+
+    def __init__(self, generar, capacidad=CAPACIDAD):
+        self.generar = generar
+        self.capacidad = capacidad
+        self.error = None  # último error al rellenar, para diagnóstico
+        self._preguntas = deque(maxlen=capacidad)
+        self._rellenando = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._preguntas)
+
+    def siguiente(self):
+        """Saca la siguiente pregunta preparada, o None si no hay ninguna; nunca espera a la red"""
+        with self._lock:
+            pregunta = self._preguntas.popleft() if self._preguntas else None
+        self.rellenar()
+        return pregunta
+
+    def rellenar(self):
+        """Lanza el relleno en segundo plano si la cola no está llena y no se está rellenando ya"""
+        with self._lock:
+            if self._rellenando or len(self._preguntas) >= self.capacidad:
+                return
+            self._rellenando = True
+        _pool.submit(self._rellenar)
+
+    def _rellenar(self):
+        try:
+            while len(self._preguntas) < self.capacidad:
+                pregunta = self.generar()
+                if pregunta is None:
+                    break
+                with self._lock:
+                    self._preguntas.append(pregunta)
+            self.error = None
+        except Exception as e:
+            self.error = e
+        finally:
+            with self._lock:
+                self._rellenando = False
+
+
+def pregunta_mundial(rng=random):
+    """Pregunta del quiz de Mundiales (todos los del catálogo): (año, respuesta correcta, opciones barajadas) o None"""
+    return tabla_campeones().pregunta(rng=rng)
+
+
+def pregunta_clubes(indice, equipos, rng=random):
+    """Sortea un par de clubes con jugadores en común y lo deja en el almacén compartido.
+
+    Devuelve el `Par` (ver consultas.pares), o None si el índice no tiene ningún par.
+    """
+    par = indice.sortear_par(rng)
+    if par is None:
+        return None
+    return almacen.guardar(par_desde_indice(indice, *par, equipos))
+
+
+def preparar_pregunta_clubes(equipos, rng=random):
+    """Id de un par listo para mostrarse: construido desde el índice compartido y con los logos reducidos"""
+    par = pregunta_clubes(cargar_indice_clubes([info["uri"] for info in equipos.values()]), equipos, rng)
+    if par is None:
+        return None
+    miniatura(equipos[par.club1]["logo"], 150)
+    miniatura(equipos[par.club2]["logo"], 150)
+    return par.id
@@ -0,0 +1,220 @@
+"""Limitador de tasa y circuit breaker por endpoint para las consultas remotas."""
+import random
+import socket
+import threading
+import time
+from concurrent.futures import CancelledError
+from email.utils import parsedate_to_datetime
+from urllib.error import HTTPError, URLError
+
+from .endpoints import DBPEDIA_ENDPOINT, DBPEDIA_ES_ENDPOINT, WIKIDATA_ENDPOINT
+
+# Peticiones por segundo y ráfaga máxima por endpoint
+TASA_POR_DEFECTO = (5.0, 10)
+TASAS_POR_ENDPOINT = {
+    WIKIDATA_ENDPOINT: (5.0, 10),
+    DBPEDIA_ENDPOINT: (10.0, 20),
+    DBPEDIA_ES_ENDPOINT: (5.0, 10),
+}
+
+MAX_REINTENTOS = 3
+ESPERA_BASE = 0.5    # segundos; se duplica en cada reintento
+ESPERA_MAXIMA = 8.0
+# Más allá de esta espera (p. ej. un Retry-After largo) se falla en lugar de bloquear la página
+MAX_ESPERA_TOKEN = 10.0
+
+FALLOS_PARA_ABRIR = 5
+SEGUNDOS_ABIERTO = 30.0
+
+
+class LimiteExcedido(Exception):
+    """El endpoint pidió esperar más de lo que la app está dispuesta a bloquear"""
+
+
+class CircuitoAbierto(Exception):
+    """El endpoint ha fallado repetidamente y no se intenta hasta la próxima prueba"""
+
+
+class CuboTokens:
+    """Token bucket que además respeta los Retry-After del servidor"""
+
+    def __init__(self, tasa, capacidad):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self._tokens = float(capacidad)
+        self._actualizado = time.monotonic()
+        self._bloqueado_hasta = 0.0
+        self._lock = threading.Lock()
+
+    def bloquear(self, segundos):
+        with self._lock:
+            self._bloqueado_hasta = max(self._bloqueado_hasta, time.monotonic() + segundos)
+
+    def adquirir(self, max_espera=MAX_ESPERA_TOKEN, cancelado=None):
+        """Consume un token esperando lo necesario; lanza LimiteExcedido si la espera supera `max_espera`.
+
+        Si se activa el evento `cancelado` durante la espera, lanza CancelledError.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            self._tokens = min(self.capacidad, self._tokens + (ahora - self._actualizado) * self.tasa)
+            self._actualizado = ahora
+            espera = max(0.0, self._bloqueado_hasta - ahora)
+            if self._tokens < 1:
+                espera = max(espera, (1 - self._tokens) / self.tasa)
+            if espera > max_espera:
+                raise LimiteExcedido(f"límite de peticiones: habría que esperar {espera:.0f} s")
+            # El token se reserva ya para que los demás hilos esperen su turno
+            self._tokens -= 1
+        if espera > 0 and _dormir(espera, cancelado):
+            raise CancelledError()
+
+
+class Circuito:
+    """Circuit breaker: cerrado -> abierto tras N fallos -> semiabierto tras un tiempo"""
+
+    def __init__(self, fallos_para_abrir=FALLOS_PARA_ABRIR, segundos_abierto=SEGUNDOS_ABIERTO):
+        self.fallos_para_abrir = fallos_para_abrir
+        self.segundos_abierto = segundos_abierto
+        self.estado = "cerrado"
+        self._fallos = 0
+        self._abierto_hasta = 0.0
+        self._sonda_en_curso = False
+        self._lock = threading.Lock()
+
+    def permitir(self, endpoint):
+        with self._lock:
+            if self.estado == "cerrado":
+                return
+            restante = self._abierto_hasta - time.monotonic()
+            if self.estado == "abierto" and restante <= 0:
+                self.estado = "semiabierto"
+            if self.estado == "semiabierto" and not self._sonda_en_curso:
+                self._sonda_en_curso = True  # solo una petición de prueba a la vez
+                return
+            raise CircuitoAbierto(
+                f"{endpoint} no está disponible temporalmente; se reintentará en {max(restante, 0):.0f} s"
+            )
+
+    def exito(self):
+        with self._lock:
+            self.estado = "cerrado"
+            self._fallos = 0
+            self._sonda_en_curso = False
+
+    def fallo(self):
+        with self._lock:
+            self._fallos += 1
+            if self.estado == "semiabierto" or self._fallos >= self.fallos_para_abrir:
+                self.estado = "abierto"
+                self._abierto_hasta = time.monotonic() + self.segundos_abierto
+            self._sonda_en_curso = False
+
+    def liberar(self):
+        """Libera la sonda tras un error que no dice nada de la salud del endpoint"""
+        with self._lock:
+            self._sonda_en_curso = False
+
+
+def _dormir(segundos, cancelado=None):
+    """Espera `segundos`, o menos si se activa `cancelado`; devuelve si se canceló"""
+    if cancelado is None:
+        time.sleep(segundos)
+        return False
+    return cancelado.wait(segundos)
+
+
+_cubos = {}
+_circuitos = {}
+_lock = threading.Lock()
+
+
+def cubo(endpoint):
+    with _lock:
+        if endpoint not in _cubos:
+            _cubos[endpoint] = CuboTokens(*TASAS_POR_ENDPOINT.get(endpoint, TASA_POR_DEFECTO))
+        return _cubos[endpoint]
+
+
+def circuito(endpoint):
+    with _lock:
+        if endpoint not in _circuitos:
+            _circuitos[endpoint] = Circuito()
+        return _circuitos[endpoint]
+
+
+def retry_after(error):
+    """Segundos indicados en la cabecera Retry-After de un HTTPError, o None"""
+    valor = error.headers.get("Retry-After") if getattr(error, "headers", None) else None
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def es_timeout(error):
+    """La petición agotó el timeout de `cliente` (directamente o envuelto en un URLError)"""
+    if isinstance(error, URLError) and not isinstance(error, HTTPError):
+        error = error.reason
+    return isinstance(error, (socket.timeout, TimeoutError))
+
+
+def es_reintentable(error):
+    """429, errores 5xx, timeouts y fallos de red se reintentan; una query mal formada no"""
+    if isinstance(error, HTTPError):
+        return error.code == 429 or error.code >= 500
+    if isinstance(error, (URLError, socket.timeout, TimeoutError, ConnectionError)):
+        return True
+    # SPARQLWrapper convierte los 500 en EndPointInternalError
+    return type(error).__name__ == "EndPointInternalError"
+
+
+def _reintentar(limite, funcion, cancelado=None):
+    """`funcion()` respetando el límite de tasa, con backoff exponencial acotado entre intentos"""
+    for intento in range(MAX_REINTENTOS + 1):
+        if cancelado is not None and cancelado.is_set():
+            raise CancelledError()
+        limite.adquirir(cancelado=cancelado)
+        try:
+            return funcion()
+        except Exception as e:
+            # Un timeout ya costó TIMEOUT segundos: reintentarlo multiplicaría la espera antes del respaldo caducado
+            if not es_reintentable(e) or es_timeout(e):
+                raise
+            espera = retry_after(e)
+            if espera is not None:
+                limite.bloquear(espera)
+            if intento == MAX_REINTENTOS or (cancelado is not None and cancelado.is_set()):
+                raise
+            # Con Retry-After la espera la impone el cubo en el siguiente intento
+            if espera is None and _dormir(random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** intento)), cancelado):
+                raise
+
+
+def proteger(endpoint, funcion, cancelado=None):
+    """Ejecuta `funcion()` respetando el límite de tasa y el circuito del endpoint.
+
+    Los errores transitorios se reintentan con backoff exponencial acotado; los
+    timeouts no. El circuito se consulta una vez por llamada y cuenta un solo
+    fallo por llamada, tras el último intento. Si se activa el evento `cancelado`
+    (p. ej. otra petición de respaldo ya ganó) no se vuelve a intentar: se
+    propaga el último error, o CancelledError si no lo hay.
+    """
+    breaker = circuito(endpoint)
+    breaker.permitir(endpoint)
+    try:
+        resultado = _reintentar(cubo(endpoint), funcion, cancelado)
+    except Exception as e:
+        if es_reintentable(e):
+            breaker.fallo()
+        else:
+            # Límite de tasa, cancelación o query mal formada: no dicen nada de la salud del endpoint
+            breaker.liberar()
+        raise
+    breaker.exito()
+    return resultado
@@ -0,0 +1,160 @@
+"""Peticiones de respaldo (hedging) entre un endpoint y sus espejos equivalentes.
+
+Si el endpoint principal no ha respondido en un retraso adaptativo (el p95 de las
+latencias recientes del grupo), se lanza la misma consulta contra el siguiente
+espejo y se devuelve la primera respuesta válida. La petición perdedora se
+cancela si aún no había empezado; si ya está en curso no se puede interrumpir,
+así que su resultado se descarta y la acota el timeout de `cliente`, pero ya no
+se reintenta. Cada endpoint tiene su propio pool de hilos: las perdedoras que
+siguen esperando a un endpoint lento no retrasan los respaldos a los demás.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .endpoints import ESPEJOS
+
+# Latencias recientes con las que se estima el p95
+MUESTRAS = 200
+# Hasta tener estas muestras se usa el retraso inicial
+MIN_MUESTRAS = 20
+RETRASO_INICIAL = 1.0
+RETRASO_MINIMO = 0.05
+PERCENTIL = 0.95
+# Hilos por endpoint
+MAX_HILOS = 8
+
+_pools = {}  # endpoint -> ThreadPoolExecutor
+_lock_pools = threading.Lock()
+
+
+def _pool(endpoint):
+    with _lock_pools:
+        if endpoint not in _pools:
+            _pools[endpoint] = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix="respaldo")
+        return _pools[endpoint]
+
+
+class RespuestaInvalida(Exception):
+    """El endpoint respondió algo que no es un resultado SPARQL"""
+
+
+def es_valida(resultado):
+    return isinstance(resultado, dict) and ("results" in resultado or "boolean" in resultado)
+
+
+class GrupoEndpoints:
+    """Un endpoint principal y sus espejos, con el retraso de respaldo adaptado a sus latencias"""
+
+    def __init__(self, principal, espejos, retraso_maximo=None):
+        self.endpoints = [principal, *espejos]
+        self.retraso_maximo = retraso_maximo
+        self.peticiones = 0
+        self.respaldos = 0
+        self.ganadas_por_respaldo = 0
+        self._latencias = deque(maxlen=MUESTRAS)
+        self._lock = threading.Lock()
+
+    def retraso(self):
+        """Segundos que se espera al principal antes de lanzar el respaldo"""
+        with self._lock:
+            latencias = sorted(self._latencias)
+        if len(latencias) < MIN_MUESTRAS:
+            retraso = RETRASO_INICIAL
+        else:
+            retraso = max(RETRASO_MINIMO, latencias[int(PERCENTIL * (len(latencias) - 1))])
+        return min(retraso, self.retraso_maximo) if self.retraso_maximo else retraso
+
+    def _medir(self, funcion, endpoint, cancelado):
+        inicio = time.monotonic()
+        resultado = funcion(endpoint, cancelado)
+        if not es_valida(resultado):
+            raise RespuestaInvalida(f"{endpoint} devolvió una respuesta que no es un resultado SPARQL")
+        # También cuentan las perdedoras: sin ellas el p95 ignoraría justo la cola lenta
+        with self._lock:
+            self._latencias.append(time.monotonic() - inicio)
+        return resultado
+
+    def ejecutar(self, funcion):
+        """Devuelve la primera respuesta válida de `funcion(endpoint, cancelado)` entre el principal y los espejos.
+
+        Un fallo rápido pasa al siguiente endpoint sin esperar al retraso; si fallan
+        todos se propaga el último error. `cancelado` es un threading.Event que se
+        activa en cuanto hay ganadora, para que las demás dejen de reintentar.
+        """
+        with self._lock:
+            self.peticiones += 1
+        pendientes = {}
+        siguiente = 0
+        error = None
+        cancelado = threading.Event()
+
+        def lanzar():
+            nonlocal siguiente
+            endpoint = self.endpoints[siguiente]
+            pendientes[_pool(endpoint).submit(self._medir, funcion, endpoint, cancelado)] = siguiente
+            siguiente += 1
+
+        lanzar()
+        retraso = self.retraso()
+        try:
+            while pendientes:
+                quedan = siguiente < len(self.endpoints)
+                hechos, _ = wait(pendientes, timeout=retraso if quedan else None, return_when=FIRST_COMPLETED)
+                if not hechos:
+                    with self._lock:
+                        self.respaldos += 1
+                    lanzar()
+                    continue
+                for futuro in hechos:
+                    posicion = pendientes.pop(futuro)
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    if posicion > 0:
+                        with self._lock:
+                            self.ganadas_por_respaldo += 1
+                    return resultado
+                if quedan and not pendientes:
+                    lanzar()
+            raise error
+        finally:
+            cancelado.set()
+            for futuro in pendientes:
+                futuro.cancel()
+
+    def estadisticas(self):
+        retraso = self.retraso()
+        with self._lock:
+            return {
+                "endpoints": list(self.endpoints),
+                "peticiones": self.peticiones,
+                "respaldos": self.respaldos,
+                "ganadas_por_respaldo": self.ganadas_por_respaldo,
+                "muestras": len(self._latencias),
+                "retraso_s": round(retraso, 4),
+            }
+
+
+_grupos = {}
+_lock = threading.Lock()
+
+
+def grupo(endpoint, retraso_maximo=None):
+    """Grupo del endpoint si tiene espejos configurados (FUTBOL_*_ESPEJOS), o None"""
+    if not ESPEJOS.get(endpoint):
+        return None
+    with _lock:
+        if endpoint not in _grupos:
+            _grupos[endpoint] = GrupoEndpoints(endpoint, ESPEJOS[endpoint], retraso_maximo)
+        return _grupos[endpoint]
+
+
+def estadisticas():
+    """Estadísticas de cada grupo usado: {endpoint: {...}}"""
+    with _lock:
+        grupos = dict(_grupos)
+    return {endpoint: grupo.estadisticas() for endpoint, grupo in grupos.items()}
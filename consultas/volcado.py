@@ -0,0 +1,128 @@
+"""Genera el volcado N-Triples que usa el backend local.
+
+Uso: python -m consultas.volcado [datos/futbol.nt]
+"""
+import os
+import sys
+
+from SPARQLWrapper import SPARQLWrapper, TURTLE
+
+from .cliente import USER_AGENT, WIKIDATA_ENDPOINT
+from .clubes import CLUBES_POR_CONSULTA, uri_completa
+from .datos import COMPETICIONES, ENTIDADES_HISTORIAS, EQUIPOS, MUNDIALES, RECURSOS_DBPEDIA
+
+ETIQUETAS = """
+    OPTIONAL {{ {var} rdfs:label {etiqueta} . FILTER(LANG({etiqueta}) IN ("es", "en")) }}
+"""
+
+
+def construct_campeones():
+    values_clause = " ".join(f"wd:{qid}" for qid in MUNDIALES.values())
+    return f"""
+    CONSTRUCT {{ ?mundial wdt:P1346 ?winner . ?winner rdfs:label ?etiqueta . }} WHERE {{
+        VALUES ?mundial {{ {values_clause} }}
+        ?mundial wdt:P1346 ?winner .
+        {ETIQUETAS.format(var="?winner", etiqueta="?etiqueta")}
+    }}
+    """
+
+
+def construct_catalogo():
+    values_clause = " ".join(f"wd:{qid}" for qid in COMPETICIONES)
+    return f"""
+    CONSTRUCT {{
+        ?torneo wdt:P3450 ?competicion; schema:dateModified ?modificado; wdt:P580 ?inicio; wdt:P585 ?momento;
+                wdt:P1346 ?winner; rdfs:label ?etiqueta .
+        ?winner rdfs:label ?etiquetaWinner .
+    }} WHERE {{
+        VALUES ?competicion {{ {values_clause} }}
+        ?torneo wdt:P3450 ?competicion; schema:dateModified ?modificado .
+        OPTIONAL {{ ?torneo wdt:P580 ?inicio . }}
+        OPTIONAL {{ ?torneo wdt:P585 ?momento . }}
+        OPTIONAL {{ ?torneo wdt:P1346 ?winner . {ETIQUETAS.format(var="?winner", etiqueta="?etiquetaWinner")} }}
+        {ETIQUETAS.format(var="?torneo", etiqueta="?etiqueta")}
+    }}
+    """
+
+
+def construct_membresias(club_uris):
+    values_clause = " ".join(f"<{uri_completa(uri)}>" for uri in club_uris)
+    return f"""
+    CONSTRUCT {{
+        ?jugador wdt:P31 wd:Q5; wdt:P106 wd:Q937857; wdt:P54 ?club; p:P54 ?stmt;
+                 wdt:P18 ?imagen; rdfs:label ?etiqueta .
+        ?stmt ps:P54 ?club; pq:P580 ?inicio; pq:P582 ?fin; pq:P1350 ?partidos; pq:P1351 ?goles .
+    }} WHERE {{
+        VALUES ?club {{ {values_clause} }}
+        ?jugador p:P54 ?stmt .
+        ?stmt ps:P54 ?club .
+        ?jugador wdt:P31 wd:Q5; wdt:P106 wd:Q937857 .
+        OPTIONAL {{ ?stmt pq:P580 ?inicio . }}
+        OPTIONAL {{ ?stmt pq:P582 ?fin . }}
+        OPTIONAL {{ ?stmt pq:P1350 ?partidos . }}
+        OPTIONAL {{ ?stmt pq:P1351 ?goles . }}
+        OPTIONAL {{ ?jugador wdt:P18 ?imagen . }}
+        {ETIQUETAS.format(var="?jugador", etiqueta="?etiqueta")}
+    }}
+    """
+
+
+def construct_historias():
+    values_clause = " ".join(f"wd:{qid}" for qid in ENTIDADES_HISTORIAS)
+    return f"""
+    CONSTRUCT {{
+        ?item wdt:P18 ?image; wdt:P585 ?date; schema:description ?descripcion; rdfs:label ?etiqueta .
+    }} WHERE {{
+        VALUES ?item {{ {values_clause} }}
+        OPTIONAL {{ ?item wdt:P18 ?image . }}
+        OPTIONAL {{ ?item wdt:P585 ?date . }}
+        OPTIONAL {{ ?item schema:description ?descripcion . FILTER(LANG(?descripcion) IN ("es", "en")) }}
+        {ETIQUETAS.format(var="?item", etiqueta="?etiqueta")}
+    }}
+    """
+
+
+def construct_abstracts(recursos):
+    values_clause = " ".join(f"<{recurso}>" for recurso in recursos)
+    return f"""
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    CONSTRUCT {{ ?recurso dbo:abstract ?abstract . }} WHERE {{
+        VALUES ?recurso {{ {values_clause} }}
+        ?recurso dbo:abstract ?abstract . FILTER(LANG(?abstract) = "es")
+    }}
+    """
+
+
+def consultas_volcado():
+    """Pares (query CONSTRUCT, endpoint) que cubren todas las entidades de la app"""
+    clubes = [info["uri"] for info in EQUIPOS.values()]
+    pares = [
+        (construct_campeones(), WIKIDATA_ENDPOINT),
+        (construct_catalogo(), WIKIDATA_ENDPOINT),
+        (construct_historias(), WIKIDATA_ENDPOINT),
+    ]
+    for i in range(0, len(clubes), CLUBES_POR_CONSULTA):
+        pares.append((construct_membresias(clubes[i:i + CLUBES_POR_CONSULTA]), WIKIDATA_ENDPOINT))
+    for endpoint, recursos in RECURSOS_DBPEDIA.items():
+        pares.append((construct_abstracts(recursos), endpoint))
+    return pares
+
+
+def generar_volcado(salida):
+    from rdflib import Graph
+
+    grafo = Graph()
+    for query, endpoint in consultas_volcado():
+        sparql = SPARQLWrapper(endpoint)
+        sparql.setQuery(query)
+        sparql.setReturnFormat(TURTLE)
+        sparql.addCustomHttpHeader("User-Agent", USER_AGENT)
+        grafo.parse(data=sparql.query().convert(), format="turtle")
+    os.makedirs(os.path.dirname(salida) or ".", exist_ok=True)
+    grafo.serialize(salida, format="nt", encoding="utf-8")
+    return len(grafo)
+
+
+if __name__ == "__main__":
+    salida = sys.argv[1] if len(sys.argv) > 1 else "datos/futbol.nt"
+    print(f"{generar_volcado(salida)} tripletas guardadas en {salida}")
@@ -0,0 +1,5 @@
+"""Secciones de la app Fútbol Conectado.
+
+Cada módulo expone `mostrar()`; app.py los importa uno a uno al mostrarlos, de modo
+que el arranque solo carga lo que necesita la primera sección.
+"""
@@ -0,0 +1,57 @@
+"""Panel de administración: métricas de las consultas (?admin=1 o FUTBOL_ADMIN=1)."""
+import streamlit as st
+
+from consultas import (
+    almacen_resultados,
+    cache,
+    cache_etiquetas,
+    catalogo,
+    estadisticas_plazos,
+    estadisticas_respaldo,
+    registro_metricas,
+    vuelos,
+)
+
+
+def mostrar():
+    """Tabla por consulta con latencia, aciertos de caché y errores, más el estado de la caché"""
+    with st.expander("🛠️ Métricas de consultas SPARQL"):
+        series = registro_metricas.resumen()
+        if series:
+            st.dataframe([
+                {
+                    "Consulta": serie["etiqueta"],
+                    "Endpoint": serie["endpoint"],
+                    "Llamadas": serie["consultas"],
+                    "Media (s)": serie["media_s"],
+                    "p95 (s)": serie["p95_s"],
+                    "Aciertos caché": f"{serie['ratio_aciertos']:.0%}",
+                    "Bytes": serie["bytes"],
+                    "Filas": serie["filas"],
+                    "Errores": ", ".join(f"{clase}: {n}" for clase, n in serie["errores"].items()),
+                }
+                for serie in series
+            ], hide_index=True)
+        else:
+            st.caption("Todavía no se ha lanzado ninguna consulta.")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Caché de resultados**")
+            st.json(cache.estadisticas())
+        with col2:
+            st.markdown("**Consultas coalescidas**")
+            st.json(vuelos.estadisticas())
+        if almacen_resultados is not None:
+            st.markdown("**Almacén compartido en disco**")
+            st.json(almacen_resultados.estadisticas())
+        st.markdown("**Caché de etiquetas**")
+        st.json(cache_etiquetas.estadisticas())
+        st.markdown("**Respuestas con plazo**")
+        st.json(estadisticas_plazos())
+        grupos = estadisticas_respaldo()
+        if grupos:
+            st.markdown("**Peticiones de respaldo a espejos**")
+            st.json(grupos)
+        if catalogo is not None:
+            st.markdown("**Catálogo de torneos**")
+            st.json(catalogo.estadisticas())
@@ -0,0 +1,36 @@
+"""Sección 1: consulta del campeón de un Mundial."""
+import streamlit as st
+
+from consultas import Plazo, mundiales_disponibles
+
+from .comun import obtener_tabla_campeones
+
+
+def obtener_campeon(year, plazo=None):
+    """Obtiene el campeón de un Mundial específico desde la tabla de campeones"""
+    tabla = obtener_tabla_campeones(plazo)
+    return tabla.campeon(year) if tabla else None
+
+
+@st.fragment
+def seccion_campeon():
+    """Consulta del campeón de un Mundial (se reejecuta por separado del resto)"""
+    # Presupuesto de tiempo de esta ejecución de la sección
+    plazo = Plazo()
+    selected_year = st.selectbox("Año del Mundial", list(mundiales_disponibles()))
+
+    if st.button("Consultar Campeón", key="consultar_campeon"):
+        with st.spinner("Consultando datos..."):
+            campeon = obtener_campeon(selected_year, plazo)
+
+            if campeon:
+                st.success(f"🏆 El campeón del Mundial {selected_year} fue: **{campeon['label']}**")
+                st.info(f"🔗 URI: {campeon['uri']}")
+            else:
+                st.error("No se pudo obtener información del campeón.")
+
+
+def mostrar():
+    """Título de la sección y selector del Mundial"""
+    st.subheader("📅 Selecciona un Mundial")
+    seccion_campeon()
@@ -0,0 +1,288 @@
+"""Sección 3: juego de los dos clubes (¿quién jugó en ambos equipos?)."""
+import random
+
+import streamlit as st
+
+from consultas import (
+    EQUIPOS, ColaPreguntas, IndiceNombres, Par, Plazo, PlazoVencido, almacen_pares, cargar_indice_clubes,
+    ejecutar_con_plazo, id_par, imagen_miniatura, imagenes_miniaturas, indice_cargado, obtener_par,
+    par_desde_consulta, preparar_pregunta_clubes, pregunta_clubes,
+)
+
+from .comun import avisar, con_plazo, reejecutar_seccion
+
+# Diccionario con equipos y sus URIs de Wikidata
+equipos_wikidata = EQUIPOS
+
+
+def obtener_dos_equipos_distintos(equipos_dict):
+    """Devuelve dos equipos distintos al azar"""
+    return random.sample(list(equipos_dict.items()), 2)
+
+
+def obtener_indice_clubes(plazo=None):
+    """Respuesta con plazo con el índice jugador×club de todos los clubes configurados"""
+    club_uris = [info["uri"] for info in equipos_wikidata.values()]
+    return ejecutar_con_plazo(
+        lambda: cargar_indice_clubes(club_uris), plazo, lambda: indice_cargado(club_uris), "indice_clubes"
+    )
+
+
+def buscar_jugadores_en_ambos_clubes(plazo=None):
+    """Elige dos clubes con jugadores en común y devuelve el par del almacén compartido (o None si no llega a tiempo)"""
+    respuesta = obtener_indice_clubes(plazo)
+    indice = avisar(respuesta)
+    if isinstance(respuesta.error, PlazoVencido):
+        # El índice sigue cargándose en segundo plano: se usará en la próxima ejecución
+        return None
+    # La intersección se calcula en memoria: no hay consulta por par de clubes
+    par = pregunta_clubes(indice, equipos_wikidata) if indice else None
+    if par is None:
+        # Sin índice: una sola consulta agregada para el par elegido al azar
+        equipo1, equipo2 = obtener_dos_equipos_distintos(equipos_wikidata)
+        club1, club2 = equipo1[1]["uri"], equipo2[1]["uri"]
+        respuesta = ejecutar_con_plazo(
+            lambda: par_desde_consulta(club1, club2, equipos_wikidata), plazo,
+            lambda: almacen_pares.obtener(id_par(club1, club2)), f"par_{id_par(club1, club2)}",
+        )
+        par = avisar(respuesta)
+        if par is None:
+            # Si solo se agotó el plazo no se guarda un par vacío: la consulta sigue y se reintenta luego
+            if isinstance(respuesta.error, PlazoVencido):
+                return None
+            par = Par(id_par(club1, club2), equipo1[0], equipo2[0], [])
+        almacen_pares.guardar(par)
+    return par
+
+
+def formatear_periodo(start, end):
+    """Formatea el período de tiempo"""
+    if start and end:
+        return f"{start}-{end}"
+    elif start:
+        return f"{start}-?"
+    elif end:
+        return f"?-{end}"
+    else:
+        return "Período no disponible"
+
+
+def formatear_estadisticas(matches, goals):
+    """Formatea las estadísticas de partidos y goles"""
+    stats = []
+    if matches:
+        stats.append(f"{matches} partidos")
+    if goals:
+        stats.append(f"{goals} goles")
+    return " | ".join(stats) if stats else "Estadísticas no disponibles"
+
+
+def mostrar_info_jugador(nombre_jugador, info_jugador, nombre_equipo1, nombre_equipo2, imagen=None, plazo=None):
+    """Muestra la información detallada de un jugador (CarreraJugador) con imagen (miniatura servida por la app)"""
+    # Crear dos columnas: información a la izquierda, imagen a la derecha
+    col_info, col_imagen = st.columns([2, 1])
+
+    with col_info:
+        st.markdown(f"**{nombre_jugador}**")
+
+        # Información equipo 1
+        periodo1 = formatear_periodo(info_jugador.equipo1["start"], info_jugador.equipo1["end"])
+        stats1 = formatear_estadisticas(info_jugador.equipo1["matches"], info_jugador.equipo1["goals"])
+        st.markdown(f"  • **{nombre_equipo1}**: {periodo1}")
+        if stats1 != "Estadísticas no disponibles":
+            st.markdown(f"    └ {stats1}")
+
+        # Información equipo 2
+        periodo2 = formatear_periodo(info_jugador.equipo2["start"], info_jugador.equipo2["end"])
+        stats2 = formatear_estadisticas(info_jugador.equipo2["matches"], info_jugador.equipo2["goals"])
+        st.markdown(f"  • **{nombre_equipo2}**: {periodo2}")
+        if stats2 != "Estadísticas no disponibles":
+            st.markdown(f"    └ {stats2}")
+
+    with col_imagen:
+        if info_jugador.imagen:
+            try:
+                st.image(imagen or imagen_miniatura(info_jugador.imagen, 120, plazo), width=120)
+            except:
+                st.markdown(
+                    """
+                    <div style='display: flex; justify-content: center; align-items: center; height: 150px; background-color: #f0f0f0; border-radius: 10px;'>
+                        <span style='font-size: 40px;'>👤</span>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+        else:
+            st.markdown(
+                """
+                <div style='display: flex; justify-content: center; align-items: center; height: 150px; background-color: #f0f0f0; border-radius: 10px;'>
+                    <span style='font-size: 40px;'>👤</span>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+    st.markdown("---")
+
+
+def validar_respuesta_jugador(nombre_ingresado, jugadores_detallados, indice_nombres=None):
+    """Valida si el nombre ingresado está en la lista de respuestas correctas"""
+    if not nombre_ingresado or not jugadores_detallados:
+        return False, None
+
+    # Búsqueda insensible a tildes, con alias y tolerante a erratas
+    if indice_nombres is None:
+        indice_nombres = IndiceNombres((nombre, ()) for nombre in jugadores_detallados)
+
+    # Solo cuenta el nivel de coincidencia más fuerte, y sin ambigüedad con jugadores de un solo club
+    candidatos = indice_nombres.identificar(nombre_ingresado)
+    if candidatos and all(candidato in jugadores_detallados for candidato in candidatos):
+        return True, candidatos[0]
+
+    return False, None
+
+
+def generar_nueva_pregunta_jugador(plazo=None):
+    """Genera una nueva combinación de clubes"""
+    # Se toma de la cola de la sesión; solo si está vacía se busca aquí
+    par_id = st.session_state.cola_clubes.siguiente()
+    if par_id is None:
+        par = buscar_jugadores_en_ambos_clubes(plazo)
+        par_id = par.id if par is not None else None
+    st.session_state.par_clubes = par_id
+    st.session_state.jugadores_encontrados = []
+    st.session_state.intentos_jugador = 0
+    st.session_state.respuesta_correcta_jugador = False
+
+
+def obtener_par_actual(plazo=None):
+    """Par de la sesión, leído del almacén compartido (la sesión solo guarda su id)"""
+    par_id = st.session_state.par_clubes
+    if not par_id:
+        return None
+    return con_plazo(
+        lambda: obtener_par(par_id, equipos_wikidata), lambda: almacen_pares.obtener(par_id), f"par_{par_id}", plazo
+    )
+
+
+@st.fragment
+def seccion_clubes():
+    """Juego de los dos clubes (sus botones solo reejecutan esta sección)"""
+    # Presupuesto de tiempo de esta ejecución de la sección
+    plazo = Plazo()
+
+    # Generar primera combinación automáticamente
+    if not st.session_state.par_clubes:
+        with st.spinner("Buscando primera combinación de clubes..."):
+            generar_nueva_pregunta_jugador(plazo)
+
+    par_actual = obtener_par_actual(plazo)
+
+    # Mostrar interfaz del juego
+    if par_actual:
+        # Mostrar logos y nombres de los equipos (las miniaturas que no estén a tiempo se piden reducidas al servidor)
+        logo1, logo2 = imagenes_miniaturas(
+            [equipos_wikidata[par_actual.club1]["logo"], equipos_wikidata[par_actual.club2]["logo"]], 150, plazo
+        )
+        col1, col2 = st.columns(2)
+
+        with col1:
+            try:
+                st.image(logo1, width=150)
+            except:
+                st.write("🏆")  # Emoji como fallback si la imagen no carga
+            st.markdown(f"<h4 style='text-align: center;'>{par_actual.club1}</h4>", unsafe_allow_html=True)
+
+        with col2:
+            try:
+                st.image(logo2, width=150)
+            except:
+                st.write("🏆")  # Emoji como fallback si la imagen no carga
+            st.markdown(f"<h4 style='text-align: center;'>{par_actual.club2}</h4>", unsafe_allow_html=True)
+
+        st.markdown("---")
+        st.markdown("**❓ ¿Qué jugador ha jugado en ambos equipos?**")
+
+        # Campo de texto para respuesta
+        if not st.session_state.respuesta_correcta_jugador:
+            nombre_jugador = st.text_input(
+                "Ingresa el nombre del jugador:",
+                key=f"input_jugador_{par_actual.id}",
+                placeholder="Ej: Ronaldinho, David Beckham, etc."
+            )
+
+            # Sugerencias con jugadores de ambas plantillas (no solo las respuestas correctas)
+            if nombre_jugador:
+                sugerencias = par_actual.indice_nombres.sugerencias(nombre_jugador)
+                if sugerencias:
+                    st.caption("🔎 Sugerencias: " + " · ".join(sugerencias))
+
+            if st.button("✅ Verificar respuesta", key="verificar_jugador"):
+                if nombre_jugador:
+                    st.session_state.intentos_jugador += 1
+                    es_correcto, jugador_encontrado = validar_respuesta_jugador(
+                        nombre_jugador, par_actual.jugadores, par_actual.indice_nombres
+                    )
+
+                    if es_correcto:
+                        st.success(f"🎉 ¡Correcto! **{jugador_encontrado}** jugó en ambos equipos.")
+                        st.session_state.jugadores_encontrados.append(jugador_encontrado)
+                        st.session_state.respuesta_correcta_jugador = True
+
+                        # Mostrar información detallada del jugador encontrado
+                        st.markdown("### 📊 Información detallada:")
+                        mostrar_info_jugador(
+                            jugador_encontrado, 
+                            par_actual.jugadores[jugador_encontrado],
+                            par_actual.club1,
+                            par_actual.club2,
+                            plazo=plazo,
+                        )
+
+                        # Mostrar otros jugadores en un expander (desplegable)
+                        otros_jugadores = {k: v for k, v in par_actual.jugadores.items() if k != jugador_encontrado}
+                        if otros_jugadores:
+                            with st.expander(f"💡 Ver otros jugadores que también jugaron en ambos equipos ({len(otros_jugadores)} más)"):
+                                # Miniaturas descargadas en paralelo (las ya generadas salen del disco)
+                                imagenes = imagenes_miniaturas([info.imagen for info in otros_jugadores.values()], 120, plazo)
+                                for (nombre, info), imagen in zip(otros_jugadores.items(), imagenes):
+                                    mostrar_info_jugador(nombre, info, par_actual.club1, par_actual.club2, imagen)
+                    else:
+                        st.error("❌ Respuesta incorrecta. ¡Inténtalo de nuevo!")
+                else:
+                    st.warning("⚠️ Por favor, ingresa un nombre.")
+
+        # Mostrar estadísticas del intento actual
+        if st.session_state.intentos_jugador > 0:
+            if st.session_state.respuesta_correcta_jugador:
+                st.success(f"🏆 ¡Resuelto en {st.session_state.intentos_jugador} intento(s)!")
+            else:
+                st.info(f"📊 Intentos realizados: {st.session_state.intentos_jugador}")
+
+        # Verificar si no hay jugadores en común
+        if not par_actual.jugadores:
+            st.warning("⚠️ No se encontraron jugadores que hayan jugado en ambos equipos. Genera una nueva combinación.")
+
+    # Botón para nueva combinación
+    if st.button("🔁 Probar con otros clubes", key="nuevos_clubes"):
+        with st.spinner("Buscando nueva combinación..."):
+            generar_nueva_pregunta_jugador(plazo)
+            reejecutar_seccion()
+
+
+def mostrar():
+    """Título, estado inicial del juego en la sesión y el fragmento con el par de clubes"""
+    st.subheader("🔄 ¿Quién jugó en ambos equipos?")
+
+    # Inicializar estado del juego de jugadores: solo el id del par y el progreso de la sesión
+    if "par_clubes" not in st.session_state:
+        st.session_state.par_clubes = None
+        st.session_state.jugadores_encontrados = []
+        st.session_state.intentos_jugador = 0
+        st.session_state.respuesta_correcta_jugador = False
+
+    # Combinaciones de clubes preparadas en segundo plano para esta sesión
+    if "cola_clubes" not in st.session_state:
+        st.session_state.cola_clubes = ColaPreguntas(lambda: preparar_pregunta_clubes(equipos_wikidata))
+
+    seccion_clubes()
@@ -0,0 +1,82 @@
+"""Utilidades compartidas por las secciones: consultas con plazo, avisos de error y reejecución."""
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from consultas import (
+    PlazoVencido,
+    consultar_con_plazo,
+    consultar_por_llegada,
+    ejecutar_con_plazo,
+    tabla_campeones,
+    tabla_campeones_cargada,
+)
+
+AVISO_CADUCADO = "⏳ El servidor está tardando: se muestran los últimos datos disponibles."
+AVISO_SIN_DATOS = "⏳ El servidor está tardando y todavía no hay datos que mostrar. Vuelve a intentarlo en unos segundos."
+
+
+def avisar_caducado():
+    """Indica que lo mostrado son los últimos datos conocidos y no los actuales"""
+    st.caption(AVISO_CADUCADO)
+
+
+def avisar_error(error):
+    """Aviso de una consulta sin resultado: informativo si solo se agotó el plazo"""
+    if isinstance(error, PlazoVencido):
+        st.info(AVISO_SIN_DATOS)
+    else:
+        st.error(f"Error al ejecutar la consulta: {str(error)}")
+
+
+def avisar(respuesta):
+    """Resultado de una respuesta con plazo (o None), con el aviso que corresponda"""
+    if respuesta.error is not None:
+        avisar_error(respuesta.error)
+    elif respuesta.caducado:
+        avisar_caducado()
+    return respuesta.resultado
+
+
+def avisar_lote(respuestas):
+    """Avisos de varias respuestas con plazo: los de plazo agotado y caducidad, una sola vez"""
+    for respuesta in respuestas:
+        if respuesta.error is not None and not isinstance(respuesta.error, PlazoVencido):
+            avisar_error(respuesta.error)
+    if any(isinstance(respuesta.error, PlazoVencido) for respuesta in respuestas):
+        st.info(AVISO_SIN_DATOS)
+    if any(respuesta.caducado for respuesta in respuestas):
+        avisar_caducado()
+
+
+def run_query(query, endpoint, etiqueta=None, columnar=False, plazo=None):
+    """Ejecuta una consulta SPARQL (con caché compartida) y devuelve los resultados (JSON o DataFrame si columnar)"""
+    return avisar(consultar_con_plazo(query, endpoint, etiqueta, columnar, plazo=plazo))
+
+
+def run_queries(pares, plazo=None):
+    """Ejecuta en paralelo varias consultas (query, endpoint, etiqueta) y devuelve sus resultados en orden"""
+    resultados = [None] * len(pares)
+    respuestas = []
+    for posicion, respuesta in consultar_por_llegada(pares, plazo):
+        resultados[posicion] = respuesta.resultado
+        respuestas.append(respuesta)
+    avisar_lote(respuestas)
+    return resultados
+
+
+def con_plazo(funcion, anterior=None, clave=None, plazo=None):
+    """Resultado de `funcion()` con plazo (ver `consultas.ejecutar_con_plazo`), o None con aviso"""
+    return avisar(ejecutar_con_plazo(funcion, plazo, anterior, clave))
+
+
+def obtener_tabla_campeones(plazo=None):
+    """Obtiene la tabla en memoria con el campeón de cada Mundial (del catálogo, o con una sola consulta)"""
+    return con_plazo(tabla_campeones, tabla_campeones_cargada, "tabla_campeones", plazo)
+
+
+def reejecutar_seccion():
+    """Vuelve a ejecutar solo la sección (fragmento) actual, o toda la app si no es una ejecución de fragmento"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -0,0 +1,216 @@
+"""Sección 4: storytelling histórico con datos de Wikidata y DBpedia."""
+from datetime import datetime
+
+import streamlit as st
+
+from consultas import CONSULTAS_HISTORIAS, Plazo, PlazoVencido, consultar_por_llegada, miniatura
+
+from .comun import avisar_lote
+
+
+def formatear_fecha(valor):
+    """Fecha xsd:dateTime como '21 de November de 1973' (sin cargar pandas para ello)"""
+    return datetime.fromisoformat(valor.replace("Z", "+00:00")).strftime('%d de %B de %Y')
+
+
+def imagen_historia(url, plazo=None):
+    """Miniatura de una imagen de las historias (columna estrecha), o la URL si no se genera dentro de `plazo`.
+
+    Sin `plazo` no se espera: solo sirve la miniatura si ya está en disco y, si no, la encarga.
+    """
+    return miniatura(url, 320, plazo, esperar=plazo is not None) or url
+
+
+def datos_historia_1986(resultados):
+    """Datos de la historia Argentina vs. Inglaterra (1986) con los resultados de sus consultas (None si faltan)"""
+    falklands_result, match_abstract_result, story_results_1986 = resultados
+
+    datos = {"falklands": None, "partido": None, "goles": None}
+    if falklands_result and falklands_result["results"]["bindings"]:
+        datos["falklands"] = falklands_result["results"]["bindings"][0]["abstract"]["value"]
+    if match_abstract_result and match_abstract_result["results"]["bindings"]:
+        datos["partido"] = match_abstract_result["results"]["bindings"][0]["abstract"]["value"]
+    if story_results_1986 and story_results_1986["results"]["bindings"]:
+        datos["goles"] = {r['item']['value'].split('/')[-1]: r for r in story_results_1986["results"]["bindings"]}
+    return datos
+
+
+def mostrar_historia_1986(datos, cargando=False, plazo=None):
+    """Muestra la historia Argentina vs. Inglaterra (1986); con `cargando` no avisa de lo que falta"""
+    st.markdown("#### Un Partido, Dos Naciones y la Historia")
+    if datos["falklands"]:
+        st.info(f"**Contexto - La Guerra de las Malvinas (1982):**\n\n" + datos["falklands"])
+    if datos["partido"]:
+        st.success("**El Partido - Una Revancha Simbólica:**\n\n" + datos["partido"])
+
+    story_data_1986 = datos["goles"]
+    if story_data_1986:
+        st.markdown("**Los Momentos Inolvidables:**")
+        col1, col2 = st.columns(2)
+
+        # La Mano de Dios
+        if "Q622495" in story_data_1986:
+            with col1:
+                st.markdown("##### 🖐️ 'La Mano de Dios'")
+                st.write(story_data_1986["Q622495"].get("itemDescription", {}).get("value"))
+                if "image" in story_data_1986["Q622495"]:
+                    st.image(imagen_historia(story_data_1986["Q622495"]["image"]["value"], plazo), caption="https://www.youtube.com/watch?v=p-QOLsypsnQ")
+
+        # El Gol del Siglo
+        if "Q1363790" in story_data_1986:
+            with col2:
+                st.markdown("##### 🏃 'El Gol del Siglo'")
+                st.write(story_data_1986["Q1363790"].get("itemDescription", {}).get("value"))
+                if "image" in story_data_1986["Q1363790"]:
+                    st.image(imagen_historia(story_data_1986["Q1363790"]["image"]["value"], plazo), caption="https://www.youtube.com/watch?v=IoA0YaCA2Yk")
+    elif not cargando:
+        st.error("No se pudieron cargar los detalles de los goles desde Wikidata.")
+    st.markdown("Puedes leer más sobre este partido en [Wikipedia](https://es.wikipedia.org/wiki/Argentina_vs._Inglaterra_(1986)).")
+
+
+def datos_historia_drogba(resultados):
+    """Datos de la historia de Drogba y Costa de Marfil con los resultados de sus consultas (None si faltan)"""
+    civil_war_result, drogba_story_results = resultados
+
+    datos = {"guerra": None, "imagen": None, "fecha": "2007"}
+    if civil_war_result and civil_war_result["results"]["bindings"]:
+        datos["guerra"] = civil_war_result["results"]["bindings"][0]["abstract"]["value"]
+    if drogba_story_results and drogba_story_results["results"]["bindings"]:
+        for r in drogba_story_results["results"]["bindings"]:
+            if "Q48892" in r["item"]["value"] and "image" in r:
+                datos["imagen"] = r["image"]["value"]
+            if "Q4610331" in r["item"]["value"] and "date" in r:
+                datos["fecha"] = formatear_fecha(r["date"]["value"])
+    return datos
+
+
+def mostrar_historia_drogba(datos, cargando=False, plazo=None):
+    """Muestra la historia de Drogba y la paz en Costa de Marfil; con `cargando` no avisa de lo que falta"""
+    st.markdown("#### El Gol que Detuvo una Guerra Civil")
+    if datos["guerra"]:
+        st.info(f"**Contexto - La Primera Guerra Civil de Costa de Marfil:**\n\n" + datos["guerra"])
+    elif not cargando:
+        st.warning("No se pudo cargar el contexto histórico desde DBpedia.")
+
+    # 3. Narrativa
+    st.success("**El Llamado a la Paz:**\n\nTras clasificar a Costa de Marfil para su primer Mundial en 2006, el capitán Didier Drogba, en lugar de celebrar, se arrodilló frente a las cámaras y suplicó a sus compatriotas que depusieran las armas. Su apasionado discurso tuvo un impacto inmediato, ayudando a catalizar un alto el fuego.")
+
+    col1, col2 = st.columns([1, 2])
+    if datos["imagen"]:
+        with col1:
+            st.image(imagen_historia(datos["imagen"], plazo), caption="Didier Drogba, líder dentro y fuera del campo. \n Discurso: https://www.youtube.com/watch?v=KAW7DF1Ufek")
+
+    with col2:
+         st.markdown("**El Partido de la Unificación:**")
+         st.write(f"Pero el gesto más poderoso llegaría después. Drogba insistió en que el partido de clasificación para la Copa Africana de Naciones contra Madagascar, a jugarse el **{datos['fecha']}**, no se celebrara en la capital, sino en Bouaké, el corazón del territorio rebelde. El gobierno aceptó.")
+         st.write("Jugar ese partido en Bouaké fue un acto simbólico de unidad sin precedentes. Demostró que el fútbol podía unir a una nación dividida, logrando lo que la política no había podido.")
+
+    st.markdown("---")
+    st.markdown("Este episodio es recordado como uno de los mayores ejemplos del poder del deporte para inspirar la paz y la reconciliación. Puedes leer más al respecto en [este artículo de la BBC](https://www.bbc.com/sport/football/52251219).")
+
+
+def datos_historia_chile(resultados):
+    """Datos de la historia de Chile y el 'Partido Fantasma' con los resultados de sus consultas (None si faltan)"""
+    coup_result, chile_story_results = resultados
+
+    datos = {"golpe": None, "imagen": None, "fecha": "Noviembre de 1973"}
+    if coup_result and coup_result["results"]["bindings"]:
+        datos["golpe"] = coup_result["results"]["bindings"][0]["abstract"]["value"]
+    if chile_story_results and chile_story_results["results"]["bindings"]:
+        for r in chile_story_results["results"]["bindings"]:
+            if "Q856670" in r["item"]["value"] and "image" in r: datos["imagen"] = r["image"]["value"]
+            if "Q1987588" in r["item"]["value"] and "date" in r: datos["fecha"] = formatear_fecha(r["date"]["value"])
+    return datos
+
+
+def mostrar_historia_chile(datos, cargando=False, plazo=None):
+    """Muestra la historia del Estadio Nacional y el 'Partido Fantasma'"""
+    st.markdown("#### El Estadio de la Memoria y el 'Partido Fantasma'")
+    if datos["golpe"]:
+        st.info(f"**Contexto - Golpe de Estado en Chile (1973):**\n\n" + datos["golpe"])
+
+    # 3. Narrativa
+    st.error("**El Estadio como Centro de Detención:** Tras el golpe, el Estadio Nacional fue utilizado como el mayor centro de detención, tortura y ejecución de prisioneros políticos de la dictadura de Pinochet.")
+
+    col1, col2 = st.columns([1, 2])
+    if datos["imagen"]:
+        with col1: st.image(imagen_historia(datos["imagen"], plazo), caption="Bombardeo de *La Moneda* en 1973.")
+
+    with col2:
+        st.markdown(f"**El Partido de la Vergüenza ({datos['fecha']}):**")
+        st.write("Pese a las denuncias internacionales, la FIFA obligó a jugar el repechaje para el Mundial de 1974 contra la URSS en ese mismo estadio. La Unión Soviética se negó a presentarse en un 'campo de concentración'.")
+        st.write("El equipo chileno salió a la cancha, y en un acto surrealista, marcó un gol sin rival ([ver video](https://www.youtube.com/watch?v=KvMi0cXaZDI)). Chile clasificó al Mundial, pero el partido quedó en la historia como un símbolo de la instrumentalización del fútbol por un régimen represivo y la tensión geopolítica de la Guerra Fría.")
+
+    st.success("Hoy, partes del estadio son un memorial para recordar a las víctimas y asegurar que la historia no se repita, mezclando para siempre el deporte con la lucha por los derechos humanos.")
+
+
+# Historias disponibles: título -> (consultas, datos, mostrar, mensaje del spinner)
+historias = {
+    "Argentina vs. Inglaterra (1986)": ("1986", datos_historia_1986, mostrar_historia_1986, "Cargando historia de 1986..."),
+    "Drogba y la Paz en Costa de Marfil": ("drogba", datos_historia_drogba, mostrar_historia_drogba, "Cargando historia de Drogba..."),
+    "Chile y el 'Partido Fantasma' (1973)": ("chile", datos_historia_chile, mostrar_historia_chile, "Cargando historia de Chile '73..."),
+}
+
+
+def cargar_historia(clave, datos_historia, mostrar_historia, plazo=None):
+    """Muestra la historia a medida que llegan sus consultas y devuelve (datos, completa).
+
+    Cada resultado que llega vuelve a dibujar la historia con lo que ya hay. Es
+    completa si todas las consultas respondieron a tiempo y sin errores. Las
+    consultas y las miniaturas comparten `plazo`.
+    """
+    plazo = plazo or Plazo()
+    pares = CONSULTAS_HISTORIAS[clave]
+    resultados = [None] * len(pares)
+    respuestas = []
+    contenedor = st.empty()
+    for posicion, respuesta in consultar_por_llegada(pares, plazo):
+        resultados[posicion] = respuesta.resultado
+        respuestas.append(respuesta)
+        datos = datos_historia(resultados)
+        # Lo que no llegó a tiempo sigue cargándose: no se avisa de que falta
+        intermedio = len(respuestas) < len(pares)
+        cargando = intermedio or any(isinstance(r.error, PlazoVencido) for r in respuestas)
+        with contenedor.container():
+            # Los dibujos intermedios no esperan a las miniaturas: solo el último las espera dentro del plazo
+            mostrar_historia(datos, cargando=cargando, plazo=None if intermedio else plazo)
+    avisar_lote(respuestas)
+    return datos, all(r.error is None and not r.caducado for r in respuestas)
+
+
+@st.fragment
+def seccion_historias():
+    """Selector y contenido de las historias (una elección solo reejecuta esta sección)"""
+    historia_elegida = st.radio(
+        "Elige una historia:",
+        list(historias.keys()),
+        index=None,
+        horizontal=True,
+        key="historia_elegida"
+    )
+
+    if historia_elegida is None:
+        st.caption("👆 Selecciona una historia para cargarla.")
+    else:
+        clave, datos_historia, mostrar_historia, mensaje = historias[historia_elegida]
+        plazo = Plazo()
+        datos = st.session_state.historias_cargadas.get(historia_elegida)
+        if datos is not None:
+            mostrar_historia(datos, plazo=plazo)
+        else:
+            with st.spinner(mensaje):
+                datos, completa = cargar_historia(clave, datos_historia, mostrar_historia, plazo)
+            # Si alguna consulta falló o llegó caducada, se reintenta en la próxima ejecución
+            if completa:
+                st.session_state.historias_cargadas[historia_elegida] = datos
+
+
+def mostrar():
+    """Título, historias ya cargadas en la sesión y el fragmento con la historia elegida"""
+    st.subheader("📖 Storytelling: Cuando el Fútbol es más que un Juego")
+
+    # Datos ya cargados por historia: solo se consulta la historia elegida, una vez por sesión
+    if "historias_cargadas" not in st.session_state:
+        st.session_state.historias_cargadas = {}
+
+    seccion_historias()
@@ -0,0 +1,114 @@
+"""Sección 2: quiz de Mundiales."""
+import streamlit as st
+
+from consultas import ColaPreguntas, Plazo, pregunta_mundial
+
+from .comun import obtener_tabla_campeones, reejecutar_seccion
+
+
+def generar_nueva_pregunta(plazo=None):
+    """Genera una nueva pregunta de quiz con un año aleatorio"""
+    # Se toma de la cola de la sesión; solo si está vacía se genera aquí desde la tabla en memoria
+    pregunta = st.session_state.cola_quiz.siguiente()
+    if pregunta is None:
+        tabla = obtener_tabla_campeones(plazo)
+        pregunta = tabla.pregunta() if tabla else None
+    if pregunta is None:
+        return False
+    quiz_year, correct_answer, all_options = pregunta
+
+    # Guardar en session state
+    st.session_state.quiz_opciones = all_options
+    st.session_state.quiz_respuesta_correcta = correct_answer
+    st.session_state.quiz_year = quiz_year
+    st.session_state.quiz_generado = True
+    st.session_state.pregunta_respondida = False
+    st.session_state.respuesta_usuario = None
+    st.session_state.respuesta_correcta_final = False
+    return True
+
+
+@st.fragment
+def seccion_quiz():
+    """Quiz de Mundiales (responder o generar pregunta solo reejecuta esta sección)"""
+    # Presupuesto de tiempo de esta ejecución de la sección
+    plazo = Plazo()
+
+    # Botón para generar nueva pregunta
+    if st.button("🎲 Generar Nueva Pregunta", key="generar_quiz"):
+        with st.spinner("Generando pregunta..."):
+            if generar_nueva_pregunta(plazo):
+                st.success("¡Nueva pregunta generada!")
+            else:
+                st.error("No se pudo generar la pregunta. Inténtalo de nuevo.")
+
+    # Generar primera pregunta automáticamente si no existe
+    if not st.session_state.quiz_generado:
+        with st.spinner("Cargando primera pregunta..."):
+            generar_nueva_pregunta(plazo)
+
+    # Mostrar quiz si está generado
+    if st.session_state.quiz_generado and st.session_state.quiz_opciones:
+        st.write(f"**¿Quién ganó la Copa Mundial de la FIFA en {st.session_state.quiz_year}?**")
+
+        # Mostrar opciones solo si no se ha respondido correctamente
+        if not st.session_state.respuesta_correcta_final:
+            respuesta_usuario = st.radio(
+                "Elige una opción:",
+                st.session_state.quiz_opciones,
+                key=f"quiz_respuesta_{st.session_state.quiz_year}"
+            )
+
+            # Botón para responder
+            if st.button("✅ Responder", key="responder_quiz"):
+                st.session_state.respuesta_usuario = respuesta_usuario
+                st.session_state.pregunta_respondida = True
+
+                # Verificar si la respuesta es correcta
+                if respuesta_usuario == st.session_state.quiz_respuesta_correcta:
+                    st.session_state.respuesta_correcta_final = True
+
+                reejecutar_seccion()
+
+        # Mostrar resultado si ya se respondió
+        if st.session_state.pregunta_respondida and st.session_state.respuesta_usuario:
+
+            if st.session_state.respuesta_correcta_final:
+                st.success(f"🎉 ¡Correcto! **{st.session_state.quiz_respuesta_correcta}** fue el campeón en {st.session_state.quiz_year}.")
+                st.info("💡 Genera una nueva pregunta para seguir jugando.")
+            else:
+                st.error("❌ Respuesta incorrecta. ¡Inténtalo de nuevo!")
+
+                # Botón para reintentar
+                if st.button("🔄 Reintentar", key="reintentar_quiz"):
+                    st.session_state.pregunta_respondida = False
+                    st.session_state.respuesta_usuario = None
+                    reejecutar_seccion()
+
+    # Información adicional
+    if st.session_state.quiz_generado:
+        with st.expander("📊 Información de la pregunta actual"):
+            st.write(f"**Año:** {st.session_state.quiz_year}")
+            st.write(f"**Respuesta correcta:** {st.session_state.quiz_respuesta_correcta}")
+            st.write(f"**Opciones disponibles:** {len(st.session_state.quiz_opciones)}")
+
+
+def mostrar():
+    """Título, estado inicial del quiz en la sesión y el fragmento con la pregunta"""
+    st.subheader("⚽ Quiz: ¿Quién ganó el Mundial?")
+
+    # Inicializar estado del quiz
+    if 'quiz_opciones' not in st.session_state:
+        st.session_state.quiz_opciones = []
+        st.session_state.quiz_respuesta_correcta = ""
+        st.session_state.quiz_year = ""
+        st.session_state.quiz_generado = False
+        st.session_state.pregunta_respondida = False
+        st.session_state.respuesta_usuario = None
+        st.session_state.respuesta_correcta_final = False
+
+    # Preguntas preparadas en segundo plano para esta sesión
+    if 'cola_quiz' not in st.session_state:
+        st.session_state.cola_quiz = ColaPreguntas(pregunta_mundial)
+
+    seccion_quiz()